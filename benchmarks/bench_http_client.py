@@ -0,0 +1,132 @@
+#!/usr/bin/env python3
+"""
+Benchmark the shared HTTP client against one-off `requests.get` calls.
+
+A local HTTP/1.1 server serves synthetic release pages (gzip-compressed when
+the client asks for it) and counts the connections it accepts and the bytes
+it sends. The same pages are then fetched with the given concurrency:
+
+- requests.get:  a new connection per page, as the scrapers used to do
+- Fetcher:       the pooled keep-alive session the scrapers share now
+- Fetcher, identity: the same session with compression turned off, to show
+  what Accept-Encoding saves
+
+HTTP/2 needs TLS, so `--http2` is not measured against the local server.
+
+Usage:
+    python benchmarks/bench_http_client.py
+    python benchmarks/bench_http_client.py --pages 500 --concurrency 16
+"""
+
+import argparse
+import gzip
+import os
+import socket
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import requests
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from bench_parser_backends import synthetic_page  # noqa: E402
+from boxoffice_http import HEADERS, Fetcher  # noqa: E402
+
+
+class _Stats:
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.connections = 0
+        self.bytes_sent = 0
+
+    def reset(self):
+        with self.lock:
+            self.connections = self.bytes_sent = 0
+
+
+def start_server(pages):
+    stats = _Stats()
+    compressed = [gzip.compress(page.encode("utf-8")) for page in pages]
+
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"  # keep-alive
+
+        def setup(self):
+            super().setup()
+            # Headers and body go out in separate writes; like any real server, do not let Nagle hold the body back
+            self.connection.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+            with stats.lock:
+                stats.connections += 1
+
+        def do_GET(self):
+            index = int(self.path.strip("/").split("/")[-1][2:]) % len(pages)
+            if "gzip" in (self.headers.get("Accept-Encoding") or ""):
+                body, encoding = compressed[index], "gzip"
+            else:
+                body, encoding = pages[index].encode("utf-8"), None
+            self.send_response(200)
+            self.send_header("Content-Type", "text/html; charset=utf-8")
+            self.send_header("Content-Length", str(len(body)))
+            if encoding:
+                self.send_header("Content-Encoding", encoding)
+            self.end_headers()
+            self.wfile.write(body)
+            with stats.lock:
+                stats.bytes_sent += len(body)
+
+        def log_message(self, *args):
+            pass
+
+    class Server(ThreadingHTTPServer):
+        daemon_threads = True
+        request_queue_size = 128  # the default backlog of 5 drops connects from larger worker pools
+
+    server = Server(("127.0.0.1", 0), Handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, stats
+
+
+def run(name, fetch, urls, concurrency, stats):
+    stats.reset()
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        sizes = list(pool.map(lambda url: len(fetch(url)), urls))
+    elapsed = time.perf_counter() - start
+    print(f"{name:<22} {stats.connections:>11} {stats.bytes_sent / 1e6:>11.2f} {len(urls) / elapsed:>10.0f}")
+    return sizes
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the pooled HTTP client against per-request connections")
+    parser.add_argument("--pages", type=int, default=300, help="Pages to fetch per client (default: 300)")
+    parser.add_argument("--concurrency", "-c", type=int, default=8, help="Parallel requests (default: 8)")
+    args = parser.parse_args()
+
+    pages = [synthetic_page(i) for i in range(50)]
+    server, stats = start_server(pages)
+    base = f"http://127.0.0.1:{server.server_port}"
+    urls = [f"{base}/release/rl{i}/" for i in range(args.pages)]
+
+    print(f"{args.pages} pages of about {sum(map(len, pages)) // len(pages) // 1000} KB, concurrency {args.concurrency}\n")
+    print(f"{'client':<22} {'connections':>11} {'MB sent':>11} {'pages/s':>10}")
+
+    def one_shot(url):
+        return requests.get(url, headers=HEADERS, timeout=30).text
+
+    fetcher = Fetcher(pool_size=args.concurrency)
+    identity = Fetcher(pool_size=args.concurrency)
+    identity.session.headers["Accept-Encoding"] = "identity"
+
+    expected = run("requests.get", one_shot, urls, args.concurrency, stats)
+    results = [run("Fetcher", fetcher.fetch, urls, args.concurrency, stats),
+               run("Fetcher, identity", identity.fetch, urls, args.concurrency, stats)]
+    if any(sizes != expected for sizes in results):
+        print("\n❌ Clients returned different pages")
+    server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
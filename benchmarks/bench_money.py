@@ -0,0 +1,66 @@
+#!/usr/bin/env python3
+"""
+Benchmark money parsing and formatting over the merged box office columns.
+
+Compares the per-value idiom the scrapers and merge used to repeat,
+`int(x.replace('$', '').replace(',', ''))`, with boxoffice_money's scalar
+parse_money and the column-at-once parse_money_column, and checks that all of
+them agree. Also reports the size of a BoxOfficeRecord against the row dict it
+replaces.
+
+Usage:
+    python benchmarks/bench_money.py [--copies 10] [--repeat 5]
+"""
+
+import argparse
+import csv
+import os
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from boxoffice_money import BoxOfficeRecord, format_money, parse_money, parse_money_column  # noqa: E402
+
+
+def best_of(repeat, func):
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = func()
+        timings.append(time.perf_counter() - start)
+    return min(timings) * 1000, result
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark money parsing and formatting")
+    parser.add_argument("--csv", default=os.path.join(ROOT, "all_boxoffice.csv"), help="Merged box office CSV")
+    parser.add_argument("--copies", type=int, default=10, help="Times to repeat the money columns (default: 10)")
+    parser.add_argument("--repeat", type=int, default=5, help="Timed passes, best is reported (default: 5)")
+    args = parser.parse_args()
+
+    with open(args.csv, "r", newline="", encoding="utf-8") as f:
+        rows = list(csv.DictReader(f))
+    values = [row[column] for row in rows for column in ("Domestic", "International", "Worldwide")] * args.copies
+    print(f"{len(values):,} money values from {args.csv}\n")
+
+    idiom_ms, idiom = best_of(args.repeat, lambda: [int(v.replace('$', '').replace(',', '')) for v in values])
+    scalar_ms, scalar = best_of(args.repeat, lambda: [parse_money(v) for v in values])
+    column_ms, column = best_of(args.repeat, lambda: parse_money_column(values))
+    agree = idiom == scalar == list(column)
+    print(f"{'parse':<28} {'ms':>8}")
+    print(f"{'replace/int idiom':<28} {idiom_ms:>8.1f}")
+    print(f"{'parse_money':<28} {scalar_ms:>8.1f}")
+    print(f"{'parse_money_column':<28} {column_ms:>8.1f}  ({idiom_ms / column_ms:.1f}x)  agree: {'yes' if agree else 'NO'}")
+
+    format_ms, _ = best_of(args.repeat, lambda: [format_money(v) for v in scalar])
+    print(f"\n{'format':<28} {'ms':>8}")
+    print(f"{'format_money':<28} {format_ms:>8.1f}")
+
+    record = BoxOfficeRecord.from_row(rows[0])
+    print(f"\nRow dict: {sys.getsizeof(rows[0])} bytes, BoxOfficeRecord: {sys.getsizeof(record)} bytes (excluding values)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,123 @@
+#!/usr/bin/env python3
+"""
+Benchmark the release page parser backends against each other.
+
+Pages come from the raw page cache (every cached /release/ page), from HTML
+files given on the command line, or, if neither is available, from synthetic
+pages shaped like Box Office Mojo release pages. For each backend it reports
+throughput for the v2 path (title, IMDb link, summary table) and the 2025 path
+(which also needs every <span>), the speedup over BeautifulSoup, and whether
+both scrapers extract identical figures with it.
+
+Usage:
+    python benchmarks/bench_parser_backends.py
+    python benchmarks/bench_parser_backends.py --html page1.html page2.html --repeat 5
+"""
+
+import argparse
+import contextlib
+import io
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import boxoffice_2025_scraper  # noqa: E402
+import boxoffice_scraper_v2  # noqa: E402
+from boxoffice_cache import DEFAULT_CACHE_DIR, PageCache  # noqa: E402
+from boxoffice_parsers import SUMMARY_TABLE_CLASS, available_backends, extract_release_page, set_backend  # noqa: E402
+
+
+def synthetic_page(seed):
+    """A release page with realistic amounts of navigation, script and table markup."""
+    rng = random.Random(seed)
+    domestic = rng.randint(1_000_000, 900_000_000)
+    international = rng.randint(0, 1_500_000_000)
+    nav = "".join(f'<li><a href="/chart/{i}/"><span class="nav">Chart {i}</span></a></li>' for i in range(150))
+    scripts = "".join(f"<script>window.ue_{i} = {{t: {i}, s: '$1,000,000'}};</script>" for i in range(40))
+    rows = "".join(
+        f"<tr><td><span>Week {i}</span></td><td><span>${rng.randint(10_000, 90_000_000):,}</span></td>"
+        f"<td>{rng.randint(100, 4000)}</td></tr>"
+        for i in range(80)
+    )
+    return f"""<!doctype html><html><head><title>Movie {seed}</title>
+<style>.a-section {{ margin: 0 }}</style>{scripts}</head>
+<body><div id="nav"><ul>{nav}</ul></div>
+<main><h1 class="a-size-extra-large">Movie &amp; Sequel {seed}</h1>
+<a href="https://pro.imdb.com/title/tt{seed:07d}/?ref_=mojo_rl_summary">IMDbPro</a>
+<div class="{SUMMARY_TABLE_CLASS}">
+<div class="a-section a-spacing-none"><span>Domestic (40%)</span><span><span class="money">${domestic:,}</span></span></div>
+<div class="a-section a-spacing-none"><span>International (60%)</span><span><span class="money">${international:,}</span></span></div>
+<div class="a-section a-spacing-none"><span>Worldwide</span><span><span class="money">${domestic + international:,}</span></span></div>
+</div>
+<table class="a-bordered">{rows}</table></main></body></html>"""
+
+
+def load_pages(args):
+    if args.html:
+        pages = []
+        for path in args.html:
+            with open(path, "r", encoding="utf-8") as f:
+                pages.append((path, f.read()))
+        return pages, "files"
+
+    if os.path.isdir(args.cache_dir):
+        cache = PageCache(args.cache_dir)
+        pages = [(url, cache.get(url, allow_stale=True)) for url in cache.urls() if "/release/" in url]
+        pages = [(url, html) for url, html in pages if html is not None][:args.max_pages]
+        if pages:
+            return pages, f"cache ({args.cache_dir})"
+
+    return [(f"synthetic-{i}", synthetic_page(i)) for i in range(args.synthetic)], "synthetic"
+
+
+def time_backend(backend, pages, spans, repeat):
+    start = time.perf_counter()
+    for _ in range(repeat):
+        for _, html in pages:
+            extract_release_page(html, spans=spans, backend=backend)
+    elapsed = time.perf_counter() - start
+    return len(pages) * repeat / elapsed
+
+
+def scraper_results(backend, pages):
+    set_backend(backend)
+    with contextlib.redirect_stdout(io.StringIO()):
+        return [
+            (boxoffice_scraper_v2.parse_box_office(html, url), boxoffice_2025_scraper.parse_box_office(html, url))
+            for url, html in pages
+        ]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark release page parser backends")
+    parser.add_argument("--html", nargs="*", help="HTML files to parse instead of the cache")
+    parser.add_argument("--cache-dir", default=DEFAULT_CACHE_DIR, help=f"Page cache to read (default: {DEFAULT_CACHE_DIR})")
+    parser.add_argument("--max-pages", type=int, default=200, help="Maximum cached pages to use (default: 200)")
+    parser.add_argument("--synthetic", type=int, default=50, help="Synthetic pages when nothing else is available (default: 50)")
+    parser.add_argument("--repeat", type=int, default=3, help="Passes over the pages per measurement (default: 3)")
+    args = parser.parse_args()
+
+    pages, source = load_pages(args)
+    backends = available_backends()[::-1]  # bs4 first, as the baseline
+    print(f"Pages: {len(pages)} from {source}, avg {sum(len(h) for _, h in pages) // len(pages):,} bytes")
+    print(f"Backends: {', '.join(backends)}\n")
+
+    reference = scraper_results("bs4", pages)
+    baseline = {}
+    print(f"{'backend':<12} {'v2 pages/s':>12} {'speedup':>8} {'2025 pages/s':>13} {'speedup':>8}  identical")
+    for backend in backends:
+        summary_rate = time_backend(backend, pages, False, args.repeat)
+        spans_rate = time_backend(backend, pages, True, args.repeat)
+        baseline.setdefault("summary", summary_rate)
+        baseline.setdefault("spans", spans_rate)
+        mismatches = sum(1 for a, b in zip(reference, scraper_results(backend, pages)) if a != b)
+        identical = "yes" if mismatches == 0 else f"NO ({mismatches} pages differ)"
+        print(f"{backend:<12} {summary_rate:>12,.1f} {summary_rate / baseline['summary']:>7.1f}x "
+              f"{spans_rate:>13,.1f} {spans_rate / baseline['spans']:>7.1f}x  {identical}")
+
+
+if __name__ == "__main__":
+    main()
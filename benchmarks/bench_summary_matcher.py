@@ -0,0 +1,164 @@
+#!/usr/bin/env python3
+"""
+Benchmark the v2 summary-table matcher against the original triple loop.
+
+For summary tables carrying 5, 20 and 50 money values it times:
+- legacy:     the original O(n^3) search over every (i, j, k) triple, which
+              also re-runs str.find on the summary text inside the loop
+- labeled:    match_summary_figures on text with Domestic/International/Worldwide labels
+- two-sum:    match_summary_figures on unlabeled text (hash two-sum fallback)
+- no match:   unlabeled text with no worldwide = domestic + international triple,
+              the worst case for every strategy
+
+Both matchers must return the same figures for every generated page before
+anything is timed; the benchmark exits with an error otherwise.
+
+Usage:
+    python benchmarks/bench_summary_matcher.py [--repeat 20]
+"""
+
+import argparse
+import os
+import random
+import re
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from boxoffice_scraper_v2 import match_summary_figures  # noqa: E402
+
+
+def legacy_match_summary_figures(summary_html):
+    """The summary-table matcher as it was before the label-aware rewrite."""
+    domestic = "$0"
+    international = "$0"
+    worldwide = "$0"
+
+    money_matches = re.findall(r'\$[\d,]+', summary_html)
+    money_values = []
+    for match in money_matches:
+        clean_value = match.replace('$', '').replace(',', '')
+        if clean_value.isdigit() and len(clean_value) >= 6:
+            money_values.append((int(clean_value), match))
+    money_values.sort(reverse=True)
+
+    unique_values = []
+    seen_values = set()
+    for value, formatted in money_values:
+        if value not in seen_values:
+            unique_values.append((value, formatted))
+            seen_values.add(value)
+
+    if len(unique_values) >= 2:
+        found_combination = False
+        for i in range(len(unique_values)):
+            for j in range(len(unique_values)):
+                for k in range(len(unique_values)):
+                    if i != j and j != k and i != k:
+                        val_i, val_j, val_k = unique_values[i][0], unique_values[j][0], unique_values[k][0]
+                        if abs(val_i - (val_j + val_k)) < val_i * 0.05:
+                            worldwide = unique_values[i][1]
+                            pos_j = summary_html.find(unique_values[j][1].replace('$', '').replace(',', ''))
+                            pos_k = summary_html.find(unique_values[k][1].replace('$', '').replace(',', ''))
+                            if pos_j < pos_k and pos_j != -1:
+                                domestic, international = unique_values[j][1], unique_values[k][1]
+                            elif pos_k < pos_j and pos_k != -1:
+                                domestic, international = unique_values[k][1], unique_values[j][1]
+                            elif val_j <= val_k:
+                                domestic, international = unique_values[j][1], unique_values[k][1]
+                            else:
+                                domestic, international = unique_values[k][1], unique_values[j][1]
+                            found_combination = True
+                            break
+                if found_combination:
+                    break
+            if found_combination:
+                break
+
+        if not found_combination:
+            val1, val2 = unique_values[0][0], unique_values[1][0]
+            if val1 > val2 * 1.8:
+                worldwide = unique_values[0][1]
+                domestic = unique_values[1][1]
+                if val1 - val2 > 0:
+                    international = f"${val1 - val2:,}"
+            else:
+                domestic = unique_values[0][1]
+                international = unique_values[1][1]
+                worldwide = f"${val1 + val2:,}"
+    elif len(unique_values) == 1:
+        domestic = unique_values[0][1]
+
+    return domestic, international, worldwide
+
+
+def _distinct_amounts(rng, count, low, high):
+    amounts = set()
+    while len(amounts) < count:
+        amounts.add(rng.randint(low, high))
+    return list(amounts)
+
+
+def summary_text(rng, n_values, labeled, has_triple=True):
+    """
+    Summary table text with `n_values` money values, and the (domestic,
+    international, worldwide) figures it holds. The real figures are the
+    smallest ones, with domestic below international as the 40%/60% labels say.
+    """
+    if has_triple:
+        domestic, international = sorted(_distinct_amounts(rng, 2, 100_000, 900_000))
+        worldwide = domestic + international
+        # Weekly grosses, re-release totals... larger than the real figures and never
+        # within 5% (the legacy tolerance) of summing up
+        others = [3 ** (14 + n) + rng.randint(0, 1000) for n in range(n_values - 3)]
+    else:
+        domestic = international = worldwide = None
+        others = [3 ** (14 + n) + rng.randint(0, 1000) for n in range(n_values)]
+
+    parts = [f"Week {n}${value:,}" for n, value in enumerate(others)]
+    if has_triple:
+        if labeled:
+            parts.append(f"Domestic (40.0%)${domestic:,}International (60.0%)${international:,}Worldwide${worldwide:,}")
+        else:
+            parts.append(f"${domestic:,}${international:,}${worldwide:,}")
+    figures = tuple(f"${value:,}" for value in (domestic, international, worldwide)) if has_triple else None
+    return "Domestic Distributor Example Pictures".join(parts), figures
+
+
+def time_matcher(matcher, texts, repeat):
+    start = time.perf_counter()
+    for _ in range(repeat):
+        for text in texts:
+            matcher(text)
+    return (time.perf_counter() - start) / (repeat * len(texts)) * 1_000_000
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the v2 summary-table matcher")
+    parser.add_argument("--repeat", type=int, default=20, help="Passes over each case (default: 20)")
+    parser.add_argument("--pages", type=int, default=10, help="Generated pages per case (default: 10)")
+    args = parser.parse_args()
+
+    rng = random.Random(7)
+    print(f"{'values':>6} {'case':<9} {'legacy µs':>12} {'new µs':>10} {'speedup':>9}")
+    for n_values in (5, 20, 50):
+        pages = {
+            "labeled": [summary_text(rng, n_values, labeled=True) for _ in range(args.pages)],
+            "two-sum": [summary_text(rng, n_values, labeled=False) for _ in range(args.pages)],
+            "no match": [summary_text(rng, n_values, labeled=False, has_triple=False) for _ in range(args.pages)],
+        }
+        for case in pages:
+            texts = [text for text, _ in pages[case]]
+            for text, figures in pages[case]:
+                legacy, new = legacy_match_summary_figures(text), match_summary_figures(text)
+                if new != legacy or (figures is not None and new != figures):
+                    print(f"❌ {case} with {n_values} values: expected {figures}, legacy found {legacy}, new matcher {new}")
+                    sys.exit(1)
+            legacy = time_matcher(legacy_match_summary_figures, texts, args.repeat)
+            new = time_matcher(match_summary_figures, texts, args.repeat)
+            print(f"{n_values:>6} {case:<9} {legacy:>12,.1f} {new:>10,.1f} {legacy / new:>8.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,381 @@
+#!/usr/bin/env python3
+"""
+Offline extraction benchmark over Box Office Mojo release pages.
+
+The fixture corpus lives in benchmarks/fixtures/:
+
+    golden.csv             figures for a sample of releases per year (1977-2025)
+    golden_listings.json   release IDs, in rank order, for each year listing
+    pages/release/rl*.html.gz   recorded pages (not committed; see `record`)
+    pages/year/YYYY.html.gz
+    summary_tables.csv     hand-checked figures for the pages in summary_tables/
+    summary_tables/rl*.html     release pages cut down to the title, IMDb link and
+                                summary table, with the table on one line as the
+                                site serves it, so its text runs together
+
+golden.csv is a sample of the committed boxoffice_YYYY.csv files, i.e. what
+the scrapers extracted at the time, not hand-checked values. Against recorded
+pages the accuracy columns therefore measure agreement with that earlier
+output. Without recorded pages (or with --corpus synthetic), `run` generates
+a release page for every golden row with the row's figures in the summary
+table, laid out like the real pages; there the expected values are correct
+by construction for every extractor version, and the two scrapers' different
+strategies (summary table vs. every <span> on the page) show up as accuracy
+differences.
+
+Neither of those puts a real summary table through the extractors, so `run`
+also parses the summary_tables/ pages with every version and fails when any
+figure differs from summary_tables.csv. Those values were checked by hand
+(worldwide = domestic + international, "–" read as $0) rather than taken
+from scraper output.
+
+Subcommands:
+    golden   rebuild golden.csv / golden_listings.json from the boxoffice_YYYY.csv files
+    record   copy the golden pages from the raw page cache into the corpus (--fetch fills gaps live)
+    run      benchmark every extractor version and report pages/sec, p50/p99 parse
+             latency, peak Python heap (tracemalloc, so memory held inside the C
+             parsers is not counted) and per-field accuracy against the golden values
+
+`run` exits non-zero when a version falls below --min-accuracy or is slower than
+--max-slowdown times its speed in a saved --baseline, so parser changes can be
+gated on both speed and correctness:
+
+    python benchmarks/extraction_bench.py run --save bench.json
+    python benchmarks/extraction_bench.py run --baseline bench.json --min-accuracy 0.95
+"""
+
+import argparse
+import contextlib
+import csv
+import glob
+import gzip
+import io
+import json
+import os
+import random
+import re
+import sys
+import time
+import tracemalloc
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+import boxoffice_2025_scraper  # noqa: E402
+import boxoffice_scraper_v2  # noqa: E402
+from boxoffice_cache import DEFAULT_CACHE_DIR, PageCache  # noqa: E402
+from boxoffice_checkpoint import release_id  # noqa: E402
+from boxoffice_http import BASE_URL, FetchError, fetch_page  # noqa: E402
+from boxoffice_listing import parse_year_listing  # noqa: E402
+from boxoffice_money import format_money, parse_money  # noqa: E402
+from boxoffice_parsers import SUMMARY_TABLE_CLASS, available_backends, set_backend  # noqa: E402
+
+FIXTURES_DIR = os.path.join(ROOT, "benchmarks", "fixtures")
+GOLDEN_FIELDS = ["Title", "Domestic", "International", "Worldwide", "ImdbID"]
+SAMPLE_RANKS = (1, 2, 3, 5, 10, 25, 50, 100, 150, 200)
+
+
+def _golden_path(fixtures):
+    return os.path.join(fixtures, "golden.csv")
+
+
+def _listings_path(fixtures):
+    return os.path.join(fixtures, "golden_listings.json")
+
+
+def _page_path(fixtures, kind, key):
+    return os.path.join(fixtures, "pages", kind, f"{key}.html.gz")
+
+
+def _summary_tables_path(fixtures):
+    return os.path.join(fixtures, "summary_tables.csv")
+
+
+def _read_page(path):
+    with gzip.open(path, "rt", encoding="utf-8") as f:
+        return f.read()
+
+
+def _write_page(path, html):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with gzip.open(path, "wt", encoding="utf-8") as f:
+        f.write(html)
+
+
+def load_golden(fixtures):
+    with open(_golden_path(fixtures), "r", newline="", encoding="utf-8") as f:
+        golden = list(csv.DictReader(f))
+    with open(_listings_path(fixtures), "r", encoding="utf-8") as f:
+        listings = json.load(f)
+    return golden, listings
+
+
+def build_golden(args):
+    golden = []
+    listings = {}
+    for path in sorted(glob.glob(os.path.join(ROOT, "boxoffice_*.csv"))):
+        match = re.search(r"boxoffice_(\d{4})\.csv$", path)
+        if not match:
+            continue
+        year = match.group(1)
+        with open(path, "r", newline="", encoding="utf-8") as f:
+            rows = list(csv.DictReader(f))
+        listings[year] = [release_id(row["URL"]) for row in rows]
+        for rank in SAMPLE_RANKS:
+            if rank <= len(rows):
+                row = rows[rank - 1]
+                golden.append({"Year": year, "Rank": rank, "ReleaseID": release_id(row["URL"]),
+                               **{field: row[field] for field in GOLDEN_FIELDS}, "URL": row["URL"]})
+
+    os.makedirs(args.fixtures, exist_ok=True)
+    with open(_golden_path(args.fixtures), "w", newline="", encoding="utf-8") as f:
+        writer = csv.DictWriter(f, fieldnames=["Year", "Rank", "ReleaseID"] + GOLDEN_FIELDS + ["URL"])
+        writer.writeheader()
+        writer.writerows(golden)
+    with open(_listings_path(args.fixtures), "w", encoding="utf-8") as f:
+        json.dump(listings, f, indent=1)
+        f.write("\n")
+    print(f"✅ Golden values: {len(golden)} releases across {len(listings)} years")
+
+
+def record_pages(args):
+    golden, listings = load_golden(args.fixtures)
+    cache = PageCache(args.cache_dir) if os.path.isdir(args.cache_dir) else None
+    wanted = [("year", year, f"{BASE_URL}/year/{year}/") for year in listings]
+    wanted += [("release", row["ReleaseID"], row["URL"]) for row in golden]
+
+    recorded = missing = 0
+    for kind, key, url in wanted:
+        path = _page_path(args.fixtures, kind, key)
+        if os.path.exists(path) and not args.overwrite:
+            continue
+        html = cache.get(url, allow_stale=True) if cache is not None else None
+        if html is None and args.fetch:
+            try:
+                html = fetch_page(url)
+            except FetchError as e:
+                print(f"⚠️  {e}")
+        if html is None:
+            missing += 1
+            continue
+        _write_page(path, html)
+        recorded += 1
+
+    print(f"✅ Recorded {recorded} pages, {missing} still missing"
+          + ("" if args.fetch else " (use --fetch to download them)"))
+
+
+def synthetic_release_page(row):
+    """
+    A release page for a golden row, with navigation, scripts and a weekly
+    table around the summary. Like on the site, the summary table has no
+    whitespace between its rows.
+    """
+    rng = random.Random(row["ReleaseID"])
+    domestic, international = parse_money(row["Domestic"]), parse_money(row["International"])
+    worldwide = parse_money(row["Worldwide"])
+    share = f"{domestic / worldwide:.1%}" if worldwide else "-"
+
+    def figure(label, amount, percent=""):
+        money = f'<span class="money">${amount:,}</span>' if amount else "<span>–</span>"
+        return f'<div class="a-section a-spacing-none"><span>{label}{percent}</span><span>{money}</span></div>'
+
+    nav = "".join(f'<li><a href="/chart/{i}/"><span class="nav">Chart {i}</span></a></li>' for i in range(150))
+    scripts = "".join(f"<script>window.ue_{i} = {{t: {i}}};</script>" for i in range(40))
+    weeks = "".join(
+        f"<tr><td><span>Week {i}</span></td><td><span>${rng.randint(10_000, max(10_001, domestic // 4)):,}</span></td>"
+        f"<td>{rng.randint(100, 4000)}</td></tr>"
+        for i in range(rng.randint(2, 30))
+    )
+    imdb_link = (f'<a href="https://pro.imdb.com/title/{row["ImdbID"]}/?ref_=mojo_rl_summary">IMDbPro</a>'
+                 if row["ImdbID"] else "")
+    title = row["Title"].replace("&", "&amp;").replace("<", "&lt;")
+    return f"""<!doctype html><html><head><title>{title} - Box Office Mojo</title>{scripts}</head>
+<body><div id="nav"><ul>{nav}</ul></div>
+<main><h1 class="a-size-extra-large">{title}</h1>
+{imdb_link}
+<div class="{SUMMARY_TABLE_CLASS}">{figure("Domestic", domestic, f" ({share})")}{figure("International", international)}{figure("Worldwide", worldwide)}</div>
+<table class="a-bordered">{weeks}</table></main></body></html>"""
+
+
+def extractor_versions():
+    """Every (scraper, parser backend) combination available here."""
+    versions = {}
+    for backend in available_backends():
+        versions[f"v2/{backend}"] = (boxoffice_scraper_v2.parse_box_office, backend)
+        versions[f"2025/{backend}"] = (boxoffice_2025_scraper.parse_box_office, backend)
+    return versions
+
+
+def _percentile(sorted_values, fraction):
+    return sorted_values[min(len(sorted_values) - 1, int(round(fraction * (len(sorted_values) - 1))))]
+
+
+def measure(parse, pages, repeat):
+    latencies = []
+    results = []
+    with contextlib.redirect_stdout(io.StringIO()):
+        for _ in range(repeat):
+            results = []
+            for url, html in pages:
+                start = time.perf_counter()
+                results.append(parse(html, url))
+                latencies.append(time.perf_counter() - start)
+
+        tracemalloc.start()
+        for url, html in pages:
+            parse(html, url)
+        peak = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+
+    latencies.sort()
+    return {
+        "pages_per_sec": len(latencies) / sum(latencies),
+        "p50_ms": _percentile(latencies, 0.50) * 1000,
+        "p99_ms": _percentile(latencies, 0.99) * 1000,
+        "peak_kib": peak / 1024,
+    }, results
+
+
+def field_accuracy(results, expected):
+    accuracy = {}
+    for index, field in enumerate(GOLDEN_FIELDS):
+        correct = sum(1 for result, row in zip(results, expected) if result[index] == row[field])
+        accuracy[field] = correct / len(expected)
+    accuracy["all"] = sum(accuracy[field] for field in GOLDEN_FIELDS) / len(GOLDEN_FIELDS)
+    return accuracy
+
+
+def listing_accuracy(listings, fixtures):
+    """Fraction of golden release IDs found at the right rank in the recorded listings."""
+    correct = total = 0
+    for year, expected in listings.items():
+        path = _page_path(fixtures, "year", year)
+        if not os.path.exists(path):
+            continue
+        found = [release_id(row["link"]) for row in parse_year_listing(_read_page(path))]
+        correct += sum(1 for a, b in zip(found, expected) if a == b)
+        total += len(expected)
+    return correct / total if total else None
+
+
+def check_summary_tables(fixtures, versions):
+    """Mismatches of every version against the hand-checked summary-table pages, as messages."""
+    with open(_summary_tables_path(fixtures), "r", newline="", encoding="utf-8") as f:
+        checked = list(csv.DictReader(f))
+    pages = []
+    for row in checked:
+        with open(os.path.join(fixtures, "summary_tables", f"{row['ReleaseID']}.html"), "r", encoding="utf-8") as f:
+            pages.append((f"{BASE_URL}/release/{row['ReleaseID']}/", f.read()))
+
+    mismatches = []
+    with contextlib.redirect_stdout(io.StringIO()):
+        for name, (parse, backend) in versions.items():
+            set_backend(backend)
+            for (url, html), row in zip(pages, checked):
+                result = parse(html, url)
+                wrong = [f"{field} {result[index]} != {row[field]}" for index, field in enumerate(GOLDEN_FIELDS)
+                         if result[index] != row[field]]
+                if wrong:
+                    mismatches.append(f"{name}: {row['ReleaseID']} {', '.join(wrong)}")
+    print(f"Summary tables: {len(checked)} hand-checked pages, {len(mismatches)} mismatches")
+    return mismatches
+
+
+def run_benchmark(args):
+    golden, listings = load_golden(args.fixtures)
+    expected = [row for row in golden if os.path.exists(_page_path(args.fixtures, "release", row["ReleaseID"]))]
+    synthetic = args.corpus == "synthetic" or (args.corpus == "auto" and not expected)
+    if synthetic:
+        # The pages show every amount formatted properly, so expect that too (a few CSV rows are garbled)
+        expected = [{**row, **{field: format_money(parse_money(row[field]))
+                               for field in ("Domestic", "International", "Worldwide")}} for row in golden]
+        pages = [(row["URL"], synthetic_release_page(row)) for row in golden]
+        print(f"Corpus: {len(pages)} synthetic release pages generated from the golden values")
+    else:
+        print(f"Corpus: {len(expected)}/{len(golden)} golden release pages recorded, "
+              f"{sum(1 for year in listings if os.path.exists(_page_path(args.fixtures, 'year', year)))}/{len(listings)} listings; "
+              "accuracy is agreement with the boxoffice_YYYY.csv output")
+        if not expected:
+            print("❌ No recorded pages. Run `extraction_bench.py record` first.")
+            sys.exit(1)
+        pages = [(row["URL"], _read_page(_page_path(args.fixtures, "release", row["ReleaseID"]))) for row in expected]
+    versions = extractor_versions()
+    if args.versions:
+        versions = {name: versions[name] for name in args.versions if name in versions}
+
+    baseline = {}
+    if args.baseline:
+        with open(args.baseline, "r", encoding="utf-8") as f:
+            baseline = json.load(f)["versions"]
+
+    report = {"corpus": "synthetic" if synthetic else "recorded", "pages": len(pages), "versions": {}}
+    # Wrong figures on a real summary table fail the run whatever the gates
+    failures = check_summary_tables(args.fixtures, versions)
+    report["summary_table_mismatches"] = list(failures)
+    print(f"\n{'version':<18} {'pages/s':>9} {'p50 ms':>8} {'p99 ms':>8} {'peak KiB':>9} "
+          + " ".join(f"{field[:6]:>6}" for field in GOLDEN_FIELDS) + f" {'all':>6}")
+    for name, (parse, backend) in versions.items():
+        set_backend(backend)
+        stats, results = measure(parse, pages, args.repeat)
+        stats["accuracy"] = field_accuracy(results, expected)
+        report["versions"][name] = stats
+        print(f"{name:<18} {stats['pages_per_sec']:>9,.1f} {stats['p50_ms']:>8.2f} {stats['p99_ms']:>8.2f} "
+              f"{stats['peak_kib']:>9,.0f} "
+              + " ".join(f"{stats['accuracy'][field]:>6.1%}" for field in GOLDEN_FIELDS)
+              + f" {stats['accuracy']['all']:>6.1%}")
+
+        if args.min_accuracy is not None and stats["accuracy"]["all"] < args.min_accuracy:
+            failures.append(f"{name}: accuracy {stats['accuracy']['all']:.1%} < {args.min_accuracy:.1%}")
+        if name in baseline:
+            floor = baseline[name]["pages_per_sec"] / args.max_slowdown
+            if stats["pages_per_sec"] < floor:
+                failures.append(f"{name}: {stats['pages_per_sec']:,.1f} pages/s < {floor:,.1f} "
+                                f"(baseline {baseline[name]['pages_per_sec']:,.1f} / {args.max_slowdown})")
+
+    report["listing_accuracy"] = None if synthetic else listing_accuracy(listings, args.fixtures)
+    if report["listing_accuracy"] is not None:
+        print(f"\nListing link accuracy: {report['listing_accuracy']:.1%}")
+
+    if args.save:
+        with open(args.save, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+        print(f"💾 Results saved to {args.save}")
+
+    if failures:
+        print("\n❌ Gate failed:")
+        for failure in failures:
+            print(f"  - {failure}")
+        sys.exit(1)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Offline extraction benchmark over recorded release pages")
+    parser.add_argument("--fixtures", default=FIXTURES_DIR, help="Fixture corpus directory")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    subparsers.add_parser("golden", help="Rebuild the golden values from boxoffice_YYYY.csv")
+
+    record = subparsers.add_parser("record", help="Copy golden pages from the page cache into the corpus")
+    record.add_argument("--cache-dir", default=DEFAULT_CACHE_DIR, help=f"Page cache to copy from (default: {DEFAULT_CACHE_DIR})")
+    record.add_argument("--fetch", action="store_true", help="Download pages missing from the cache")
+    record.add_argument("--overwrite", action="store_true", help="Replace pages already in the corpus")
+
+    run = subparsers.add_parser("run", help="Benchmark every extractor version")
+    run.add_argument("--corpus", choices=("auto", "recorded", "synthetic"), default="auto",
+                     help="Pages to benchmark (default: auto, recorded pages if any, otherwise synthetic ones)")
+    run.add_argument("--versions", nargs="*", help="Only these versions (e.g. v2/lxml 2025/bs4)")
+    run.add_argument("--repeat", type=int, default=3, help="Timed passes over the corpus (default: 3)")
+    run.add_argument("--save", help="Write the results as JSON (usable as a --baseline)")
+    run.add_argument("--baseline", help="Results JSON to compare speed against")
+    run.add_argument("--max-slowdown", type=float, default=1.25,
+                     help="Fail when a version is this many times slower than the baseline (default: 1.25)")
+    run.add_argument("--min-accuracy", type=float, default=None,
+                     help="Fail when a version's overall field accuracy is below this fraction")
+
+    args = parser.parse_args()
+    {"golden": build_golden, "record": record_pages, "run": run_benchmark}[args.command](args)
+
+
+if __name__ == "__main__":
+    main()
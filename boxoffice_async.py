@@ -0,0 +1,212 @@
+#!/usr/bin/env python3
+"""
+Asyncio fetch engine for the Box Office Mojo scrapers.
+
+Release pages are fetched in parallel on worker threads driven by an asyncio
+event loop, under an adaptive per-host request budget shared by every caller,
+and the results are handed back strictly in rank order.
+"""
+
+import asyncio
+import threading
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from email.utils import parsedate_to_datetime
+from urllib.parse import urlparse
+
+_END = object()
+
+
+# Responses that mean "slow down"
+THROTTLE_STATUSES = (429, 503)
+
+# Consecutive slow responses that count as the server slowing down, rather than jitter
+SLOW_STREAK = 3
+
+
+class _HostState:
+    """Token bucket and AIMD bookkeeping for one host."""
+
+    def __init__(self, rate, max_in_flight):
+        self.semaphore = threading.BoundedSemaphore(max_in_flight)
+        self.rate = rate
+        self.tokens = 1.0
+        self.updated = time.monotonic()
+        self.blocked_until = 0.0
+        self.last_decrease = 0.0
+        self.latency = None  # moving average of healthy response latency
+        self.healthy = 0
+        self.slow = 0  # consecutive responses well above the average
+        self.throttled = 0
+
+
+class HostBudget:
+    """Global per-host request budget.
+
+    Caps the number of requests in flight against one host and hands out
+    request starts from a per-host token bucket refilled at the host's current
+    rate, no matter how many workers are running.
+
+    The rate adapts to the server (AIMD) when `feedback` is called with each
+    response: every healthy response adds `increase / rate` requests per second
+    (about +`increase` per second of traffic) up to `max_rate`, while a 429/503
+    halves it, at most once per request interval. With a `max_rate` above
+    `rate`, a run of SLOW_STREAK responses well above the running average
+    latency also cuts it by a fifth. A Retry-After header pauses the host for
+    that long. Without feedback, or without a higher `max_rate` and any
+    throttling, the rate stays where it started.
+    """
+
+    def __init__(self, rate=2.0, max_in_flight=8, max_rate=None, min_rate=0.1, increase=0.5,
+                 latency_factor=2.0):
+        self.initial_rate = rate
+        self.max_rate = max(rate, max_rate if max_rate is not None else rate)
+        self.min_rate = min(min_rate, rate) if rate > 0 else 0.0
+        self.increase = increase
+        self.latency_factor = latency_factor
+        self.max_in_flight = max_in_flight
+        self._lock = threading.Lock()
+        self._hosts = {}
+
+    def _host(self, url):
+        host = urlparse(url).netloc
+        with self._lock:
+            state = self._hosts.get(host)
+            if state is None:
+                state = self._hosts[host] = _HostState(self.initial_rate, self.max_in_flight)
+            return state
+
+    def _take_token(self, state):
+        """Take a token if one is ready; otherwise return how long to wait for one."""
+        with self._lock:
+            now = time.monotonic()
+            if now < state.blocked_until:
+                return state.blocked_until - now
+            if state.rate <= 0:
+                return 0.0
+            # One token of burst: starts are spaced by 1 / rate at most
+            state.tokens = min(1.0, state.tokens + (now - state.updated) * state.rate)
+            state.updated = now
+            if state.tokens >= 1.0:
+                state.tokens -= 1.0
+                return 0.0
+            return (1.0 - state.tokens) / state.rate
+
+    def pace(self, url):
+        """Wait for the host of `url` to allow one more request start."""
+        state = self._host(url)
+        while True:
+            wait = self._take_token(state)
+            if not wait:
+                return
+            time.sleep(wait)
+
+    @contextmanager
+    def slot(self, url):
+        """Hold one request slot for the host of `url` while the body runs."""
+        state = self._host(url)
+        state.semaphore.acquire()
+        try:
+            self.pace(url)
+            yield
+        finally:
+            state.semaphore.release()
+
+    def feedback(self, url, status, latency, retry_after=None):
+        """Adapt the rate for the host of `url` to a response (`latency` in seconds)."""
+        if self.initial_rate <= 0:
+            return
+        state = self._host(url)
+        pause = parse_retry_after(retry_after)
+        with self._lock:
+            now = time.monotonic()
+            if pause:
+                state.blocked_until = max(state.blocked_until, now + pause)
+            if status in THROTTLE_STATUSES:
+                state.throttled += 1
+                self._decrease(state, now, 0.5)
+            elif status < 500:
+                slow = state.latency is not None and state.healthy >= 5 and latency > state.latency * self.latency_factor
+                state.slow = state.slow + 1 if slow else 0
+                if state.slow >= SLOW_STREAK and self.max_rate > self.initial_rate:
+                    self._decrease(state, now, 0.8)
+                    state.slow = 0
+                elif not slow:
+                    state.rate = min(self.max_rate, state.rate + self.increase / state.rate)
+                state.healthy += 1
+                state.latency = latency if state.latency is None else state.latency * 0.9 + latency * 0.1
+
+    def _decrease(self, state, now, factor):
+        # Responses to requests sent before the last cut do not cut again
+        if now - state.last_decrease < 1.0 / state.rate:
+            return
+        state.rate = max(self.min_rate, state.rate * factor)
+        state.tokens = min(state.tokens, 0.0)
+        state.last_decrease = now
+
+    def rates(self):
+        """{host: (current rate, throttled responses)}"""
+        with self._lock:
+            return {host: (state.rate, state.throttled) for host, state in self._hosts.items()}
+
+
+def parse_retry_after(value):
+    """Seconds to wait for a Retry-After header (delay-seconds or HTTP date); None if absent."""
+    if not value:
+        return None
+    value = value.strip()
+    if value.isdigit():
+        return float(value)
+    try:
+        when = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    return max(0.0, when.timestamp() - time.time())
+
+
+async def _fetch_in_rank_order(urls, fetch, concurrency, budget, on_result):
+    loop = asyncio.get_running_loop()
+
+    def call(url):
+        with budget.slot(url):
+            return fetch(url)
+
+    pool = ThreadPoolExecutor(max_workers=concurrency)
+    urls = iter(urls)
+    # Only a few requests per worker are queued ahead, so `urls` may be a lazy
+    # stream that is still being produced while earlier pages download
+    window = concurrency * 4
+    futures = deque()
+    exhausted = False
+    rank = 0
+    try:
+        while True:
+            while not exhausted and len(futures) < window:
+                url = next(urls, _END)
+                if url is _END:
+                    exhausted = True
+                else:
+                    futures.append(loop.run_in_executor(pool, call, url))
+            if not futures:
+                break
+            # Awaiting in submission order buffers anything that finishes early,
+            # so callers always see results in rank order.
+            rank += 1
+            on_result(rank, await futures.popleft())
+    finally:
+        for future in futures:
+            future.cancel()
+        pool.shutdown(wait=False, cancel_futures=True)
+
+
+def fetch_in_rank_order(urls, fetch, on_result, concurrency=1, budget=None):
+    """
+    Call `fetch(url)` for every url with up to `concurrency` requests in flight
+    and pass each result to `on_result(rank, result)` in the original order.
+    `urls` can be any iterable; it is consumed as work is handed out.
+    """
+    if budget is None:
+        budget = HostBudget()
+    asyncio.run(_fetch_in_rank_order(urls, fetch, max(1, concurrency), budget, on_result))
@@ -0,0 +1,101 @@
+#!/usr/bin/env python3
+"""
+On-disk cache of raw Box Office Mojo responses.
+
+Pages are stored gzip-compressed under the SHA-256 of their content, so
+identical responses share one blob. An append-only index maps each canonical
+URL (with the `?ref_=bo_yld_table_N` tracking noise stripped) to its latest
+blob and fetch time; later index lines win.
+
+Layout:
+    .boxoffice_cache/index.jsonl
+    .boxoffice_cache/objects/ab/ab12...ef.gz
+"""
+
+import gzip
+import hashlib
+import json
+import os
+import re
+import threading
+import time
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
+
+DEFAULT_CACHE_DIR = ".boxoffice_cache"
+
+
+def canonical_url(url):
+    """Normalise a URL for use as a cache key, dropping `ref_` tracking parameters."""
+    parts = urlsplit(url)
+    query = [(k, v) for k, v in parse_qsl(parts.query, keep_blank_values=True) if k != "ref_"]
+    return urlunsplit((parts.scheme.lower(), parts.netloc.lower(), parts.path or "/", urlencode(query), ""))
+
+
+class PageCache:
+    """Content-addressed, compressed store of raw HTML keyed by canonical URL."""
+
+    def __init__(self, root=DEFAULT_CACHE_DIR, ttl=None):
+        self.root = root
+        self.ttl = ttl  # seconds; None means entries never expire
+        self._index_path = os.path.join(root, "index.jsonl")
+        self._lock = threading.Lock()
+        self._index = {}
+        self._load_index()
+
+    def _load_index(self):
+        if not os.path.exists(self._index_path):
+            return
+        with open(self._index_path, "r", encoding="utf-8") as f:
+            for line in f:
+                try:
+                    entry = json.loads(line)
+                except ValueError:
+                    continue  # Torn last line from an interrupted run
+                self._index[entry["url"]] = entry
+
+    def _blob_path(self, digest):
+        return os.path.join(self.root, "objects", digest[:2], f"{digest}.gz")
+
+    def get(self, url, allow_stale=False):
+        """Return the cached page for `url`, or None if missing or older than the TTL."""
+        entry = self._index.get(canonical_url(url))
+        if entry is None:
+            return None
+        if not allow_stale and self.ttl is not None and time.time() - entry["fetched_at"] > self.ttl:
+            return None
+        try:
+            with open(self._blob_path(entry["sha256"]), "rb") as f:
+                return gzip.decompress(f.read()).decode("utf-8")
+        except (OSError, EOFError):
+            return None
+
+    def put(self, url, text):
+        """Store `text` as the latest response for `url`."""
+        data = text.encode("utf-8")
+        digest = hashlib.sha256(data).hexdigest()
+        blob_path = self._blob_path(digest)
+        if not os.path.exists(blob_path):
+            os.makedirs(os.path.dirname(blob_path), exist_ok=True)
+            tmp_path = f"{blob_path}.{threading.get_ident()}.tmp"
+            with open(tmp_path, "wb") as f:
+                f.write(gzip.compress(data))
+            os.replace(tmp_path, blob_path)
+
+        entry = {"url": canonical_url(url), "sha256": digest, "fetched_at": time.time()}
+        with self._lock:
+            self._index[entry["url"]] = entry
+            with open(self._index_path, "a", encoding="utf-8") as f:
+                f.write(json.dumps(entry) + "\n")
+
+    def urls(self):
+        """Canonical URLs of every cached page."""
+        return list(self._index)
+
+    def cached_years(self):
+        """Years whose `/year/YYYY/` listing page is in the cache."""
+        years = set()
+        for url in self._index:
+            match = re.search(r"/year/(\d{4})/$", urlsplit(url).path)
+            if match:
+                years.add(int(match.group(1)))
+        return sorted(years)
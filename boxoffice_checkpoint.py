@@ -0,0 +1,154 @@
+#!/usr/bin/env python3
+"""
+Crash-safe checkpoint journal for per-year box office scrapes.
+
+Each year gets a small JSON-lines journal. Its first line holds the release
+links chosen for the run (with --fast, also the listing fields their rows are
+built from); every completed release then appends one line with its extracted
+figures, keyed by release ID, and is fsynced. Recording a release costs one
+short line however many came before it, a crash or Ctrl-C loses at most the
+requests in flight, and `--resume` can pick up exactly where the run stopped.
+The whole journal is only rewritten (fsync + atomic rename) when the links are
+set or the year is done.
+"""
+
+import json
+import os
+import re
+import threading
+
+DEFAULT_CHECKPOINT_DIR = ".boxoffice_checkpoint"
+
+
+def release_id(url):
+    """Return the `rlNNNN` release ID of a release URL (or the URL itself)."""
+    match = re.search(r"/release/(rl\d+)", url)
+    return match.group(1) if match else url
+
+
+def _fsync_dir(directory):
+    # Directory fsync makes the rename itself durable; not supported everywhere
+    try:
+        fd = os.open(directory or ".", os.O_RDONLY)
+    except OSError:
+        return
+    try:
+        os.fsync(fd)
+    except OSError:
+        pass
+    finally:
+        os.close(fd)
+
+
+def atomic_write(path, write):
+    """Call `write(f)` on a temporary file, fsync it and rename it over `path`."""
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, "w", newline="", encoding="utf-8") as f:
+        write(f)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp_path, path)
+    _fsync_dir(os.path.dirname(path))
+
+
+def _journal_path(directory, year):
+    return os.path.join(directory, f"{year}.jsonl")
+
+
+class YearJournal:
+    """Checkpoint state for one year of a scrape."""
+
+    def __init__(self, path, key):
+        self.path = path
+        self.key = key
+        self.links = None
+        self.listing = None  # per link, the listing fields a --fast run takes its rows from
+        self.completed = {}
+        self.done = False
+        self._on_disk = False  # the file holds this journal, so records can be appended to it
+        self._lock = threading.Lock()
+
+    @classmethod
+    def open(cls, directory, year, key, resume=False):
+        """
+        Load the journal for `year` when resuming a run with the same `key`
+        (scraper + settings), otherwise start a fresh one.
+        """
+        os.makedirs(directory, exist_ok=True)
+        journal = cls(_journal_path(directory, year), key)
+        if resume and os.path.exists(journal.path):
+            with open(journal.path, "r", encoding="utf-8") as f:
+                lines = f.read().split("\n")
+            try:
+                state = json.loads(lines[0])
+            except ValueError:
+                state = {}
+            if state.get("key") == key:
+                journal.links = state.get("links")
+                journal.listing = state.get("listing")
+                journal.done = state.get("done", False)
+                journal._on_disk = True
+                torn = False
+                for line in lines[1:]:
+                    if not line:
+                        continue
+                    try:
+                        entry = json.loads(line)
+                    except ValueError:
+                        torn = True  # The run died while appending this line
+                        break
+                    journal.completed[entry["id"]] = entry["row"]
+                if torn:
+                    # Appending after a partial line would hide everything recorded later
+                    journal._save()
+        return journal
+
+    def _save(self):
+        header = {"key": self.key, "links": self.links, "listing": self.listing, "done": self.done}
+
+        def write(f):
+            f.write(json.dumps(header) + "\n")
+            for rid, row in self.completed.items():
+                f.write(json.dumps({"id": rid, "row": row}) + "\n")
+
+        atomic_write(self.path, write)
+        self._on_disk = True
+
+    def _append(self, rid, row):
+        with open(self.path, "a", encoding="utf-8") as f:
+            f.write(json.dumps({"id": rid, "row": row}) + "\n")
+            f.flush()
+            os.fsync(f.fileno())
+
+    def set_links(self, links, listing=None):
+        with self._lock:
+            self.links = list(links)
+            self.listing = listing
+            self._save()
+
+    def get(self, url):
+        """Return the recorded result for `url`, or None if it still has to be scraped."""
+        row = self.completed.get(release_id(url))
+        return tuple(row) if row is not None else None
+
+    def record(self, url, result):
+        with self._lock:
+            rid = release_id(url)
+            self.completed[rid] = list(result)
+            if self._on_disk:
+                self._append(rid, self.completed[rid])
+            else:
+                self._save()
+
+    def mark_done(self):
+        with self._lock:
+            self.done = True
+            self._save()
+
+
+def clear(directory, years):
+    """Remove the journals of `years` once a run has finished."""
+    for year in years:
+        path = _journal_path(directory, year)
+        if os.path.exists(path):
+            os.remove(path)
@@ -0,0 +1,58 @@
+#!/usr/bin/env python3
+"""
+File helpers shared by the offline tools (the merge, the columnar store and
+the nominee index), so none of them has to import another tool's script.
+
+- file_sha256 hashes a source file, to tell whether an output is stale
+- write_dictionary / StringDictionary write and memory-map the UTF-8
+  dictionary of a dictionary-encoded string column (NumPy required)
+- format_imdb_id turns a stored IMDb number back into "tt0017136"
+"""
+
+import hashlib
+import mmap
+import os
+
+try:
+    import numpy as np
+except ImportError:
+    np = None  # only the dictionary helpers need it; the merge does not
+
+
+def file_sha256(path: str) -> str:
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(1 << 20), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def format_imdb_id(number):
+    return f"tt{number:07d}" if number else ""
+
+
+def write_dictionary(directory, column, dictionary):
+    encoded = [value.encode("utf-8") for value in dictionary]  # insertion order == code order
+    offsets = np.zeros(len(encoded) + 1, dtype=np.int64)
+    np.cumsum([len(value) for value in encoded], out=offsets[1:])
+    with open(os.path.join(directory, f"{column}.dict.bin"), "wb") as f:
+        f.write(b"".join(encoded))
+    np.save(os.path.join(directory, f"{column}.dict.offsets.npy"), offsets)
+
+
+class StringDictionary:
+    """Memory-mapped dictionary of a string column; decodes int32 codes back to str."""
+
+    def __init__(self, directory, column):
+        self.offsets = np.load(os.path.join(directory, f"{column}.dict.offsets.npy"), mmap_mode="r")
+        with open(os.path.join(directory, f"{column}.dict.bin"), "rb") as f:
+            self._blob = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) if self.offsets[-1] else b""
+
+    def __len__(self):
+        return len(self.offsets) - 1
+
+    def __getitem__(self, code):
+        return self._blob[self.offsets[code]:self.offsets[code + 1]].decode("utf-8")
+
+    def decode(self, codes):
+        return [self[code] for code in codes]
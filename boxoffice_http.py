@@ -0,0 +1,248 @@
+#!/usr/bin/env python3
+"""
+Fetch layer shared by the Box Office Mojo scrapers.
+
+Every page request goes through `fetch_page`, which consults the on-disk page
+cache first and, in offline mode, never touches the network. Requests that do
+go out are timed into the run's RunMetrics and reported to its HostBudget,
+which adapts the request rate to the responses, when those are configured.
+
+Requests have connect and read deadlines. Timeouts, connection errors and
+429/5xx responses are retried a few times with jittered exponential backoff,
+and a per-host CircuitBreaker pauses all requests to a host whose error rate
+spikes. A page that still cannot be fetched raises FetchError rather than
+handing an error page to the parser.
+
+All requests of a run share one client: a requests.Session whose keep-alive
+pool holds a connection per worker and asks for every compression it can
+decode, or with http2=True an httpx client that multiplexes the concurrent
+requests over one HTTP/2 connection per host (needs `pip install httpx[http2]`).
+"""
+
+import random
+import threading
+import time
+from collections import deque
+from urllib.parse import urlparse
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util import make_headers
+
+from boxoffice_metrics import instrument_session
+from boxoffice_money import BASE_URL  # noqa: F401  (re-exported for the scrapers)
+
+try:
+    import h2  # noqa: F401  (httpx needs it for HTTP/2)
+    import httpx
+except ImportError:
+    httpx = None
+
+HEADERS = {
+    "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/58.0.3029.110 Safari/537.3"
+}
+
+# gzip and deflate, plus br and zstd when brotli / zstandard are installed to decode them
+ACCEPT_ENCODING = make_headers(accept_encoding=True)["accept-encoding"]
+
+CONNECT_TIMEOUT = 5.0
+READ_TIMEOUT = 30.0
+RETRIES = 3
+BACKOFF = 1.0       # seconds before the first retry, doubling with every attempt
+MAX_BACKOFF = 30.0
+
+# Responses worth trying again; anything else that is not 2xx/3xx is final
+RETRY_STATUSES = (429, 500, 502, 503, 504)
+
+NETWORK_ERRORS = (requests.RequestException,) + ((httpx.HTTPError,) if httpx is not None else ())
+
+
+class CacheMiss(LookupError):
+    """Raised in offline mode when a page is not in the cache."""
+
+
+class FetchError(RuntimeError):
+    """A page could not be fetched. `retryable` is False when asking again cannot help (e.g. a 404)."""
+
+    def __init__(self, url, reason, retryable=True):
+        super().__init__(f"{reason}: {url}")
+        self.url = url
+        self.reason = reason
+        self.retryable = retryable
+
+
+class _Circuit:
+    def __init__(self, window):
+        self.outcomes = deque(maxlen=window)  # True for a success
+        self.open_until = 0.0  # 0 while closed
+
+
+class CircuitBreaker:
+    """
+    Per-host circuit breaker. Once `threshold` of the last `window` requests to
+    a host have failed, the circuit opens and requests to that host wait out a
+    `cooldown`. After it a single trial request goes through: its success
+    closes the circuit, its failure opens it for another cooldown.
+    """
+
+    def __init__(self, window=20, threshold=0.5, cooldown=30.0, min_requests=5):
+        self.window = window
+        self.threshold = threshold
+        self.cooldown = cooldown
+        self.min_requests = min_requests
+        self._lock = threading.Lock()
+        self._hosts = {}
+        self.opened = 0
+
+    def _circuit(self, url):
+        host = urlparse(url).netloc
+        circuit = self._hosts.get(host)
+        if circuit is None:
+            circuit = self._hosts[host] = _Circuit(self.window)
+        return host, circuit
+
+    def wait(self, url):
+        """Block until a request to the host of `url` may go out."""
+        while True:
+            with self._lock:
+                _, circuit = self._circuit(url)
+                now = time.monotonic()
+                if not circuit.open_until:
+                    return
+                if now >= circuit.open_until:
+                    # Half open: this request is the trial, everyone else keeps waiting
+                    circuit.open_until = now + self.cooldown
+                    return
+                delay = circuit.open_until - now
+            time.sleep(min(delay, 1.0))
+
+    def record(self, url, ok):
+        with self._lock:
+            host, circuit = self._circuit(url)
+            now = time.monotonic()
+            if circuit.open_until:
+                # The trial request (or one sent before the circuit opened)
+                if ok:
+                    circuit.open_until = 0.0
+                    circuit.outcomes.clear()
+                else:
+                    circuit.open_until = now + self.cooldown
+                return
+            circuit.outcomes.append(ok)
+            failures = circuit.outcomes.count(False)
+            if len(circuit.outcomes) >= self.min_requests and failures >= self.threshold * len(circuit.outcomes):
+                circuit.open_until = now + self.cooldown
+                self.opened += 1
+                print(f"⛔ {failures} of the last {len(circuit.outcomes)} requests to {host} failed; "
+                      f"pausing it for {self.cooldown:g}s")
+
+
+class Fetcher:
+    def __init__(self, cache=None, offline=False, metrics=None, budget=None, timeout=(CONNECT_TIMEOUT, READ_TIMEOUT),
+                 retries=RETRIES, backoff=BACKOFF, breaker=None, pool_size=10, http2=False):
+        if http2 and httpx is None:
+            raise ValueError("HTTP/2 needs httpx with HTTP/2 support (pip install 'httpx[http2]')")
+        self.cache = cache
+        self.offline = offline
+        self.metrics = metrics
+        self.budget = budget
+        self.timeout = timeout
+        self.retries = retries
+        self.backoff = backoff
+        self.breaker = breaker if breaker is not None else CircuitBreaker()
+        self.http2 = http2
+        if http2:
+            # httpx asks for every encoding it can decode by itself
+            self.session = httpx.Client(http2=True, headers=HEADERS, follow_redirects=True,
+                                        limits=httpx.Limits(max_connections=pool_size))
+            self.timeout = httpx.Timeout(timeout[1], connect=timeout[0])
+        else:
+            self.session = requests.Session()
+            self.session.headers.update(HEADERS)
+            self.session.headers["Accept-Encoding"] = ACCEPT_ENCODING
+            # Keep a connection per worker alive instead of dropping any beyond the default 10
+            if metrics is not None:
+                instrument_session(self.session, metrics, pool_maxsize=pool_size)
+            else:
+                adapter = HTTPAdapter(pool_maxsize=pool_size)
+                self.session.mount("https://", adapter)
+                self.session.mount("http://", adapter)
+
+    def _get(self, url):
+        if not self.http2:
+            return self.session.get(url, timeout=self.timeout)
+        # The InstrumentedAdapter only sees requests traffic, so httpx responses are recorded here
+        host = urlparse(url).netloc
+        try:
+            resp = self.session.get(url, timeout=self.timeout)
+        except httpx.HTTPError as e:
+            if self.metrics is not None:
+                self.metrics.observe_request(host, {}, error=e)
+            raise
+        if self.metrics is not None:
+            self.metrics.observe_request(host, {"total": resp.elapsed.total_seconds()}, status=resp.status_code,
+                                         wire_bytes=resp.num_bytes_downloaded, decoded_bytes=len(resp.content))
+        return resp
+
+    def _backoff_delay(self, attempt):
+        # "Full jitter": spreads retries from parallel workers over the whole interval
+        return random.uniform(0, min(MAX_BACKOFF, self.backoff * 2 ** (attempt - 1)))
+
+    def fetch(self, url):
+        """Return the HTML for `url`, from the cache when possible; raises FetchError once retries run out."""
+        if self.cache is not None:
+            text = self.cache.get(url, allow_stale=self.offline)
+            if text is not None:
+                if self.metrics is not None:
+                    self.metrics.observe_cache_hit()
+                return text
+        if self.offline:
+            raise CacheMiss(url)
+
+        error = None
+        for attempt in range(self.retries + 1):
+            if attempt:
+                time.sleep(self._backoff_delay(attempt))
+                if self.budget is not None:
+                    # Retries count against the host's rate (and wait out any Retry-After)
+                    self.budget.pace(url)
+                if self.metrics is not None:
+                    self.metrics.observe_retry(urlparse(url).netloc)
+            self.breaker.wait(url)
+            try:
+                resp = self._get(url)
+            except NETWORK_ERRORS as e:
+                self.breaker.record(url, False)
+                error = FetchError(url, type(e).__name__)
+                continue
+            if self.budget is not None:
+                self.budget.feedback(url, resp.status_code, resp.elapsed.total_seconds(), resp.headers.get("Retry-After"))
+            if resp.status_code < 400:
+                self.breaker.record(url, True)
+                # Only successful responses are worth replaying later
+                if self.cache is not None:
+                    self.cache.put(url, resp.text)
+                return resp.text
+            retryable = resp.status_code in RETRY_STATUSES
+            # A 404 says nothing about the health of the host
+            self.breaker.record(url, not retryable)
+            error = FetchError(url, f"HTTP {resp.status_code}", retryable)
+            if not retryable:
+                break
+        raise error
+
+
+default_fetcher = Fetcher()
+
+
+def configure(cache=None, offline=False, metrics=None, budget=None, timeout=(CONNECT_TIMEOUT, READ_TIMEOUT),
+              retries=RETRIES, pool_size=10, http2=False):
+    """Replace the fetcher used by `fetch_page`; raises ValueError if HTTP/2 is requested but unavailable."""
+    global default_fetcher
+    default_fetcher = Fetcher(cache=cache, offline=offline, metrics=metrics, budget=budget, timeout=timeout,
+                              retries=retries, pool_size=pool_size, http2=http2)
+    return default_fetcher
+
+
+def fetch_page(url):
+    return default_fetcher.fetch(url)
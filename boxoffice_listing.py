@@ -0,0 +1,49 @@
+#!/usr/bin/env python3
+"""
+Parsing of Box Office Mojo `/year/YYYY/` listing tables.
+"""
+
+from bs4 import BeautifulSoup
+
+from boxoffice_http import BASE_URL, fetch_page
+
+LISTING_PAGE_ROWS = 200
+
+
+def parse_year_listing(html):
+    """
+    Return the release rows of a year listing in rank order.
+
+    Each row is a dict of the table's cells keyed by column header (e.g.
+    "Rank", "Release", "Total Gross"), plus "link", the relative release URL.
+    """
+    soup = BeautifulSoup(html, "html.parser")
+    table = soup.find("table")
+    rows = []
+    if table:
+        table_rows = table.find_all("tr")
+        header = [cell.get_text(strip=True) for cell in table_rows[0].find_all(["th", "td"])] if table_rows else []
+        for row in table_rows[1:]:
+            a = row.find("a")
+            if a and a.get("href", "").startswith("/release/"):
+                cells = [cell.get_text(strip=True) for cell in row.find_all("td")]
+                entry = dict(zip(header, cells))
+                entry["link"] = a["href"]  # Just store the relative path
+                rows.append(entry)
+    return rows
+
+
+def fetch_year_listing(year, limit=None):
+    """
+    Fetch the release rows of `year`. A listing page holds at most 200 rows;
+    with `limit`, the following pages (`?offset=200`, ...) are fetched too
+    until `limit` rows are in or the listing ends.
+    """
+    rows = parse_year_listing(fetch_page(f"{BASE_URL}/year/{year}/"))
+    while limit is not None and rows and len(rows) < limit and len(rows) % LISTING_PAGE_ROWS == 0:
+        page = parse_year_listing(fetch_page(f"{BASE_URL}/year/{year}/?offset={len(rows)}"))
+        # A page repeating the first one means the offset was ignored
+        if not page or page[0]["link"] == rows[0]["link"]:
+            break
+        rows.extend(page)
+    return rows
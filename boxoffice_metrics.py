@@ -0,0 +1,343 @@
+#!/usr/bin/env python3
+"""
+Per-request network instrumentation for the scrapers.
+
+`InstrumentedAdapter` is mounted on a requests.Session and times every request
+it sends:
+
+    dns       name resolution (new connections only)
+    connect   TCP connect plus TLS handshake (new connections only)
+    ttfb      request sent until the response headers are in
+    total     request sent until the body is read
+
+along with the status code, the bytes on the wire and after decoding, and the
+retry count. Parse time is added by the callers with `RunMetrics.time_parse`.
+Everything goes into fixed-bucket histograms that `RunMetrics.write` exports
+at the end of a run as a Prometheus text file and a JSON summary.
+"""
+
+import json
+import os
+import socket
+import threading
+import time
+from contextlib import contextmanager
+from urllib.parse import urlparse
+
+from requests.adapters import HTTPAdapter
+from urllib3.connection import HTTPConnection, HTTPSConnection
+from urllib3.connectionpool import HTTPConnectionPool, HTTPSConnectionPool
+from urllib3.exceptions import ConnectTimeoutError, NameResolutionError, NewConnectionError
+from urllib3.util.connection import allowed_gai_family, create_connection
+
+from boxoffice_checkpoint import atomic_write
+
+DEFAULT_METRICS_DIR = "metrics"
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+SIZE_BUCKETS = (1024, 4096, 16384, 65536, 262144, 1048576, 4194304)
+PHASES = ("dns", "connect", "ttfb", "total")
+
+# The request being sent on this thread; connections report their setup into it
+_current = threading.local()
+
+
+class Histogram:
+    """Cumulative-bucket histogram in the Prometheus sense."""
+
+    def __init__(self, buckets):
+        self.buckets = tuple(buckets)
+        self.counts = [0] * (len(self.buckets) + 1)  # the last one is +Inf
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value):
+        for i, bound in enumerate(self.buckets):
+            if value <= bound:
+                self.counts[i] += 1
+                break
+        else:
+            self.counts[-1] += 1
+        self.sum += value
+        self.count += 1
+
+    def quantile(self, q):
+        """Upper bound of the bucket holding the q-th observation (None when empty)."""
+        if not self.count:
+            return None
+        rank = q * self.count
+        seen = 0
+        for bound, count in zip(self.buckets, self.counts):
+            seen += count
+            if seen >= rank:
+                return bound
+        return float("inf")
+
+    def summary(self, digits=4):
+        if not self.count:
+            return {"count": 0}
+        p99 = self.quantile(0.99)
+        return {"count": self.count, "sum": round(self.sum, digits), "mean": round(self.sum / self.count, digits),
+                "p50": self.quantile(0.5), "p90": self.quantile(0.9),
+                "p99": p99 if p99 != float("inf") else f">{self.buckets[-1]}"}
+
+
+class RunMetrics:
+    """Thread-safe collection of request and parse measurements for one run."""
+
+    def __init__(self, name):
+        self.name = name
+        self.started = time.time()
+        self._lock = threading.Lock()
+        self.latency = {}       # (host, phase) -> Histogram
+        self.wire_bytes = {}    # host -> Histogram
+        self.decoded_bytes = {}  # host -> total
+        self.statuses = {}      # (host, status) -> count
+        self.retries = {}       # host -> count
+        self.connections = {}   # host -> new connections opened
+        self.errors = {}        # (host, error type) -> count
+        self.cache_hits = 0
+        self.parse = Histogram(LATENCY_BUCKETS)
+
+    def observe_request(self, host, timings, status=None, wire_bytes=None, decoded_bytes=None, retries=0,
+                        error=None):
+        """Record one request; `timings` maps phase names to seconds and may omit any of them."""
+        with self._lock:
+            for phase, seconds in timings.items():
+                histogram = self.latency.get((host, phase))
+                if histogram is None:
+                    histogram = self.latency[(host, phase)] = Histogram(LATENCY_BUCKETS)
+                histogram.observe(seconds)
+            if "connect" in timings:
+                self.connections[host] = self.connections.get(host, 0) + 1
+            if status is not None:
+                self.statuses[(host, status)] = self.statuses.get((host, status), 0) + 1
+            if wire_bytes is not None:
+                histogram = self.wire_bytes.get(host)
+                if histogram is None:
+                    histogram = self.wire_bytes[host] = Histogram(SIZE_BUCKETS)
+                histogram.observe(wire_bytes)
+            if decoded_bytes is not None:
+                self.decoded_bytes[host] = self.decoded_bytes.get(host, 0) + decoded_bytes
+            if retries:
+                self.retries[host] = self.retries.get(host, 0) + retries
+            if error is not None:
+                key = (host, type(error).__name__)
+                self.errors[key] = self.errors.get(key, 0) + 1
+
+    def observe_retry(self, host):
+        """Record a request repeated by the caller after a failed attempt."""
+        with self._lock:
+            self.retries[host] = self.retries.get(host, 0) + 1
+
+    def observe_cache_hit(self):
+        with self._lock:
+            self.cache_hits += 1
+
+    def observe_parse(self, seconds):
+        with self._lock:
+            self.parse.observe(seconds)
+
+    @contextmanager
+    def time_parse(self):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe_parse(time.perf_counter() - start)
+
+    def requests(self):
+        return sum(self.statuses.values()) + sum(self.errors.values())
+
+    def summary(self):
+        """The JSON run summary."""
+        with self._lock:
+            hosts = sorted({host for host, _ in self.latency} | {host for host, _ in self.statuses}
+                           | {host for host, _ in self.errors})
+            return {
+                "name": self.name,
+                "started": self.started,
+                "duration_seconds": round(time.time() - self.started, 3),
+                "requests": self.requests(),
+                "cache_hits": self.cache_hits,
+                "hosts": {host: {
+                    "requests": sum(n for (h, _), n in self.statuses.items() if h == host),
+                    "statuses": {str(status): n for (h, status), n in sorted(self.statuses.items()) if h == host},
+                    "errors": {name: n for (h, name), n in sorted(self.errors.items()) if h == host},
+                    "retries": self.retries.get(host, 0),
+                    "new_connections": self.connections.get(host, 0),
+                    "wire_bytes": round(self.wire_bytes[host].sum) if host in self.wire_bytes else 0,
+                    "decoded_bytes": self.decoded_bytes.get(host, 0),
+                    "latency_seconds": {phase: self.latency[(host, phase)].summary()
+                                        for phase in PHASES if (host, phase) in self.latency},
+                } for host in hosts},
+                "parse_seconds": self.parse.summary(),
+            }
+
+    def prometheus(self):
+        """The metrics in the Prometheus text exposition format."""
+        lines = []
+
+        def histogram(name, help_text, series):
+            lines.append(f"# HELP {name} {help_text}")
+            lines.append(f"# TYPE {name} histogram")
+            for labels, values in series:
+                cumulative = 0
+                for bound, count in zip(values.buckets + ("+Inf",), values.counts):
+                    cumulative += count
+                    lines.append(f'{name}_bucket{_labels(labels, le=bound)} {cumulative}')
+                lines.append(f"{name}_sum{_labels(labels)} {values.sum:g}")
+                lines.append(f"{name}_count{_labels(labels)} {values.count}")
+
+        def counter(name, help_text, series):
+            lines.append(f"# HELP {name} {help_text}")
+            lines.append(f"# TYPE {name} counter")
+            for labels, value in series:
+                lines.append(f"{name}{_labels(labels)} {value}")
+
+        with self._lock:
+            histogram("scrape_request_duration_seconds", "Request latency by phase.",
+                      [({"host": host, "phase": phase}, values) for (host, phase), values in sorted(self.latency.items())])
+            histogram("scrape_response_wire_bytes", "Response size as received, before decompression.",
+                      [({"host": host}, values) for host, values in sorted(self.wire_bytes.items())])
+            histogram("scrape_parse_duration_seconds", "Time to parse one fetched page.", [({}, self.parse)])
+            counter("scrape_requests_total", "Responses by status code.",
+                    [({"host": host, "status": status}, n) for (host, status), n in sorted(self.statuses.items())])
+            counter("scrape_request_errors_total", "Requests that failed without a response.",
+                    [({"host": host, "error": name}, n) for (host, name), n in sorted(self.errors.items())])
+            counter("scrape_retries_total", "Retried requests.", [({"host": host}, n) for host, n in sorted(self.retries.items())])
+            counter("scrape_connections_total", "New connections opened.",
+                    [({"host": host}, n) for host, n in sorted(self.connections.items())])
+            counter("scrape_response_decoded_bytes_total", "Response bytes after decompression.",
+                    [({"host": host}, n) for host, n in sorted(self.decoded_bytes.items())])
+            counter("scrape_cache_hits_total", "Pages served from the page cache.", [({}, self.cache_hits)])
+        return "\n".join(lines) + "\n"
+
+    def write(self, directory=DEFAULT_METRICS_DIR):
+        """Write <name>.prom and <name>.json into `directory`; returns both paths."""
+        os.makedirs(directory, exist_ok=True)
+        prom_path = os.path.join(directory, f"{self.name}.prom")
+        json_path = os.path.join(directory, f"{self.name}.json")
+        atomic_write(prom_path, lambda f: f.write(self.prometheus()))
+        summary = self.summary()
+        atomic_write(json_path, lambda f: json.dump(summary, f, indent=1))
+        return prom_path, json_path
+
+    def report(self):
+        """One line for the end of a run."""
+        summary = self.summary()
+        parts = [f"{summary['requests']} requests", f"{summary['cache_hits']} cache hits"]
+        for host, stats in summary["hosts"].items():
+            total = stats["latency_seconds"].get("total", {})
+            if total.get("count"):
+                parts.append(f"{host}: p50 {total['p50']}s p90 {total['p90']}s, "
+                             f"{stats['wire_bytes'] / 1e6:.1f} MB on the wire, {stats['new_connections']} connections")
+        if summary["parse_seconds"]["count"]:
+            parts.append(f"parse mean {summary['parse_seconds']['mean'] * 1000:.1f} ms")
+        return ", ".join(parts)
+
+
+def _labels(labels, **extra):
+    labels = {**labels, **extra}
+    if not labels:
+        return ""
+    return "{" + ",".join(f'{key}="{value}"' for key, value in labels.items()) + "}"
+
+
+def _record_setup(phase, seconds):
+    timings = getattr(_current, "timings", None)
+    if timings is not None:
+        timings[phase] = timings.get(phase, 0.0) + seconds
+
+
+class _TimedConnectionMixin:
+    def _new_conn(self):
+        # urllib3's _new_conn, with the name lookup done (and timed) here and
+        # the resolved addresses handed to the connect, so it is looked up once
+        start = time.perf_counter()
+        try:
+            addresses = socket.getaddrinfo(self._dns_host, self.port, allowed_gai_family(), socket.SOCK_STREAM)
+        except socket.gaierror as e:
+            raise NameResolutionError(self.host, self, e) from e
+        finally:
+            _record_setup("dns", time.perf_counter() - start)
+
+        error = NewConnectionError(self, "Failed to establish a new connection: no addresses")
+        for *_, address in addresses:
+            try:
+                return create_connection(address[:2], self.timeout, source_address=self.source_address,
+                                         socket_options=self.socket_options)
+            except socket.timeout:
+                error = ConnectTimeoutError(
+                    self, f"Connection to {self.host} timed out. (connect timeout={self.timeout})")
+            except OSError as e:
+                error = NewConnectionError(self, f"Failed to establish a new connection: {e}")
+        raise error
+
+    def connect(self):
+        start = time.perf_counter()
+        super().connect()
+        timings = getattr(_current, "timings", None)
+        if timings is not None:
+            _record_setup("connect", time.perf_counter() - start - timings.get("dns", 0.0))
+
+
+class _TimedHTTPConnection(_TimedConnectionMixin, HTTPConnection):
+    pass
+
+
+class _TimedHTTPSConnection(_TimedConnectionMixin, HTTPSConnection):
+    pass
+
+
+class _TimedHTTPConnectionPool(HTTPConnectionPool):
+    ConnectionCls = _TimedHTTPConnection
+
+
+class _TimedHTTPSConnectionPool(HTTPSConnectionPool):
+    ConnectionCls = _TimedHTTPSConnection
+
+
+class InstrumentedAdapter(HTTPAdapter):
+    """HTTPAdapter that reports every request it sends to a RunMetrics."""
+
+    def __init__(self, metrics, **kwargs):
+        self.metrics = metrics
+        super().__init__(**kwargs)
+
+    def init_poolmanager(self, *args, **kwargs):
+        super().init_poolmanager(*args, **kwargs)
+        self.poolmanager.pool_classes_by_scheme = {"http": _TimedHTTPConnectionPool,
+                                                   "https": _TimedHTTPSConnectionPool}
+
+    def send(self, request, stream=False, **kwargs):
+        host = urlparse(request.url).netloc
+        timings = _current.timings = {}
+        start = time.perf_counter()
+        try:
+            response = super().send(request, stream=stream, **kwargs)
+        except Exception as e:
+            _current.timings = None
+            self.metrics.observe_request(host, timings, error=e)
+            raise
+        timings["ttfb"] = time.perf_counter() - start
+        _current.timings = None
+
+        wire_bytes = decoded_bytes = None
+        if not stream:
+            # Read the body here (requests would right after) so the total covers it
+            decoded_bytes = len(response.content)
+            timings["total"] = time.perf_counter() - start
+            wire_bytes = response.raw.tell()
+        history = getattr(getattr(response.raw, "retries", None), "history", ())
+        self.metrics.observe_request(host, timings, status=response.status_code, wire_bytes=wire_bytes,
+                                     decoded_bytes=decoded_bytes, retries=len(history))
+        return response
+
+
+def instrument_session(session, metrics, **adapter_kwargs):
+    """Mount an InstrumentedAdapter on `session` for http and https; returns the adapter."""
+    adapter = InstrumentedAdapter(metrics, **adapter_kwargs)
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    return adapter
@@ -0,0 +1,120 @@
+#!/usr/bin/env python3
+"""
+Money values and box office records shared by the scrapers, the merge and the
+analysis tools.
+
+- money_value / parse_money / format_money convert single "$1,234,567" strings
+- parse_money_column parses a whole column at once: with NumPy, the strings
+  become a byte matrix whose digits are accumulated with one np.where per
+  character position (a plain parse_money loop into array('q') otherwise)
+- BoxOfficeRecord is a compact __slots__ row holding integer amounts
+"""
+
+import csv
+from array import array
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+BASE_URL = "https://www.boxofficemojo.com"  # the URL column's release links start with it
+MERGED_HEADERS = ["Year", "Title", "Domestic", "International", "Worldwide", "ImdbID", "URL"]
+
+_DIGIT_0, _DIGIT_9, _DOLLAR, _COMMA = b"0"[0], b"9"[0], b"$"[0], b","[0]
+_SPACE, _TAB, _CARRIAGE_RETURN = b" "[0], b"\t"[0], b"\r"[0]  # \t \n \v \f \r are consecutive
+
+
+def money_value(text):
+    """Strict parse of "$1,234,567"; raises ValueError for anything that is not a number."""
+    return int(text.replace('$', '').replace(',', ''))
+
+
+def parse_money(text):
+    """Lenient parse of "$1,234,567"; anything that is not a plain amount counts as 0."""
+    digits = text.replace('$', '').replace(',', '').strip()
+    return int(digits) if digits.isdigit() else 0
+
+
+def format_money(value):
+    return f"${value:,}"
+
+
+def parse_money_column(values):
+    """
+    Parse a sequence of money strings in one go, leniently like `parse_money`.
+    Returns an int64 NumPy array, or an array('q') when NumPy is not installed.
+
+    The strings are laid out as a (rows x characters) byte matrix and the digits
+    of every row are accumulated column by column, so the work is a handful of
+    array operations per character position rather than per value.
+    """
+    if np is None:
+        return array("q", (parse_money(value) for value in values))
+    try:
+        raw = np.asarray(values, dtype=np.bytes_)
+    except UnicodeEncodeError:
+        # Not ASCII, so not a plain amount anywhere; let the scalar parser decide
+        return np.array([parse_money(value) for value in values], dtype=np.int64)
+    if raw.size == 0 or raw.itemsize == 0:
+        return np.zeros(raw.size, dtype=np.int64)
+
+    chars = raw.view(np.uint8).reshape(raw.size, raw.itemsize)
+    is_digit = (chars >= _DIGIT_0) & (chars <= _DIGIT_9)
+    is_space = (chars == _SPACE) | ((chars >= _TAB) & (chars <= _CARRIAGE_RETURN))
+    ignored = (chars == _DOLLAR) | (chars == _COMMA) | (chars == 0)  # 0 pads shorter strings
+    valid = (is_digit | is_space | ignored).all(axis=1) & is_digit.any(axis=1)
+    if is_space.any():
+        # Whitespace is only allowed before the first digit or after the last one
+        digits_before = np.cumsum(is_digit, axis=1, dtype=np.int8) - is_digit
+        digits_total = digits_before[:, -1:] + is_digit[:, -1:]
+        valid &= ~(is_space & (digits_before > 0) & (digits_before < digits_total)).any(axis=1)
+
+    amounts = np.zeros(raw.size, dtype=np.int64)
+    for position in range(raw.itemsize):
+        amounts = np.where(is_digit[:, position], amounts * 10 + (chars[:, position] - _DIGIT_0), amounts)
+    amounts[~valid] = 0
+    return amounts
+
+
+class BoxOfficeRecord:
+    """One release with its amounts as integers (0 when unknown)."""
+
+    __slots__ = ("year", "title", "domestic", "international", "worldwide", "imdb_id", "url")
+
+    def __init__(self, year, title, domestic, international, worldwide, imdb_id, url):
+        self.year = year
+        self.title = title
+        self.domestic = domestic
+        self.international = international
+        self.worldwide = worldwide
+        self.imdb_id = imdb_id
+        self.url = url
+
+    @classmethod
+    def from_row(cls, row):
+        """Build a record from an all_boxoffice.csv row (a dict keyed by its headers)."""
+        return cls(int(row["Year"]), row["Title"], parse_money(row["Domestic"]),
+                   parse_money(row["International"]), parse_money(row["Worldwide"]),
+                   row["ImdbID"], row["URL"])
+
+    def as_row(self):
+        """The record as an all_boxoffice.csv row, in MERGED_HEADERS order."""
+        return [str(self.year), self.title, format_money(self.domestic), format_money(self.international),
+                format_money(self.worldwide), self.imdb_id, self.url]
+
+    def __iter__(self):
+        return (getattr(self, field) for field in self.__slots__)
+
+    def __eq__(self, other):
+        return isinstance(other, BoxOfficeRecord) and tuple(self) == tuple(other)
+
+    def __repr__(self):
+        return f"BoxOfficeRecord({', '.join(f'{field}={getattr(self, field)!r}' for field in self.__slots__)})"
+
+
+def read_records(path):
+    """Stream BoxOfficeRecords from all_boxoffice.csv (or any file with its headers)."""
+    with open(path, "r", newline="", encoding="utf-8") as f:
+        for row in csv.DictReader(f):
+            yield BoxOfficeRecord.from_row(row)
@@ -0,0 +1,205 @@
+#!/usr/bin/env python3
+"""
+Pluggable HTML parser backends for Box Office Mojo release pages.
+
+The scrapers only need a handful of things from a release page: the <h1>
+title, the first IMDb title link, the text of the `mojo-summary-table` div
+(v2 scraper) and the text of every <span> (2025 scraper). `extract_release_page`
+returns exactly those, as BeautifulSoup would see them, using one of:
+
+- "bs4":        full BeautifulSoup/html.parser tree (the reference)
+- "lxml":       lxml, parsing only the fragments that are needed
+- "selectolax": selectolax (lexbor), parsing only the fragments that are needed
+
+lxml and selectolax are optional; "auto" picks the fastest one installed.
+The fast backends normalise CR LF line endings to LF like any HTML5 parser,
+which never changes the extracted figures.
+"""
+
+import re
+from collections import namedtuple
+from html import unescape
+
+from bs4 import BeautifulSoup
+
+try:
+    import lxml.html
+except ImportError:
+    lxml = None
+
+try:
+    from selectolax.lexbor import LexborHTMLParser
+except ImportError:
+    LexborHTMLParser = None
+
+BACKENDS = ("auto", "bs4", "lxml", "selectolax")
+SUMMARY_TABLE_CLASS = "a-section a-spacing-none mojo-gutter mojo-summary-table"
+IMDB_TITLE_RE = re.compile(r"imdb\.com/title/tt\d+")
+
+# BeautifulSoup's get_text() leaves out the contents of these elements
+_SKIP_TEXT_TAGS = ("script", "style", "template")
+
+_H1_RE = re.compile(r"<h1\b.*?</h1\s*>", re.I | re.S)
+_A_TAG_RE = re.compile(r"<a\s[^>]*>", re.I)
+_HREF_RE = re.compile(r"""\shref\s*=\s*(?:"([^"]*)"|'([^']*)'|([^\s>]+))""", re.I)
+_SUMMARY_OPEN_RE = re.compile(
+    r"""<div\s[^>]*\bclass\s*=\s*(["'])""" + re.escape(SUMMARY_TABLE_CLASS) + r"\1[^>]*>", re.I)
+_DIV_TAG_RE = re.compile(r"<(/?)div\b", re.I)
+
+ReleasePage = namedtuple("ReleasePage", ["title", "imdb_href", "summary_text", "span_texts"])
+ReleasePage.__doc__ = """\
+title:        stripped text of the first <h1>, or ""
+imdb_href:    href of the first link to an IMDb title page, or None
+summary_text: text of the mojo-summary-table div, or None if the page has none
+span_texts:   stripped text of every <span> in document order (only when requested)
+"""
+
+
+def _first_imdb_href(html):
+    for tag in _A_TAG_RE.finditer(html):
+        match = _HREF_RE.search(tag.group(0))
+        if match:
+            href = unescape(next(group for group in match.groups() if group is not None))
+            if IMDB_TITLE_RE.search(href):
+                return href
+    return None
+
+
+def _summary_fragment(html):
+    """Slice the mojo-summary-table div (with any nested divs) out of the raw page."""
+    match = _SUMMARY_OPEN_RE.search(html)
+    if not match:
+        return None
+    depth = 1
+    for tag in _DIV_TAG_RE.finditer(html, match.end()):
+        depth += -1 if tag.group(1) else 1
+        if depth == 0:
+            end = html.find(">", tag.end())
+            return html[match.start():end + 1 if end != -1 else len(html)]
+    return html[match.start():]
+
+
+def _h1_fragment(html):
+    match = _H1_RE.search(html)
+    return match.group(0) if match else None
+
+
+def _extract_bs4(html, spans):
+    soup = BeautifulSoup(html, "html.parser")
+    h1 = soup.find("h1")
+    imdb_link = soup.find("a", href=IMDB_TITLE_RE)
+    summary_table = soup.find("div", class_=SUMMARY_TABLE_CLASS)
+    return ReleasePage(
+        h1.text.strip() if h1 else "",
+        imdb_link.get("href", "") if imdb_link else None,
+        summary_table.get_text() if summary_table is not None else None,
+        [span.get_text(strip=True) for span in soup.find_all("span")] if spans else None,
+    )
+
+
+def _lxml_strings(element):
+    if not isinstance(element.tag, str) or element.tag in _SKIP_TEXT_TAGS:
+        return
+    if element.text:
+        yield element.text
+    for child in element:
+        yield from _lxml_strings(child)
+        if child.tail:
+            yield child.tail
+
+
+def _lxml_fragment(fragment):
+    return lxml.html.fragment_fromstring(fragment, create_parent="div")
+
+
+def _extract_lxml(html, spans):
+    h1 = _h1_fragment(html)
+    title = "".join(_lxml_strings(_lxml_fragment(h1))).strip() if h1 else ""
+
+    summary_text = None
+    fragment = _summary_fragment(html)
+    if fragment is not None:
+        summary_text = "".join(_lxml_strings(_lxml_fragment(fragment)))
+
+    span_texts = None
+    if spans:
+        try:
+            root = lxml.html.fromstring(html)
+        except ValueError:
+            # Unicode input with an XML encoding declaration
+            root = lxml.html.fromstring(html.encode("utf-8"))
+        span_texts = ["".join(text.strip() for text in _lxml_strings(span)) for span in root.iter("span")]
+
+    return ReleasePage(title, _first_imdb_href(html), summary_text, span_texts)
+
+
+def _selectolax_tree(html):
+    tree = LexborHTMLParser(html)
+    tree.strip_tags(list(_SKIP_TEXT_TAGS))
+    return tree
+
+
+def _selectolax_strings(node):
+    return [child.text_content for child in node.traverse(include_text=True) if child.tag == "-text"]
+
+
+def _extract_selectolax(html, spans):
+    h1 = _h1_fragment(html)
+    title = "".join(_selectolax_strings(_selectolax_tree(h1).css_first("h1"))).strip() if h1 else ""
+
+    summary_text = None
+    fragment = _summary_fragment(html)
+    if fragment is not None:
+        summary_text = "".join(_selectolax_strings(_selectolax_tree(fragment).css_first("div")))
+
+    span_texts = None
+    if spans:
+        span_texts = ["".join(text.strip() for text in _selectolax_strings(span))
+                      for span in _selectolax_tree(html).css("span")]
+
+    return ReleasePage(title, _first_imdb_href(html), summary_text, span_texts)
+
+
+_EXTRACTORS = {
+    "bs4": _extract_bs4,
+    "lxml": _extract_lxml,
+    "selectolax": _extract_selectolax,
+}
+
+
+def available_backends():
+    """Names of the backends that can be used in this environment, fastest first."""
+    backends = []
+    if LexborHTMLParser is not None:
+        backends.append("selectolax")
+    if lxml is not None:
+        backends.append("lxml")
+    backends.append("bs4")
+    return backends
+
+
+def resolve_backend(name):
+    if name == "auto":
+        return available_backends()[0]
+    if name not in available_backends():
+        raise ValueError(f"Parser backend '{name}' is not installed (available: {', '.join(available_backends())})")
+    return name
+
+
+_backend = resolve_backend("auto")
+
+
+def set_backend(name):
+    """Select the backend used by `extract_release_page`; returns the resolved name."""
+    global _backend
+    _backend = resolve_backend(name)
+    return _backend
+
+
+def get_backend():
+    return _backend
+
+
+def extract_release_page(html, spans=False, backend=None):
+    """Pull the fields the scrapers use out of a release page's HTML."""
+    return _EXTRACTORS[resolve_backend(backend) if backend else _backend](html, spans)
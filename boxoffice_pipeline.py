@@ -0,0 +1,200 @@
+#!/usr/bin/env python3
+"""
+Staged fetch/parse pipeline for the Box Office Mojo scrapers.
+
+Fetching is I/O-bound while parsing is CPU-bound and holds the GIL, so the two
+run in separate stages:
+
+    fetch threads --(bounded queue of raw HTML)--> parse processes --> ordered writer
+
+Fetch workers block once the queue is full and the parse stage never has more
+than two pages per process outstanding, so memory stays bounded however far
+the network runs ahead. Results are handed to the writer strictly in rank
+order, and can be checkpointed as soon as they are parsed. On Ctrl-C the
+fetchers stop taking work, queued pages are dropped and the process pool is
+shut down before the KeyboardInterrupt propagates; pages already parsed are
+still handed to `on_parsed` first.
+"""
+
+import queue
+import signal
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, ThreadPoolExecutor, wait
+
+from boxoffice_http import FetchError
+
+
+def _timed_parse(parse, html, url):
+    start = time.perf_counter()
+    result = parse(html, url)
+    return time.perf_counter() - start, result
+
+
+def _init_parse_worker(initializer, initargs):
+    # Only the parent handles Ctrl-C; workers are shut down by the pipeline
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+    if initializer is not None:
+        initializer(*initargs)
+
+
+class FetchParsePipeline:
+    """
+    Fetch pages with `fetch(url)` on threads and parse them with
+    `parse(html, url)` in a process pool. `parse` must be a module-level
+    (picklable) function; a `fetch` that returns None marks a page as
+    unavailable, which is passed on to the writer as a None result, and a
+    FetchError raised by `fetch` is passed on as the result too. With
+    `metrics`, the parse time of every page is recorded in it.
+    """
+
+    def __init__(self, fetch, parse, fetch_workers, parse_workers, budget,
+                 initializer=None, initargs=(), queue_size=None, metrics=None):
+        self.fetch = fetch
+        self.parse = parse
+        self.metrics = metrics
+        self.fetch_workers = max(1, fetch_workers)
+        self.parse_workers = max(1, parse_workers)
+        self.budget = budget
+        self.queue_size = queue_size or self.parse_workers * 4
+        self._pool = ProcessPoolExecutor(max_workers=self.parse_workers,
+                                         initializer=_init_parse_worker,
+                                         initargs=(initializer, initargs))
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def close(self, cancel=False):
+        self._pool.shutdown(wait=not cancel, cancel_futures=cancel)
+
+    def _fetch_stage(self, feed, pages, stop):
+        while not stop.is_set():
+            try:
+                item = feed.take()
+            except BaseException as e:  # The url stream itself failed
+                item = (feed.count, None, e)
+            if item is None:
+                return
+            rank, url, error = item
+            if error is None:
+                try:
+                    with self.budget.slot(url):
+                        item = (rank, url, self.fetch(url), None)
+                except FetchError as e:  # A result for this page, not a failure of the run
+                    item = (rank, url, e, None)
+                except BaseException as e:  # Surfaced to the writer thread
+                    item = (rank, url, None, e)
+            else:
+                item = (rank, url, None, error)
+            while not stop.is_set():
+                try:
+                    pages.put(item, timeout=0.1)
+                    break
+                except queue.Full:
+                    continue
+
+    def _parsed(self, rank, future, on_parsed):
+        result = future.result()
+        if self.metrics is not None:
+            seconds, result = result
+            self.metrics.observe_parse(seconds)
+        if on_parsed is not None:
+            on_parsed(rank, result)
+        return result
+
+    def run(self, urls, on_result, on_parsed=None):
+        """
+        Fetch and parse every url, calling `on_result(rank, result)` in rank order.
+        `urls` can be any iterable; the fetch threads consume it as they go.
+        `on_parsed(rank, result)`, if given, is called for every parsed page as
+        soon as it is ready, ahead of earlier ranks still being fetched.
+        """
+        feed = _Feed(urls)
+        pages = queue.Queue(maxsize=self.queue_size)
+        stop = threading.Event()
+
+        fetchers = ThreadPoolExecutor(max_workers=self.fetch_workers)
+        for _ in range(self.fetch_workers):
+            fetchers.submit(self._fetch_stage, feed, pages, stop)
+
+        parsing = {}   # rank -> parse future
+        finished = {}  # rank -> result, waiting for earlier ranks
+        received = 0
+        next_rank = 1
+        max_parsing = self.parse_workers * 2
+
+        try:
+            while not (feed.exhausted.is_set() and next_rank > feed.count):
+                # Feed the parse stage while it has room
+                while len(parsing) < max_parsing and not (feed.exhausted.is_set() and received >= feed.count):
+                    try:
+                        rank, url, html, error = pages.get(timeout=0.05 if parsing or finished else 0.5)
+                    except queue.Empty:
+                        break
+                    received += 1
+                    if error is not None:
+                        raise error
+                    if html is None or isinstance(html, FetchError):
+                        finished[rank] = html
+                    elif self.metrics is not None:
+                        parsing[rank] = self._pool.submit(_timed_parse, self.parse, html, url)
+                    else:
+                        parsing[rank] = self._pool.submit(self.parse, html, url)
+
+                if parsing:
+                    done, _ = wait(list(parsing.values()), timeout=0.05, return_when=FIRST_COMPLETED)
+                    for rank in [rank for rank, future in parsing.items() if future in done]:
+                        finished[rank] = self._parsed(rank, parsing.pop(rank), on_parsed)
+
+                # Single ordered writer
+                while next_rank in finished:
+                    on_result(next_rank, finished.pop(next_rank))
+                    next_rank += 1
+        except BaseException:
+            stop.set()
+            for rank, future in parsing.items():
+                # Keep the pages that finished parsing; drop the rest
+                if future.done() and not future.cancelled() and future.exception() is None:
+                    self._parsed(rank, future, on_parsed)
+                else:
+                    future.cancel()
+            raise
+        finally:
+            stop.set()
+            # Unblock any fetcher waiting on a full queue
+            while True:
+                try:
+                    pages.get_nowait()
+                except queue.Empty:
+                    break
+            fetchers.shutdown(wait=False, cancel_futures=True)
+
+
+class _Feed:
+    """Hands out (rank, url) pairs from a url iterable to several fetch threads."""
+
+    def __init__(self, urls):
+        self._urls = iter(urls)
+        self._lock = threading.Lock()
+        self.count = 0
+        self.exhausted = threading.Event()
+
+    def take(self):
+        """Return the next (rank, url, None), or None once the iterable is used up."""
+        with self._lock:
+            if self.exhausted.is_set():
+                return None
+            try:
+                url = next(self._urls)
+            except StopIteration:
+                self.exhausted.set()
+                return None
+            except BaseException:
+                self.exhausted.set()
+                self.count += 1
+                raise
+            self.count += 1
+            return self.count, url, None
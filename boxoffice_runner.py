@@ -0,0 +1,600 @@
+#!/usr/bin/env python3
+"""
+Shared command line driver for the Box Office Mojo scrapers.
+
+`boxoffice_2025_scraper.py` and `boxoffice_scraper_v2.py` only differ in how
+they extract figures from a release page, so argument parsing and the per-year
+scrape loop live here.
+"""
+
+import argparse
+import csv
+import datetime
+import os
+import sys
+
+import boxoffice_http
+from boxoffice_async import HostBudget, fetch_in_rank_order
+from boxoffice_cache import DEFAULT_CACHE_DIR, PageCache
+from boxoffice_checkpoint import DEFAULT_CHECKPOINT_DIR, YearJournal, atomic_write, release_id
+from boxoffice_checkpoint import clear as clear_checkpoints
+from boxoffice_http import BASE_URL, CONNECT_TIMEOUT, READ_TIMEOUT, RETRIES, CacheMiss, FetchError, configure, fetch_page
+from boxoffice_listing import fetch_year_listing, parse_year_listing
+from boxoffice_metrics import DEFAULT_METRICS_DIR, RunMetrics
+from boxoffice_money import format_money, money_value, parse_money
+from boxoffice_parsers import BACKENDS, set_backend
+from boxoffice_pipeline import FetchParsePipeline
+from boxoffice_scheduler import LISTING_WORKERS, ListingPrefetcher, RunProgress
+
+CSV_HEADER = ["Title", "Domestic", "International", "Worldwide", "ImdbID", "URL"]
+
+
+def build_arg_parser():
+    parser = argparse.ArgumentParser(description="Scrape box office data from Box Office Mojo")
+    parser.add_argument("--year", "-y", type=int, default=None,
+                       help="Year to scrape box office data for (default: 2024)")
+    parser.add_argument("--years", type=str,
+                       help="Multiple years or year ranges (e.g., '2020,2021,2022' or '2020-2022' or '2018,2020-2022')")
+    parser.add_argument("--limit", "-l", type=int, default=50,
+                       help="Maximum number of movies to scrape per year, up to 200 without --fast (default: 50)")
+    parser.add_argument("--concurrency", "-c", type=int, default=1,
+                       help="Number of release pages to fetch in parallel (default: 1)")
+    parser.add_argument("--rate", type=float, default=2.0,
+                       help="Requests per second against Box Office Mojo to start from (default: 2)")
+    parser.add_argument("--max-rate", type=float, default=None,
+                       help="Let the request rate rise above --rate up to this while the site responds well "
+                            "(default: --rate, no ramp-up). Either way it backs off on 429/503 responses "
+                            "and recovers afterwards")
+    parser.add_argument("--timeout", type=float, default=READ_TIMEOUT,
+                       help=f"Seconds to wait for a response before giving up on an attempt (default: {READ_TIMEOUT:g})")
+    parser.add_argument("--retries", type=int, default=RETRIES,
+                       help="Times a failed request is retried with backoff before the release is queued for "
+                            f"another try at the end of the run (default: {RETRIES})")
+    parser.add_argument("--http2", action="store_true",
+                       help="Multiplex requests over one HTTP/2 connection with httpx (pip install 'httpx[http2]')")
+    parser.add_argument("--prefetch", type=int, default=2,
+                       help="Year listings to fetch ahead of the releases being scraped (default: 2)")
+    parser.add_argument("--parse-workers", "-p", type=int, default=0,
+                       help="Parse release pages in N worker processes while fetching continues "
+                            "(default: 0, parse in the fetch workers)")
+    parser.add_argument("--cache-dir", type=str, default=DEFAULT_CACHE_DIR,
+                       help=f"Directory for the raw page cache (default: {DEFAULT_CACHE_DIR})")
+    parser.add_argument("--cache-ttl", type=float, default=24,
+                       help="Hours before a cached page is fetched again (default: 24)")
+    parser.add_argument("--no-cache", action="store_true",
+                       help="Always fetch pages from the network and do not store them")
+    parser.add_argument("--offline", action="store_true",
+                       help="Rebuild the CSVs from the page cache only, without any network requests "
+                            "(defaults to every cached year)")
+    parser.add_argument("--resume", action="store_true",
+                       help="Continue an interrupted run, skipping releases and years already completed")
+    parser.add_argument("--checkpoint-dir", type=str, default=DEFAULT_CHECKPOINT_DIR,
+                       help=f"Directory for the checkpoint journal (default: {DEFAULT_CHECKPOINT_DIR})")
+    parser.add_argument("--parser", choices=BACKENDS, default="auto",
+                       help="HTML parser backend for release pages (default: auto, the fastest one installed)")
+    parser.add_argument("--refresh", action="store_true",
+                       help="Update existing boxoffice_YYYY.csv files in place, fetching only new releases "
+                            "and releases whose grosses are still changing")
+    parser.add_argument("--fast", action="store_true",
+                       help="Take titles, ranks and domestic grosses from the year listing (paging past 200 movies) "
+                            "and fetch a release page only for the IMDb ID and international gross the listing lacks. "
+                            "A first run still fetches every release page; reruns only fetch releases whose details "
+                            "are not already in boxoffice_YYYY.csv or the page cache")
+    parser.add_argument("--metrics-dir", type=str, default=DEFAULT_METRICS_DIR,
+                       help=f"Directory for the request metrics written at the end of the run (default: {DEFAULT_METRICS_DIR})")
+    return parser
+
+
+def parse_years_input(years_input):
+    """
+    Parse years input string into a list of years.
+    Supports formats like:
+    - '2020,2021,2022'
+    - '2020-2022'
+    - '2018,2020-2022,2024'
+    """
+    years = []
+    parts = years_input.split(',')
+
+    for part in parts:
+        part = part.strip()
+        if '-' in part:
+            # Handle range (e.g., '2020-2022')
+            start, end = part.split('-')
+            start_year = int(start.strip())
+            end_year = int(end.strip())
+            if start_year > end_year:
+                raise ValueError(f"Invalid range: {part}. Start year must be <= end year")
+            years.extend(range(start_year, end_year + 1))
+        else:
+            # Handle single year
+            years.append(int(part))
+
+    # Remove duplicates and sort
+    return sorted(list(set(years)))
+
+
+def run_scrape(args, get_movie_links, get_box_office, parse_box_office=None):
+    """
+    Scrape every requested year into boxoffice_YYYY.csv. With `parse_box_office(html, url)`
+    fetching and parsing are timed separately, and --parse-workers can run it in
+    separate processes.
+    """
+    if args.offline and args.no_cache:
+        print("Error: --offline needs the page cache and cannot be combined with --no-cache")
+        sys.exit(1)
+
+    if args.offline and args.refresh:
+        print("Error: --refresh needs fresh pages and cannot be combined with --offline")
+        sys.exit(1)
+
+    if args.fast and args.refresh:
+        print("Error: --fast already takes current grosses from the listing and cannot be combined with --refresh")
+        sys.exit(1)
+
+    try:
+        parser_backend = set_backend(args.parser)
+    except ValueError as e:
+        print(f"Error: {e}")
+        sys.exit(1)
+
+    # A refresh only fetches pages it needs to be current, so never serve them from the cache
+    cache_ttl = 0 if args.refresh else args.cache_ttl * 3600
+    cache = None if args.no_cache else PageCache(args.cache_dir, ttl=cache_ttl)
+    scraper_name = os.path.splitext(os.path.basename(get_box_office.__code__.co_filename))[0]
+    metrics = RunMetrics(scraper_name)
+
+    # Determine which years to scrape
+    years_to_scrape = []
+
+    if args.years:
+        # Parse multiple years or ranges
+        years_to_scrape = parse_years_input(args.years)
+    elif args.year is not None:
+        # Single year
+        years_to_scrape = [args.year]
+    elif args.offline:
+        # Rebuild everything we have listings for
+        years_to_scrape = cache.cached_years()
+        if not years_to_scrape:
+            print(f"Error: No cached year listings found in {args.cache_dir}")
+            sys.exit(1)
+    else:
+        years_to_scrape = [2024]
+
+    # Validate years
+    for year in years_to_scrape:
+        if year < 1977 or year > 2025:
+            print(f"Error: Year must be between 1977 and 2025. Got: {year}")
+            sys.exit(1)
+
+    # Validate limit; --fast pages through the listing, anything else reads its first 200 rows
+    if args.limit < 1 or (args.limit > 200 and not args.fast):
+        print(f"Error: Limit must be between 1 and 200 (or more with --fast). Got: {args.limit}")
+        sys.exit(1)
+
+    if args.concurrency < 1:
+        print(f"Error: Concurrency must be at least 1. Got: {args.concurrency}")
+        sys.exit(1)
+
+    if args.rate <= 0:
+        print(f"Error: Rate must be greater than 0. Got: {args.rate}")
+        sys.exit(1)
+
+    if args.max_rate is None:
+        args.max_rate = args.rate
+    elif args.max_rate < args.rate:
+        print(f"Error: Max rate must be at least --rate ({args.rate:g}). Got: {args.max_rate}")
+        sys.exit(1)
+
+    if args.timeout <= 0 or args.retries < 0:
+        print(f"Error: Timeout must be greater than 0 and retries 0 or more. Got: {args.timeout}, {args.retries}")
+        sys.exit(1)
+
+    if args.prefetch < 0:
+        print(f"Error: Prefetch must be 0 or more. Got: {args.prefetch}")
+        sys.exit(1)
+
+    if args.parse_workers < 0 or (args.parse_workers > 0 and parse_box_office is None):
+        print(f"Error: Parse workers must be 0 or more for this scraper. Got: {args.parse_workers}")
+        sys.exit(1)
+
+    if len(years_to_scrape) == 1:
+        print(f"Scraping box office data for {years_to_scrape[0]} (top {args.limit} movies)")
+    else:
+        print(f"Scraping box office data for {len(years_to_scrape)} years: {', '.join(map(str, years_to_scrape))} (top {args.limit} movies each)")
+    print(f"Parser backend: {parser_backend}")
+
+    # One budget for the whole run so parallel workers and listing requests
+    # share the same per-host request rate. Offline runs never hit the network.
+    budget = HostBudget(rate=0 if args.offline else args.rate, max_in_flight=args.concurrency,
+                        max_rate=args.max_rate)
+    try:
+        # Room in the keep-alive pool for every fetch worker and the listing prefetcher
+        configure(cache=cache, offline=args.offline, metrics=metrics, budget=budget,
+                  timeout=(min(CONNECT_TIMEOUT, args.timeout), args.timeout), retries=args.retries,
+                  pool_size=args.concurrency + LISTING_WORKERS, http2=args.http2)
+    except ValueError as e:
+        print(f"Error: {e}")
+        sys.exit(1)
+
+    # One process pool for the whole run; fetch threads feed it raw HTML
+    pipeline = None
+    if args.parse_workers > 0:
+        pipeline = FetchParsePipeline(_fetch_or_none, parse_box_office, args.concurrency, args.parse_workers,
+                                      budget, initializer=set_backend, initargs=(parser_backend,), metrics=metrics)
+        print(f"Pipeline: {args.concurrency} fetch workers -> {args.parse_workers} parse processes")
+
+    # A checkpoint is only reusable by a run extracting the same releases the same way
+    checkpoint_key = {"scraper": os.path.basename(get_box_office.__code__.co_filename), "limit": args.limit}
+    if args.fast:
+        checkpoint_key["fast"] = True
+    journals = {year: YearJournal.open(args.checkpoint_dir, year, checkpoint_key, resume=args.resume)
+                for year in years_to_scrape}
+
+    def load_listing(year):
+        with budget.slot(BASE_URL):
+            if args.refresh:
+                return _fetch_listing_for_refresh(year)
+            if args.fast:
+                return fetch_year_listing(year, limit=args.limit), None
+            return get_movie_links(year), None
+
+    # Listings are fetched ahead of the releases that need them, so the work
+    # queue never drains at a year boundary
+    listing_years = [year for year in years_to_scrape
+                     if _needs_listing(journals[year], f"boxoffice_{year}.csv")]
+    prefetcher = ListingPrefetcher(listing_years, load_listing, lookahead=args.prefetch)
+    progress = RunProgress(len(years_to_scrape))
+    runs = []  # _YearRun per year, in year order
+    jobs = []  # (run, rank) per release in the global work queue
+    retry_queue = []  # (run, rank) of releases that failed, fetched again at the end of the run
+
+    def releases():
+        """Every release still to fetch, across all years, in year and rank order."""
+        for year in years_to_scrape:
+            run = _plan_year(year, args, journals[year], prefetcher, cache, parse_box_office)
+            runs.append(run)
+            progress.plan(len(run.pending_ranks))
+            for rank in run.pending_ranks:
+                jobs.append((run, rank))
+                yield run.urls[rank - 1]
+
+    total_movies_scraped = 0
+
+    def finish_ready_runs():
+        # Years are finished as soon as their last release is in; a year still
+        # waiting on the retry queue does not hold up the years after it
+        nonlocal total_movies_scraped
+        for run in runs:
+            if not run.finished and run.complete:
+                total_movies_scraped += run.finish()
+                progress.finish_year()
+                print(f"📊 {progress.summary()}")
+
+    def on_result(i, result):
+        run, rank = jobs[i - 1]
+        progress.advance()
+        if isinstance(result, FetchError) and result.retryable:
+            run.defer(rank, result, progress)
+            retry_queue.append((run, rank))
+        else:
+            run.deliver(rank, result, progress)
+        finish_ready_runs()
+
+    def on_parsed(i, result):
+        run, rank = jobs[i - 1]
+        run.checkpoint(rank, result)
+
+    def on_retry_result(i, result):
+        run, rank = retry_queue[i - 1]
+        run.deliver(rank, result, progress)
+        finish_ready_runs()
+
+    def fetch_release(url):
+        try:
+            if parse_box_office is None:
+                return get_box_office(url)
+            html = fetch_page(url)
+        except CacheMiss:
+            return None
+        except FetchError as e:
+            return e
+        with metrics.time_parse():
+            return parse_box_office(html, url)
+
+    try:
+        if pipeline is not None:
+            pipeline.run(releases(), on_result, on_parsed)
+        else:
+            fetch_in_rank_order(releases(), fetch_release, on_result,
+                                concurrency=args.concurrency, budget=budget)
+        if retry_queue:
+            # By now a passing outage has had the whole run to clear up
+            print(f"\n🔁 Retrying {len(retry_queue)} releases that failed earlier...")
+            fetch_in_rank_order([run.urls[rank - 1] for run, rank in retry_queue], fetch_release, on_retry_result,
+                                concurrency=args.concurrency, budget=budget)
+        finish_ready_runs()
+    except KeyboardInterrupt:
+        prefetcher.close(cancel=True)
+        if pipeline is not None:
+            pipeline.close(cancel=True)
+        print(f"\n⏸️  Interrupted. Progress is checkpointed in {args.checkpoint_dir}; rerun with --resume to continue.")
+        _write_metrics(metrics, budget, args.metrics_dir)
+        sys.exit(130)
+
+    prefetcher.close()
+    if pipeline is not None:
+        pipeline.close()
+
+    # Years with pages that could not be fetched keep their journal for --resume
+    failures = sum(run.failures for run in runs)
+    clear_checkpoints(args.checkpoint_dir, [run.year for run in runs if not run.failures])
+
+    print(f"\n{'='*50}")
+    print(f"🎉 All scraping completed!")
+    print(f"Total years scraped: {len(years_to_scrape)}")
+    print(f"Total movies scraped: {total_movies_scraped}")
+    if failures:
+        print(f"⚠️  {failures} pages could not be fetched; rerun with --resume to fetch only those.")
+    print(f"{'='*50}")
+    _write_metrics(metrics, budget, args.metrics_dir)
+
+
+def _write_metrics(metrics, budget, directory):
+    prom_path, json_path = metrics.write(directory)
+    print(f"📈 {metrics.report()}")
+    for host, (rate, throttled) in budget.rates().items():
+        print(f"   {host}: ended at {rate:.1f} requests/s, throttled {throttled} times")
+    print(f"   Metrics written to {prom_path} and {json_path}")
+
+
+def _fetch_or_none(url):
+    # A FetchError propagates: the pipeline hands it to the writer as the result
+    try:
+        return fetch_page(url)
+    except CacheMiss:
+        return None
+
+
+def _needs_listing(journal, filename):
+    return journal.links is None and not (journal.done and os.path.exists(filename))
+
+
+class _YearRun:
+    """One year's share of the global work queue and the rows collected for it."""
+
+    def __init__(self, year, filename, journal, links, skipped=False, failures=0, listing=None):
+        self.year = year
+        self.filename = filename
+        self.journal = journal
+        self.urls = [f"{BASE_URL}{link}" for link in links]
+        self.listing = listing  # with --fast, the listing row of each rank
+        self.journaled = {}  # rank -> result checkpointed ahead of its turn
+        self.skipped = skipped
+        self.failures = failures  # pages given up on, so the year is not done
+        self.finished = False
+        # Ranks still to fetch; everything else comes straight from the journal
+        self.pending_ranks = [] if skipped else [
+            rank for rank, url in enumerate(self.urls, 1) if journal.get(url) is None]
+        self.results = {}
+
+    @property
+    def complete(self):
+        return len(self.results) == len(self.pending_ranks)
+
+    def defer(self, rank, error, progress):
+        """Leave `rank` open for the retry pass at the end of the run."""
+        print(f"[{self.year} {rank}/{len(self.urls)} | {progress.position()}] ⚠️ {error}; will retry at the end of the run")
+
+    def _record(self, rank, result):
+        if self.listing is not None:
+            # The page only supplies what the listing lacks
+            result = _with_listing_fields(result, self.listing[rank - 1])
+        self.journal.record(self.urls[rank - 1], result)
+        return result
+
+    def checkpoint(self, rank, result):
+        """Journal a parsed page before its turn comes, so an interrupt does not lose it."""
+        if result is not None and not isinstance(result, FetchError):
+            self.journaled[rank] = self._record(rank, result)
+
+    def deliver(self, rank, result, progress):
+        self.results[rank] = result
+        url = self.urls[rank - 1]
+        where = f"[{self.year} {rank}/{len(self.urls)} | {progress.position()}]"
+        if result is None:
+            print(f"{where} ⚠️ Not in cache, skipped: {url}")
+            return
+        if isinstance(result, FetchError):
+            self.failures += 1
+            print(f"{where} ❌ {result}; left out of {self.filename}")
+            return
+        if rank in self.journaled:
+            result = self.results[rank] = self.journaled.pop(rank)
+        else:
+            result = self.results[rank] = self._record(rank, result)
+        title, domestic, international, worldwide, imdb_id = result
+        print(f"{where} {title}: Domestic={domestic}, International={international}, Worldwide={worldwide}, IMDb={imdb_id}")
+
+    def finish(self):
+        """Write boxoffice_YYYY.csv and return the number of movies in it."""
+        self.finished = True
+        if self.skipped:
+            return len(self.journal.completed)
+
+        movies_written = 0
+
+        def write_csv(f):
+            nonlocal movies_written
+            writer = csv.writer(f)
+            writer.writerow(CSV_HEADER)
+            for rank, url in enumerate(self.urls, 1):
+                result = self.results[rank] if rank in self.results else self.journal.get(url)
+                if result is not None and not isinstance(result, FetchError):
+                    writer.writerow([*result, url])
+                    movies_written += 1
+
+        # The CSV only replaces the previous file once every row is in place
+        atomic_write(self.filename, write_csv)
+        if self.failures:
+            # Not done: --resume fetches just the missing releases
+            print(f"⚠️  {self.year} saved to {self.filename} without {self.failures} releases that could not be fetched.")
+        else:
+            self.journal.mark_done()
+            print(f"✅ {self.year} completed! Data saved to: {self.filename}")
+        print(f"   Movies scraped: {movies_written}")
+        return movies_written
+
+
+def _plan_year(year, args, journal, prefetcher, cache=None, parse_box_office=None):
+    """Work out which releases of `year` still have to be fetched."""
+    print(f"\n{'='*50}")
+    print(f"Queueing {year}...")
+    print(f"{'='*50}")
+
+    # Generate filename based on year
+    filename = f"boxoffice_{year}.csv"
+
+    if not _needs_listing(journal, filename):
+        if journal.done and os.path.exists(filename):
+            print(f"⏭️  {year} already completed in a previous run. Skipping...")
+            return _YearRun(year, filename, journal, journal.links or [], skipped=True)
+        print(f"Resuming {year}: {len(journal.completed)}/{len(journal.links)} movies already scraped.")
+        return _YearRun(year, filename, journal, journal.links, listing=journal.listing)
+
+    try:
+        movie_links, previous_totals = prefetcher.get(year)
+    except CacheMiss:
+        print(f"No cached listing for {year}. Skipping...")
+        return _YearRun(year, filename, journal, [], skipped=True)
+    except FetchError as e:
+        print(f"❌ Could not fetch the {year} listing ({e}). Skipping...")
+        return _YearRun(year, filename, journal, [], skipped=True, failures=1)
+
+    if args.refresh or args.fast:
+        listing_rows = movie_links
+        movie_links = [row["link"] for row in listing_rows]
+
+    available_movies = len(movie_links)
+    print(f"Found {available_movies} movies for {year}.")
+
+    if available_movies == 0:
+        print(f"No movies found for {year}. Skipping...")
+        return _YearRun(year, filename, journal, [], skipped=True)
+
+    # Show data availability warning for early years
+    if year < 1985 and available_movies < 50:
+        print(f"⚠️  Note: {year} has limited data ({available_movies} movies available)")
+
+    # Limit to specified number of movies
+    movie_links = movie_links[:min(args.limit, available_movies)]
+    if args.refresh:
+        _reuse_unchanged_rows(year, filename, journal, listing_rows[:len(movie_links)], previous_totals)
+    elif args.fast:
+        _reuse_known_details(filename, journal, listing_rows[:len(movie_links)], cache, parse_box_office)
+        # Kept in the journal so a resumed run builds the remaining rows the same way
+        listing = [{key: row[key] for key in LISTING_FIELDS if key in row} for row in listing_rows[:len(movie_links)]]
+        journal.set_links(movie_links, listing)
+        return _YearRun(year, filename, journal, movie_links, listing=listing)
+    journal.set_links(movie_links)
+    return _YearRun(year, filename, journal, movie_links)
+
+
+# The listing cells a --fast row is built from
+LISTING_FIELDS = ("Release", "Total Gross", "Gross")
+
+
+def _listing_total(row):
+    return row.get("Total Gross") or row.get("Gross")
+
+
+def _fetch_listing_for_refresh(year):
+    """
+    Fetch a fresh year listing, along with each release's total gross as of the
+    previously cached copy of the listing (empty if there is none).
+    """
+    cache = boxoffice_http.default_fetcher.cache
+    previous = cache.get(f"{BASE_URL}/year/{year}/", allow_stale=True) if cache is not None else None
+    previous_totals = {}
+    if previous is not None:
+        previous_totals = {release_id(row["link"]): _listing_total(row) for row in parse_year_listing(previous)}
+    return fetch_year_listing(year), previous_totals
+
+
+def _reuse_unchanged_rows(year, filename, journal, listing, previous_totals):
+    """
+    Seed `journal` with rows of the existing CSV that cannot have changed, so
+    only new releases and releases still in release get fetched.
+    """
+    if not os.path.exists(filename):
+        print(f"No existing {filename}; refreshing every release.")
+        return
+
+    with open(filename, "r", newline="", encoding="utf-8") as f:
+        existing = {release_id(row["URL"]): row for row in csv.DictReader(f)}
+
+    # Grosses only keep moving for the current and previous year's releases
+    frozen = year < datetime.date.today().year - 1
+
+    for row in listing:
+        rid = release_id(row["link"])
+        old = existing.get(rid)
+        if old is None:
+            continue
+        if not frozen:
+            total = _listing_total(row)
+            # Compare against the last listing we saw, or the stored domestic figure
+            baseline = previous_totals.get(rid, old["Domestic"])
+            if not total or total != baseline:
+                continue
+        journal.completed[rid] = [old["Title"], old["Domestic"], old["International"], old["Worldwide"], old["ImdbID"]]
+
+    print(f"♻️  Reusing {len(journal.completed)} unchanged rows, fetching {len(listing) - len(journal.completed)}.")
+
+
+def _with_listing_fields(result, row):
+    """
+    `result` with the title and domestic gross from the listing `row`, and the
+    worldwide gross to match; only the international gross and IMDb ID are kept.
+    """
+    title, domestic, international, worldwide, imdb_id = result
+    title = row.get("Release") or title
+    try:
+        listed = money_value(_listing_total(row))
+    except (AttributeError, ValueError):  # No usable figure in the listing
+        return [title, domestic, international, worldwide, imdb_id]
+    if listed != parse_money(domestic):
+        domestic = format_money(listed)
+        worldwide = format_money(listed + parse_money(international))
+    return [title, domestic, international, worldwide, imdb_id]
+
+
+def _reuse_known_details(filename, journal, listing, cache, parse_box_office):
+    """
+    Seed `journal` with the releases of `listing` whose IMDb ID and
+    international gross are already known, from the existing CSV or from a
+    cached release page of any age, taking their title and domestic gross from
+    the listing. Only the remaining releases need their page fetched.
+    """
+    known = {}
+    if os.path.exists(filename):
+        with open(filename, "r", newline="", encoding="utf-8") as f:
+            known = {release_id(row["URL"]): [row["Title"], row["Domestic"], row["International"], row["Worldwide"],
+                                              row["ImdbID"]] for row in csv.DictReader(f)}
+
+    from_pages = 0
+    for row in listing:
+        rid = release_id(row["link"])
+        result = known.get(rid)
+        if result is None and cache is not None and parse_box_office is not None:
+            url = f"{BASE_URL}{row['link']}"
+            html = cache.get(url, allow_stale=True)
+            if html is not None:
+                result = parse_box_office(html, url)
+                from_pages += 1
+        if result is not None:
+            journal.completed[rid] = _with_listing_fields(result, row)
+
+    print(f"⚡ {len(journal.completed)} releases known ({from_pages} from cached pages), "
+          f"fetching {len(listing) - len(journal.completed)} release pages.")
@@ -0,0 +1,87 @@
+#!/usr/bin/env python3
+"""
+Cross-year scheduling helpers for the Box Office Mojo scrapers.
+
+A multi-year run feeds the releases of every year into one global work queue,
+so fetching never stalls at a year boundary. `ListingPrefetcher` fetches the
+year listings ahead of the release work that needs them and `RunProgress`
+reports progress for the run as a whole.
+"""
+
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+LISTING_WORKERS = 2
+
+
+class ListingPrefetcher:
+    """
+    Call `load(year)` for upcoming years in the background, keeping at most
+    `lookahead` years ahead of the one most recently asked for.
+    """
+
+    def __init__(self, years, load, lookahead=2, workers=LISTING_WORKERS):
+        self.years = list(years)
+        self.load = load
+        self.lookahead = max(0, lookahead)
+        self._pool = ThreadPoolExecutor(max_workers=max(1, workers))
+        self._futures = {}
+        self._next = 0
+        self._fill(0)
+
+    def _fill(self, index):
+        while self._next < len(self.years) and self._next <= index + self.lookahead:
+            year = self.years[self._next]
+            self._futures[year] = self._pool.submit(self.load, year)
+            self._next += 1
+
+    def get(self, year):
+        """Return `load(year)`, waiting for it if it is still in flight; re-raises its error."""
+        self._fill(self.years.index(year))
+        return self._futures.pop(year).result()
+
+    def close(self, cancel=False):
+        self._pool.shutdown(wait=not cancel, cancel_futures=cancel)
+
+
+def _format_duration(seconds):
+    minutes, seconds = divmod(int(seconds), 60)
+    hours, minutes = divmod(minutes, 60)
+    return f"{hours}h{minutes:02d}m" if hours else f"{minutes}m{seconds:02d}s"
+
+
+class RunProgress:
+    """Release and year counters for a whole run, with a throughput-based ETA."""
+
+    def __init__(self, years):
+        self.years = years
+        self.years_planned = 0
+        self.years_done = 0
+        self.planned = 0
+        self.done = 0
+        self.start = time.monotonic()
+
+    def plan(self, releases):
+        """Count a year whose releases have been queued."""
+        self.years_planned += 1
+        self.planned += releases
+
+    def advance(self):
+        self.done += 1
+
+    def finish_year(self):
+        self.years_done += 1
+
+    def position(self):
+        return f"{self.done}/{self.planned}"
+
+    def summary(self):
+        elapsed = time.monotonic() - self.start
+        rate = self.done / elapsed if elapsed > 0 else 0.0
+        # Years whose listing has not arrived yet are assumed to be average sized
+        expected = self.planned
+        if self.years_planned:
+            expected += (self.years - self.years_planned) * self.planned / self.years_planned
+        eta = _format_duration((expected - self.done) / rate) if rate > 0 else "?"
+        return (f"{self.done}/{round(expected)} releases, {self.years_done}/{self.years} years, "
+                f"{rate:.1f} pages/s, {_format_duration(elapsed)} elapsed, ETA {eta}")
@@ -0,0 +1,311 @@
+#!/usr/bin/env python3
+"""
+Typed columnar store for all_boxoffice.csv and movies_1927_2024.csv.
+
+`export` converts the CSVs into NumPy arrays partitioned by decade:
+
+    boxoffice_store/
+      meta.json                           tables, columns, partitions, row counts
+      boxoffice/1990s/worldwide.npy       one .npy file per column and decade
+      boxoffice/title.dict.bin            UTF-8 dictionary of a string column
+      boxoffice/title.dict.offsets.npy    start of every dictionary entry
+
+Money is int64 and years int16. IMDb IDs (tt0017136) and Box Office Mojo
+release URLs (.../release/rl2759034369/) are reduced to their numbers (0 when
+missing). Strings are dictionary-encoded as int32 codes into one dictionary per
+table. `Store.load` memory-maps only the column files of the decades a query
+needs, so loading takes milliseconds:
+
+    python boxoffice_store.py export
+    python boxoffice_store.py query --years 1990-1999 --top 10
+"""
+
+import argparse
+import csv
+import json
+import os
+import re
+import shutil
+import time
+
+import numpy as np
+
+from boxoffice_columnar import StringDictionary, file_sha256, format_imdb_id, write_dictionary
+from boxoffice_money import BASE_URL, format_money, parse_money_column
+
+DEFAULT_STORE_DIR = "boxoffice_store"
+STORE_VERSION = 1
+
+# column name -> (CSV header, kind)
+TABLES = {
+    "boxoffice": {
+        "source": "all_boxoffice.csv",
+        "columns": {
+            "year": ("Year", "year"),
+            "title": ("Title", "string"),
+            "domestic": ("Domestic", "money"),
+            "international": ("International", "money"),
+            "worldwide": ("Worldwide", "money"),
+            "imdb_id": ("ImdbID", "imdb_id"),
+            "release_id": ("URL", "release_id"),
+        },
+    },
+    "movies": {
+        "source": "movies_1927_2024.csv",
+        "columns": {
+            "year": ("year", "year"),
+            "title": ("title", "string"),
+            "imdb_id": ("imdb_id", "imdb_id"),
+        },
+    },
+}
+
+KIND_DTYPES = {
+    "year": np.int16,
+    "money": np.int64,
+    "imdb_id": np.int32,
+    "release_id": np.int64,
+    "string": np.int32,
+}
+
+_IMDB_ID_RE = re.compile(r"tt(\d+)")
+_RELEASE_ID_RE = re.compile(r"/release/rl(\d+)")
+
+
+def format_release_url(number):
+    return f"{BASE_URL}/release/rl{number}/" if number else ""
+
+
+def _match_number(pattern, value):
+    match = pattern.search(value)
+    return int(match.group(1)) if match else 0
+
+
+def _encode_column(kind, values, dictionary):
+    if kind == "year":
+        return np.array([int(value) for value in values], dtype=np.int16)
+    if kind == "money":
+        return parse_money_column(values)
+    if kind == "imdb_id":
+        return np.array([_match_number(_IMDB_ID_RE, value) for value in values], dtype=np.int32)
+    if kind == "release_id":
+        return np.array([_match_number(_RELEASE_ID_RE, value) for value in values], dtype=np.int64)
+    return np.array([dictionary.setdefault(value, len(dictionary)) for value in values], dtype=np.int32)
+
+
+def _decade_name(decade):
+    return f"{decade}s"
+
+
+def export_table(name, spec, store_dir):
+    """Convert one CSV into per-decade column files; returns its meta.json entry."""
+    with open(spec["source"], "r", newline="", encoding="utf-8") as f:
+        rows = list(csv.DictReader(f))
+
+    year_header = spec["columns"]["year"][0]
+    by_decade = {}
+    for row in rows:
+        by_decade.setdefault(int(row[year_header]) // 10 * 10, []).append(row)
+
+    table_dir = os.path.join(store_dir, name)
+    dictionaries = {column: {} for column, (_, kind) in spec["columns"].items() if kind == "string"}
+    partitions = []
+    for decade in sorted(by_decade):
+        decade_rows = by_decade[decade]
+        partition_dir = os.path.join(table_dir, _decade_name(decade))
+        os.makedirs(partition_dir)
+        for column, (header, kind) in spec["columns"].items():
+            values = _encode_column(kind, [row[header] for row in decade_rows], dictionaries.get(column))
+            np.save(os.path.join(partition_dir, f"{column}.npy"), values)
+        years = [int(row[year_header]) for row in decade_rows]
+        partitions.append({"name": _decade_name(decade), "rows": len(decade_rows),
+                           "min_year": min(years), "max_year": max(years)})
+
+    for column, dictionary in dictionaries.items():
+        write_dictionary(table_dir, column, dictionary)
+
+    return {
+        "source": spec["source"],
+        "source_sha256": file_sha256(spec["source"]),
+        "rows": len(rows),
+        "columns": {column: {"kind": kind, "dtype": np.dtype(KIND_DTYPES[kind]).name}
+                    for column, (_, kind) in spec["columns"].items()},
+        "partitions": partitions,
+    }
+
+
+def _existing_tables(store_dir):
+    """meta.json entries of the tables already in `store_dir` ({} if there is no usable store)."""
+    try:
+        meta = Store(store_dir).meta
+    except (OSError, ValueError):
+        return {}
+    return meta["tables"]
+
+
+def export_store(store_dir=DEFAULT_STORE_DIR, tables=None):
+    """
+    Rebuild the store from the CSVs; the old store is only replaced once the
+    new one is complete. With `tables`, only those are rebuilt and the other
+    tables of the old store are carried over unchanged.
+    """
+    tmp_dir = f"{store_dir}.tmp"
+    if os.path.exists(tmp_dir):
+        shutil.rmtree(tmp_dir)
+    os.makedirs(tmp_dir)
+
+    meta = {"version": STORE_VERSION, "tables": {}}
+    for name, spec in TABLES.items():
+        if tables and name not in tables:
+            continue
+        if not os.path.exists(spec["source"]):
+            print(f"⚠️ {spec['source']} not found, skipping table {name}")
+            continue
+        meta["tables"][name] = export_table(name, spec, tmp_dir)
+        print(f"✅ {name}: {meta['tables'][name]['rows']} rows in "
+              f"{len(meta['tables'][name]['partitions'])} decade partitions")
+
+    if tables:
+        for name, table in _existing_tables(store_dir).items():
+            if name not in meta["tables"]:
+                shutil.copytree(os.path.join(store_dir, name), os.path.join(tmp_dir, name))
+                meta["tables"][name] = table
+                print(f"♻️  {name}: kept from the existing store")
+
+    with open(os.path.join(tmp_dir, "meta.json"), "w", encoding="utf-8") as f:
+        json.dump(meta, f, indent=1)
+
+    if os.path.exists(store_dir):
+        shutil.rmtree(store_dir)
+    os.replace(tmp_dir, store_dir)
+    return meta
+
+
+class Store:
+    """Read access to an exported store."""
+
+    def __init__(self, store_dir=DEFAULT_STORE_DIR):
+        self.store_dir = store_dir
+        with open(os.path.join(store_dir, "meta.json"), "r", encoding="utf-8") as f:
+            self.meta = json.load(f)
+        if self.meta.get("version") != STORE_VERSION:
+            raise ValueError(f"Unsupported store version in {store_dir}: {self.meta.get('version')}")
+        self._dictionaries = {}
+
+    def table_meta(self, table):
+        try:
+            return self.meta["tables"][table]
+        except KeyError:
+            raise KeyError(f"Table '{table}' is not in {self.store_dir}") from None
+
+    def partitions(self, table, years=None):
+        """Partitions of `table` that can hold rows from the (first, last) year range."""
+        partitions = self.table_meta(table)["partitions"]
+        if years is None:
+            return partitions
+        first, last = years
+        return [p for p in partitions if p["max_year"] >= first and p["min_year"] <= last]
+
+    def load(self, table, columns=None, years=None):
+        """
+        Return {column: array} for `table`, limited to the (first, last) year
+        range. A query inside one decade gets read-only memory maps; wider
+        queries concatenate the decade partitions they need.
+        """
+        columns = list(columns or self.table_meta(table)["columns"])
+        partitions = self.partitions(table, years)
+        read = columns if years is None or "year" in columns else columns + ["year"]
+
+        data = {}
+        for column in read:
+            parts = [np.load(os.path.join(self.store_dir, table, p["name"], f"{column}.npy"), mmap_mode="r")
+                     for p in partitions]
+            if not parts:
+                dtype = KIND_DTYPES[self.table_meta(table)["columns"][column]["kind"]]
+                data[column] = np.empty(0, dtype=dtype)
+            else:
+                data[column] = parts[0] if len(parts) == 1 else np.concatenate(parts)
+
+        if years is not None:
+            year = data["year"]
+            mask = (year >= years[0]) & (year <= years[1])
+            if not mask.all():
+                data = {column: values[mask] for column, values in data.items()}
+        return {column: data[column] for column in columns}
+
+    def dictionary(self, table, column):
+        key = (table, column)
+        if key not in self._dictionaries:
+            self._dictionaries[key] = StringDictionary(os.path.join(self.store_dir, table), column)
+        return self._dictionaries[key]
+
+
+def _parse_year_range(value):
+    first, _, last = value.partition("-")
+    return int(first), int(last or first)
+
+
+def run_query(args):
+    start = time.perf_counter()
+    store = Store(args.store_dir)
+    years = _parse_year_range(args.years) if args.years else None
+    try:
+        data = store.load("boxoffice", ["year", "title", "worldwide", "imdb_id"], years=years)
+    except KeyError as e:
+        print(f"❌ {e.args[0]}; run `python boxoffice_store.py export --tables boxoffice` first")
+        return
+    elapsed_ms = (time.perf_counter() - start) * 1000
+
+    partitions = store.partitions("boxoffice", years)
+    print(f"Loaded {len(data['year'])} rows from {len(partitions)} partitions "
+          f"({', '.join(p['name'] for p in partitions)}) in {elapsed_ms:.2f} ms")
+    if not len(data["year"]):
+        return
+
+    titles = store.dictionary("boxoffice", "title")
+    order = np.argsort(-data["worldwide"], kind="stable")[:args.top]
+    print(f"\n🏆 Top {len(order)} by worldwide box office:")
+    for i, row in enumerate(order, 1):
+        print(f"  {i}. {titles[data['title'][row]]} ({data['year'][row]}) - "
+              f"{format_money(int(data['worldwide'][row]))} {format_imdb_id(int(data['imdb_id'][row]))}")
+    print(f"\n💰 Total worldwide: {format_money(int(data['worldwide'].sum()))}")
+
+
+def run_info(args):
+    store = Store(args.store_dir)
+    for name, table in store.meta["tables"].items():
+        stale = not os.path.exists(table["source"]) or file_sha256(table["source"]) != table["source_sha256"]
+        print(f"{name}: {table['rows']} rows from {table['source']}" + (" (stale, re-export)" if stale else ""))
+        columns = ", ".join(f"{column} {spec['dtype']}" for column, spec in table["columns"].items())
+        partitions = ", ".join(f"{p['name']} ({p['rows']})" for p in table["partitions"])
+        print(f"  columns:    {columns}")
+        print(f"  partitions: {partitions}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Typed columnar store for the box office and movie datasets")
+    parser.add_argument("--store-dir", default=DEFAULT_STORE_DIR, help=f"Store directory (default: {DEFAULT_STORE_DIR})")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    export = subparsers.add_parser("export", help="Convert the CSVs into the store")
+    export.add_argument("--tables", nargs="*", choices=list(TABLES), help="Only these tables")
+
+    query = subparsers.add_parser("query", help="Top box office for a year range, read from the store")
+    query.add_argument("--years", help="Year or range, e.g. 1994 or 1990-1999 (default: all)")
+    query.add_argument("--top", type=int, default=10, help="Number of movies to show (default: 10)")
+
+    subparsers.add_parser("info", help="Describe the store and whether it is stale")
+
+    args = parser.parse_args()
+    if args.command == "export":
+        start = time.perf_counter()
+        export_store(args.store_dir, args.tables)
+        print(f"💾 Store written to {args.store_dir} in {time.perf_counter() - start:.2f}s")
+    elif args.command == "query":
+        run_query(args)
+    else:
+        run_info(args)
+
+
+if __name__ == "__main__":
+    main()
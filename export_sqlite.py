@@ -0,0 +1,234 @@
+#!/usr/bin/env python3
+"""
+Export the Oscar, box office and IMDb movie datasets into one SQLite file.
+
+    nominations           one row per oscar_nominee.csv row (id = CSV row number)
+    nominees              nominee / company ID -> name
+    nomination_nominees   junction table for the pipe-separated Nominees/NomineeIds
+    boxoffice             all_boxoffice.csv with integer amounts and the release ID
+    movies                movies_1927_2024.csv
+
+Indexes cover IMDb IDs, nominee IDs, years and categories, so lookups such as
+"every nomination of nm0001932" or "nominations per decade" are index seeks
+instead of a full CSV parse. Each table is bulk-loaded with executemany in a
+single transaction, indexes are created after the data, and the database is
+built next to the output and renamed into place when complete.
+
+    python export_sqlite.py
+    python export_sqlite.py --check    # also time a few point lookups
+"""
+
+import argparse
+import csv
+import os
+import sqlite3
+import time
+
+from boxoffice_checkpoint import release_id
+from boxoffice_money import read_records
+
+OSCAR_FILE = os.path.join("assets", "data", "oscar_nominee.csv")
+BOXOFFICE_FILE = "all_boxoffice.csv"
+MOVIES_FILE = "movies_1927_2024.csv"
+OUTPUT_FILE = "oscars.db"
+
+SCHEMA = """
+CREATE TABLE nominations (
+    id INTEGER PRIMARY KEY,
+    ceremony INTEGER NOT NULL,
+    year TEXT NOT NULL,
+    year_start INTEGER NOT NULL,
+    class TEXT,
+    canonical_category TEXT,
+    category TEXT,
+    film TEXT,
+    film_id TEXT,
+    name TEXT,
+    nominees TEXT,
+    nominee_ids TEXT,
+    winner INTEGER NOT NULL,
+    detail TEXT,
+    note TEXT,
+    citation TEXT
+);
+CREATE TABLE nominees (
+    id TEXT PRIMARY KEY,
+    name TEXT
+) WITHOUT ROWID;
+CREATE TABLE nomination_nominees (
+    nominee_id TEXT NOT NULL,
+    nomination_id INTEGER NOT NULL REFERENCES nominations(id),
+    position INTEGER NOT NULL,
+    PRIMARY KEY (nominee_id, nomination_id, position)
+) WITHOUT ROWID;
+CREATE TABLE boxoffice (
+    year INTEGER NOT NULL,
+    title TEXT NOT NULL,
+    domestic INTEGER NOT NULL,
+    international INTEGER NOT NULL,
+    worldwide INTEGER NOT NULL,
+    imdb_id TEXT,
+    release_id TEXT,
+    url TEXT
+);
+CREATE TABLE movies (
+    imdb_id TEXT NOT NULL,
+    title TEXT NOT NULL,
+    year INTEGER NOT NULL,
+    imdb_url TEXT
+);
+"""
+
+INDEXES = """
+CREATE INDEX nominations_film_id ON nominations(film_id);
+CREATE INDEX nominations_year ON nominations(year_start);
+CREATE INDEX nominations_category ON nominations(canonical_category, year_start);
+CREATE INDEX nomination_nominees_nomination ON nomination_nominees(nomination_id);
+CREATE INDEX boxoffice_imdb_id ON boxoffice(imdb_id);
+CREATE INDEX boxoffice_year ON boxoffice(year, worldwide);
+CREATE INDEX movies_imdb_id ON movies(imdb_id);
+CREATE INDEX movies_year ON movies(year);
+"""
+
+# Placeholder the nominee data uses for people it could not identify
+UNKNOWN_NOMINEE_ID = "?"
+
+
+def _year_start(year_text):
+    # "1927/28" -> 1927
+    return int(year_text.split("/")[0])
+
+
+def load_nominations(db, path):
+    nominations = []
+    links = []
+    nominees = {}
+    with open(path, "r", newline="", encoding="utf-8") as f:
+        for row_id, row in enumerate(csv.DictReader(f), 1):
+            nominations.append((
+                row_id, int(row["Ceremony"]), row["Year"], _year_start(row["Year"]), row["Class"],
+                row["CanonicalCategory"], row["Category"], row["Film"], row["FilmId"] or None, row["Name"],
+                row["Nominees"], row["NomineeIds"], int(row["Winner"] == "TRUE"),
+                row["Detail"], row["Note"], row["Citation"],
+            ))
+            ids = row["NomineeIds"].split("|") if row["NomineeIds"] else []
+            names = row["Nominees"].split("|")
+            for position, nominee_id in enumerate(ids):
+                # Same keys as nominee_index.build_index
+                nominee_id = nominee_id.strip()
+                if nominee_id == UNKNOWN_NOMINEE_ID:
+                    continue
+                links.append((nominee_id, row_id, position))
+                # The two fields line up whenever they have the same length
+                if len(names) == len(ids):
+                    nominees.setdefault(nominee_id, names[position])
+                else:
+                    nominees.setdefault(nominee_id, None)
+
+    with db:
+        db.executemany(f"INSERT INTO nominations VALUES ({', '.join('?' * 16)})", nominations)
+        db.executemany("INSERT INTO nominees VALUES (?, ?)", nominees.items())
+        db.executemany("INSERT INTO nomination_nominees VALUES (?, ?, ?)", links)
+    return len(nominations), len(nominees)
+
+
+def load_boxoffice(db, path):
+    rows = (
+        (record.year, record.title, record.domestic, record.international, record.worldwide,
+         record.imdb_id or None, release_id(record.url), record.url)
+        for record in read_records(path)
+    )
+    with db:
+        return db.executemany("INSERT INTO boxoffice VALUES (?, ?, ?, ?, ?, ?, ?, ?)", rows).rowcount
+
+
+def load_movies(db, path):
+    with open(path, "r", newline="", encoding="utf-8") as f:
+        rows = ((row["imdb_id"], row["title"], int(row["year"]), row["imdb_url"]) for row in csv.DictReader(f))
+        with db:
+            return db.executemany("INSERT INTO movies VALUES (?, ?, ?, ?)", rows).rowcount
+
+
+def export_sqlite(output_file=OUTPUT_FILE, oscar_file=OSCAR_FILE, boxoffice_file=BOXOFFICE_FILE,
+                  movies_file=MOVIES_FILE):
+    """Build the database; returns {table: rows}."""
+    tmp_path = f"{output_file}.tmp"
+    if os.path.exists(tmp_path):
+        os.remove(tmp_path)
+
+    db = sqlite3.connect(tmp_path)
+    try:
+        # Nothing to recover if the build dies halfway: the file is simply rebuilt
+        db.execute("PRAGMA journal_mode = OFF")
+        db.execute("PRAGMA synchronous = OFF")
+        db.executescript(SCHEMA)
+
+        counts = {}
+        counts["nominations"], counts["nominees"] = load_nominations(db, oscar_file)
+        counts["boxoffice"] = load_boxoffice(db, boxoffice_file)
+        counts["movies"] = load_movies(db, movies_file)
+
+        with db:
+            db.executescript(INDEXES)
+        db.execute("ANALYZE")
+        db.commit()
+    finally:
+        db.close()
+
+    os.replace(tmp_path, output_file)
+    return counts
+
+
+def time_lookups(output_file, repeat=1000):
+    """Average time of a few typical point lookups, in microseconds."""
+    db = sqlite3.connect(f"file:{output_file}?mode=ro", uri=True)
+    queries = {
+        "nominations of nm0001932": (
+            "SELECT n.film, n.year, n.category, n.winner FROM nomination_nominees nn "
+            "JOIN nominations n ON n.id = nn.nomination_id WHERE nn.nominee_id = ?", ("nm0001932",)),
+        "box office of tt0110357": ("SELECT year, worldwide FROM boxoffice WHERE imdb_id = ?", ("tt0110357",)),
+        "nominations per decade": (
+            "SELECT year_start / 10 * 10 AS decade, COUNT(*) FROM nominations GROUP BY decade", ()),
+        "Best Picture 1994": (
+            "SELECT film, winner FROM nominations WHERE canonical_category = ? AND year_start = ?",
+            ("BEST PICTURE", 1994)),
+    }
+    timings = {}
+    for name, (sql, params) in queries.items():
+        db.execute(sql, params).fetchall()
+        start = time.perf_counter()
+        for _ in range(repeat):
+            db.execute(sql, params).fetchall()
+        timings[name] = (time.perf_counter() - start) / repeat * 1_000_000
+    db.close()
+    return timings
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Export the Oscar, box office and movie datasets to SQLite")
+    parser.add_argument("--output", "-o", default=OUTPUT_FILE, help=f"SQLite file to write (default: {OUTPUT_FILE})")
+    parser.add_argument("--oscar", default=OSCAR_FILE, help=f"Oscar nominations CSV (default: {OSCAR_FILE})")
+    parser.add_argument("--boxoffice", default=BOXOFFICE_FILE, help=f"Merged box office CSV (default: {BOXOFFICE_FILE})")
+    parser.add_argument("--movies", default=MOVIES_FILE, help=f"IMDb movie list CSV (default: {MOVIES_FILE})")
+    parser.add_argument("--check", action="store_true", help="Time a few point lookups against the new database")
+    args = parser.parse_args()
+
+    for path in (args.oscar, args.boxoffice, args.movies):
+        if not os.path.exists(path):
+            print(f"❌ {path} not found")
+            return
+
+    start = time.perf_counter()
+    counts = export_sqlite(args.output, args.oscar, args.boxoffice, args.movies)
+    print(f"✅ Exported to {args.output} in {time.perf_counter() - start:.2f}s")
+    for table, rows in counts.items():
+        print(f"   {table}: {rows} rows")
+
+    if args.check:
+        print("\n⏱️  Point lookups:")
+        for name, micros in time_lookups(args.output).items():
+            print(f"   {name:<28} {micros:>8.1f} µs")
+
+
+if __name__ == "__main__":
+    main()
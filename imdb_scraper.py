@@ -1,15 +1,35 @@
 import requests
 from bs4 import BeautifulSoup
 import csv
-import time
+import json
+import os
 import re
 import argparse
+import random
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
 from urllib.parse import urljoin, parse_qs, urlparse
 
+from boxoffice_async import HostBudget
+from boxoffice_checkpoint import atomic_write
+from boxoffice_http import BACKOFF, MAX_BACKOFF, RETRIES, RETRY_STATUSES, FetchError
+from boxoffice_metrics import DEFAULT_METRICS_DIR, RunMetrics, instrument_session
+
+# IMDb search pages hold 25 results, but consecutive pages start 50 apart
+PAGE_SIZE = 25
+PAGE_STEP = 50
+
 class IMDbMovieScraper:
-    def __init__(self):
+    def __init__(self, workers=4, rate=2.0, metrics=None, max_rate=None):
         self.base_url = "https://www.imdb.com"
+        self.workers = max(1, workers)
+        # Shared by every worker, in place of sleeping between pages; starts at
+        # `rate` and adapts to IMDb's responses up to `max_rate`
+        self.budget = HostBudget(rate=rate, max_in_flight=self.workers, max_rate=max_rate)
+        self.metrics = metrics if metrics is not None else RunMetrics("imdb_scraper")
         self.session = requests.Session()
+        # One pooled keep-alive connection per worker, timed into self.metrics
+        instrument_session(self.session, self.metrics, pool_connections=1, pool_maxsize=self.workers)
         self.session.headers.update({
             'User-Agent': 'Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36',
             'Accept-Language': 'en-US,en;q=0.9',
@@ -25,162 +45,249 @@ class IMDbMovieScraper:
         
         print(f"Fetching movies from {year}, page starting at {start}...")
         
-        try:
-            response = self.session.get(url, timeout=10)
-            response.raise_for_status()
-            
-            soup = BeautifulSoup(response.content, 'html.parser')
-            
-            # Find movie containers - IMDb now uses new interface
-            movie_containers = soup.find_all('li', class_='ipc-metadata-list-summary-item')
-            
-            # Fallback to old interface if new one not found
-            if not movie_containers:
-                movie_containers = soup.find_all('div', class_='lister-item')
-                print(f"  Using old interface, found {len(movie_containers)} containers")
-            else:
-                print(f"  Using new interface, found {len(movie_containers)} containers")
-            
-            for container in movie_containers:
-                try:
-                    title = None
-                    imdb_id = None
-                    
-                    # New interface extraction
-                    if 'ipc-metadata-list-summary-item' in container.get('class', []):
-                        # Look for the title link wrapper
-                        title_link = container.find('a', class_='ipc-title-link-wrapper')
+        # Every IMDb request takes a slot of the shared budget and reports its
+        # status back, so 429/503s and Retry-After slow all workers down
+        with self.budget.slot(url):
+            try:
+                response = self.session.get(url, timeout=10)
+            except requests.RequestException as e:
+                raise FetchError(url, type(e).__name__) from e
+        self.budget.feedback(url, response.status_code, response.elapsed.total_seconds(),
+                             response.headers.get('Retry-After'))
+        if response.status_code >= 400:
+            # Not an empty page: the caller must not take it for the end of the year
+            raise FetchError(url, f"HTTP {response.status_code}", response.status_code in RETRY_STATUSES)
+        parse_start = time.perf_counter()
+        
+        soup = BeautifulSoup(response.content, 'html.parser')
+        
+        # Find movie containers - IMDb now uses new interface
+        movie_containers = soup.find_all('li', class_='ipc-metadata-list-summary-item')
+        
+        # Fallback to old interface if new one not found
+        if not movie_containers:
+            movie_containers = soup.find_all('div', class_='lister-item')
+            print(f"  Using old interface, found {len(movie_containers)} containers")
+        else:
+            print(f"  Using new interface, found {len(movie_containers)} containers")
+        
+        for container in movie_containers:
+            try:
+                title = None
+                imdb_id = None
+                
+                # New interface extraction
+                if 'ipc-metadata-list-summary-item' in container.get('class', []):
+                    # Look for the title link wrapper
+                    title_link = container.find('a', class_='ipc-title-link-wrapper')
+                    if title_link:
+                        title_text = title_link.get_text(strip=True)
+                        # Remove ranking number (e.g., "1. Dune: Part Two" -> "Dune: Part Two")
+                        title = re.sub(r'^\d+\.\s*', '', title_text)
+                        
+                        href = title_link.get('href', '')
+                        imdb_id_match = re.search(r'/title/(tt\d+)/', href)
+                        if imdb_id_match:
+                            imdb_id = imdb_id_match.group(1)
+                
+                # Old interface extraction (fallback)
+                else:
+                    title_element = container.find('h3', class_='lister-item-header')
+                    if title_element:
+                        title_link = title_element.find('a')
                         if title_link:
-                            title_text = title_link.get_text(strip=True)
-                            # Remove ranking number (e.g., "1. Dune: Part Two" -> "Dune: Part Two")
-                            title = re.sub(r'^\d+\.\s*', '', title_text)
-                            
+                            title = title_link.get_text(strip=True)
                             href = title_link.get('href', '')
                             imdb_id_match = re.search(r'/title/(tt\d+)/', href)
                             if imdb_id_match:
                                 imdb_id = imdb_id_match.group(1)
-                    
-                    # Old interface extraction (fallback)
-                    else:
-                        title_element = container.find('h3', class_='lister-item-header')
-                        if title_element:
-                            title_link = title_element.find('a')
-                            if title_link:
-                                title = title_link.get_text(strip=True)
-                                href = title_link.get('href', '')
-                                imdb_id_match = re.search(r'/title/(tt\d+)/', href)
-                                if imdb_id_match:
-                                    imdb_id = imdb_id_match.group(1)
-                    
-                    # Only add if we found both title and IMDb ID
-                    if title and imdb_id:
-                        movies.append({
-                            'title': title,
-                            'imdb_id': imdb_id,
-                            'year': year,
-                            'year_text': str(year)
-                        })
-                    
-                except Exception as e:
-                    print(f"  Error processing movie container: {e}")
-                    continue
-            
-            # Check if there's a next page (try both old and new selectors)
-            next_button = soup.find('a', class_='lister-page-next')  # Old interface
-            if not next_button:
-                # Try new interface next button patterns
-                next_button = soup.find('a', {'aria-label': 'Next'})
-            if not next_button:
-                next_button = soup.find('a', string=re.compile(r'Next', re.I))
-            
-            has_next_page = next_button is not None
-            
-            print(f"  Found {len(movies)} movies on this page")
-            return movies, has_next_page
-            
-        except requests.RequestException as e:
-            print(f"  Error fetching data for year {year}: {e}")
-            return [], False
+                
+                # Only add if we found both title and IMDb ID
+                if title and imdb_id:
+                    movies.append({
+                        'title': title,
+                        'imdb_id': imdb_id,
+                        'year': year,
+                        'year_text': str(year)
+                    })
+                
+            except Exception as e:
+                print(f"  Error processing movie container: {e}")
+                continue
+        
+        # Check if there's a next page (try both old and new selectors)
+        next_button = soup.find('a', class_='lister-page-next')  # Old interface
+        if not next_button:
+            # Try new interface next button patterns
+            next_button = soup.find('a', {'aria-label': 'Next'})
+        if not next_button:
+            next_button = soup.find('a', string=re.compile(r'Next', re.I))
+        
+        has_next_page = next_button is not None
+        self.metrics.observe_parse(time.perf_counter() - parse_start)
+        
+        print(f"  Found {len(movies)} movies on this page")
+        return movies, has_next_page
     
+    def _fetch_page(self, year, page):
+        """Movies on one search page; throttled and failed requests are retried, after any Retry-After."""
+        start = 1 + (page - 1) * PAGE_STEP
+        for attempt in range(RETRIES + 1):
+            if attempt:
+                # A Retry-After already holds the host in the budget; the jitter spreads out the workers
+                time.sleep(random.uniform(0, min(MAX_BACKOFF, BACKOFF * 2 ** (attempt - 1))))
+            try:
+                movies, _ = self.get_movies_by_year(year, start)
+                return movies
+            except FetchError as e:
+                if not e.retryable or attempt == RETRIES:
+                    raise
+                print(f"  ⚠️ {e}; retrying")
+
+    def iter_pages(self, years, max_pages=None):
+        """
+        Fetch search result pages for several years concurrently and yield
+        (year, page, movies, last) in year and page order; `last` marks the
+        final page of each year.
+
+        Page offsets are known up front, so pages are fetched speculatively: the
+        earliest unfinished year gets workers first, and a year may have twice as
+        many pages in flight as it has returned full pages so far (at least
+        two), so one year cannot flood the workers with pages. A short page
+        ends its year and any later pages already fetched for it are dropped.
+
+        A page that still fails after its retries ends its year as well, but is
+        yielded as the exception in place of `movies`, so callers can tell a
+        year cut short from one that is complete.
+        """
+        years = list(years)
+        state = {year: {"next": 1, "full": 0, "end": None, "in_flight": 0, "pages": {}} for year in years}
+        futures = {}
+        current = 0   # index of the year being yielded
+        next_page = 1  # next page of that year to yield
+        pool = ThreadPoolExecutor(max_workers=self.workers)
+
+        try:
+            while current < len(years):
+                for year in years[current:]:
+                    year_state = state[year]
+                    while (len(futures) < self.workers and year_state["end"] is None
+                           and year_state["in_flight"] < 2 * max(1, year_state["full"])
+                           and (not max_pages or year_state["next"] <= max_pages)):
+                        future = pool.submit(self._fetch_page, year, year_state["next"])
+                        futures[future] = (year, year_state["next"])
+                        year_state["next"] += 1
+                        year_state["in_flight"] += 1
+                    if len(futures) >= self.workers:
+                        break
+
+                done, _ = wait(futures, return_when=FIRST_COMPLETED)
+                for future in done:
+                    year, page = futures.pop(future)
+                    year_state = state[year]
+                    year_state["in_flight"] -= 1
+                    try:
+                        movies = future.result()
+                    except Exception as e:
+                        print(f"  ❌ Error processing year {year}: {e}")
+                        movies = e
+                    if year_state["end"] is not None and page > year_state["end"]:
+                        continue
+                    year_state["pages"][page] = movies
+                    # Fewer than a full page means this was the last one
+                    if isinstance(movies, Exception) or len(movies) < PAGE_SIZE or page == max_pages:
+                        year_state["end"] = page
+                        for later in [p for p in year_state["pages"] if p > page]:
+                            del year_state["pages"][later]
+                    else:
+                        year_state["full"] += 1
+
+                while current < len(years) and next_page in state[years[current]]["pages"]:
+                    year = years[current]
+                    movies = state[year]["pages"].pop(next_page)
+                    last = next_page == state[year]["end"]
+                    yield year, next_page, movies, last
+                    if last:
+                        current += 1
+                        next_page = 1
+                    else:
+                        next_page += 1
+        finally:
+            pool.shutdown(wait=False, cancel_futures=True)
+
     def get_all_movies_for_year(self, year, max_pages=None):
         """Get all movies for a specific year across all pages"""
         all_movies = []
-        start = 1
-        page = 1
-        
-        while True:
-            if max_pages and page > max_pages:
-                break
-                
-            movies, has_next_page = self.get_movies_by_year(year, start)
-            
-            if not movies:
-                break
-                
+        for _, page, movies, _ in self.iter_pages([year], max_pages):
+            if isinstance(movies, Exception):
+                raise movies
             all_movies.extend(movies)
-            print(f"  Found {len(movies)} movies on page {page} (total: {len(all_movies)})")
-            
-            # Stop if we got fewer than 25 movies (indicates last page)
-            # This is more reliable than next button detection for new interface
-            if len(movies) < 25:
-                break
-                
-            # For new interface, next page detection may not work reliably
-            # So we continue unless we hit max pages or get no results
-            
-            # IMDb shows 25 results per page, start increments by 50 for some reason
-            start += 50
-            page += 1
-            
-            # Be respectful to the server
-            time.sleep(1)
-        
+            if movies:
+                print(f"  Found {len(movies)} movies on page {page} (total: {len(all_movies)})")
         return all_movies
     
-    def scrape_years_range(self, start_year, end_year, max_pages_per_year=None, output_file=None):
-        """Scrape movies for a range of years"""
+    def scrape_years_range(self, start_year, end_year, max_pages_per_year=None, output_file=None, resume=False):
+        """
+        Scrape movies for a range of years, streaming them into the output CSV.
+        Returns the MovieCSVSink that wrote them (count and first few movies).
+        """
         if not output_file:
             output_file = f"movies_{start_year}_{end_year}.csv"
         
-        all_movies = []
         total_years = end_year - start_year + 1
         
         print(f"Starting to scrape movies from {start_year} to {end_year}")
         print(f"Output file: {output_file}")
         print("=" * 50)
         
-        for year in range(start_year, end_year + 1):
-            try:
-                current_year_index = year - start_year + 1
-                print(f"\n[{current_year_index}/{total_years}] Processing year {year}...")
+        sink = MovieCSVSink(output_file, {"start_year": start_year, "max_pages": max_pages_per_year}, resume=resume)
+        first_year = start_year
+        if sink.completed_year is not None:
+            first_year = sink.completed_year + 1
+            print(f"Resuming after {sink.completed_year}: {sink.count} movies already written")
+        
+        year_movies = 0
+        try:
+            # Pages arrive in year and page order, so the output order is deterministic
+            for year, page, movies, last in self.iter_pages(range(first_year, end_year + 1), max_pages_per_year):
+                if page == 1:
+                    current_year_index = year - start_year + 1
+                    print(f"\n[{current_year_index}/{total_years}] Processing year {year}...")
+                    year_movies = 0
                 
-                year_movies = self.get_all_movies_for_year(year, max_pages_per_year)
+                if isinstance(movies, Exception):
+                    print(f"  ❌ Year {year} stopped at page {page}: {movies}")
+                else:
+                    year_movies += sink.write_page(movies)
+                
+                if not last:
+                    continue
+                
+                if not sink.end_year(year, page, movies):
+                    print(f"  ⚠️  Year {year} left pending ({year_movies} movies so far); --resume fetches it again")
+                    continue
                 
                 if year_movies:
-                    all_movies.extend(year_movies)
-                    print(f"  ✅ Year {year}: {len(year_movies)} movies")
+                    print(f"  ✅ Year {year}: {year_movies} movies")
                 else:
                     print(f"  ⚠️  Year {year}: No movies found")
-                
-                # Save progress every 10 years or at the end
-                if year % 10 == 0 or year == end_year:
-                    self.save_to_csv(all_movies, output_file)
-                    print(f"  💾 Progress saved: {len(all_movies)} total movies")
-                
-            except Exception as e:
-                print(f"  ❌ Error processing year {year}: {e}")
-                continue
+                print(f"  💾 Progress saved: {sink.count} total movies")
+        finally:
+            sink.close()
         
-        # Final save
-        self.save_to_csv(all_movies, output_file)
+        sink.finish()
         
         print("\n" + "=" * 50)
-        print(f"✅ Scraping completed!")
+        if sink.pending_years:
+            print(f"⚠️  Years {', '.join(map(str, sink.pending_years))} are incomplete; "
+                  f"rerun with --resume to continue from {sink.pending_years[0]}")
+        else:
+            print(f"✅ Scraping completed!")
         print(f"📁 Output file: {output_file}")
-        print(f"🎬 Total movies collected: {len(all_movies)}")
+        print(f"🎬 Total movies collected: {sink.count}")
         print(f"📅 Years covered: {start_year}-{end_year}")
         
-        return all_movies
+        return sink
     
     def save_to_csv(self, movies, filename):
         """Save movies to CSV file"""
@@ -201,6 +308,123 @@ class IMDbMovieScraper:
         except Exception as e:
             print(f"Error saving to CSV: {e}")
 
+class MovieCSVSink:
+    """
+    Append-only CSV writer for scrape_years_range.
+    
+    Each page of movies is appended as it arrives, then flushed and fsynced, so
+    no more than one page is held in memory. After every finished year the file
+    size is recorded in `<output>.progress` (atomically); resuming truncates the
+    CSV back to that size and carries on with the next year.
+    
+    A year only counts as finished when its last page shows that it really
+    ended. A year cut short by a failed page stays pending: progress is not
+    recorded past it, and the progress file outlives the run for --resume.
+    """
+    
+    FIELDNAMES = ['title', 'imdb_id', 'year', 'imdb_url']
+    SAMPLE_SIZE = 5
+    
+    def __init__(self, filename, key, resume=False):
+        self.filename = filename
+        self.progress_path = f"{filename}.progress"
+        self.key = key
+        self.completed_year = None
+        self.pending_years = []
+        self.count = 0
+        self.sample = []
+        # IMDb can list a movie again on a later page while the ranking shifts
+        self.seen_ids = set()
+        
+        progress = self._load_progress() if resume else None
+        if progress is not None:
+            self.completed_year = progress["completed_year"]
+            # Drop rows of the year that was being written when the run stopped
+            with open(filename, 'r+b') as f:
+                f.truncate(progress["offset"])
+            self._read_existing()
+            self._file = open(filename, 'a', newline='', encoding='utf-8')
+            self._writer = csv.DictWriter(self._file, fieldnames=self.FIELDNAMES)
+        else:
+            self._file = open(filename, 'w', newline='', encoding='utf-8')
+            self._writer = csv.DictWriter(self._file, fieldnames=self.FIELDNAMES)
+            self._writer.writeheader()
+            self._sync()
+    
+    def _load_progress(self):
+        try:
+            with open(self.progress_path, 'r', encoding='utf-8') as f:
+                progress = json.load(f)
+        except (OSError, ValueError):
+            return None
+        if progress.get("key") != self.key:
+            return None
+        if not os.path.exists(self.filename) or os.path.getsize(self.filename) < progress["offset"]:
+            return None
+        return progress
+    
+    def _read_existing(self):
+        with open(self.filename, 'r', newline='', encoding='utf-8') as f:
+            for row in csv.DictReader(f):
+                self._count(row)
+    
+    def _count(self, row):
+        self.seen_ids.add(row['imdb_id'])
+        self.count += 1
+        if len(self.sample) < self.SAMPLE_SIZE:
+            self.sample.append(row)
+    
+    def _sync(self):
+        self._file.flush()
+        os.fsync(self._file.fileno())
+    
+    def write_page(self, movies):
+        """Append the movies not written yet and make them durable; returns how many were new."""
+        written = 0
+        for movie in movies:
+            if movie['imdb_id'] in self.seen_ids:
+                continue
+            row = {
+                'title': movie['title'],
+                'imdb_id': movie['imdb_id'],
+                'year': movie['year'],
+                'imdb_url': f"https://www.imdb.com/title/{movie['imdb_id']}/"
+            }
+            self._writer.writerow(row)
+            self._count(row)
+            written += 1
+        self._sync()
+        return written
+    
+    def end_year(self, year, page, movies):
+        """
+        Record that every movie of `year` is in the file, given its last `page`
+        and that page's `movies`; returns False and leaves the year pending
+        unless that page was short (or the --max-pages limit).
+        """
+        ended = not isinstance(movies, Exception) and (len(movies) < PAGE_SIZE or page == self.key["max_pages"])
+        if not ended:
+            self.pending_years.append(year)
+        if self.pending_years:
+            # Progress is a prefix of the file: nothing after a pending year can count as done
+            return ended
+        self.completed_year = year
+        progress = {"key": self.key, "completed_year": year, "offset": os.fstat(self._file.fileno()).st_size}
+        atomic_write(self.progress_path, lambda f: json.dump(progress, f))
+        return True
+    
+    def close(self):
+        if not self._file.closed:
+            self._file.close()
+    
+    def finish(self):
+        """Close the file and forget the progress of a run that completed."""
+        self.close()
+        if self.pending_years:
+            return
+        if os.path.exists(self.progress_path):
+            os.remove(self.progress_path)
+
 def main():
     parser = argparse.ArgumentParser(description="Scrape IMDb for comprehensive movie data since 1927")
     
@@ -216,42 +440,75 @@ def main():
     parser.add_argument('--max-pages', '-p', type=int, default=None,
                        help='Maximum pages per year (default: unlimited, ~50 movies per page)')
     
+    parser.add_argument('--workers', '-w', type=int, default=4,
+                       help='Search pages to fetch in parallel (default: 4)')
+    
+    parser.add_argument('--rate', type=float, default=2.0,
+                       help='Requests per second against IMDb to start from (default: 2)')
+    
+    parser.add_argument('--max-rate', type=float, default=None,
+                       help='Let the request rate rise above --rate up to this while IMDb responds well (default: --rate, no ramp-up); it backs off on 429/503 either way')
+    
+    parser.add_argument('--resume', action='store_true',
+                       help='Continue an interrupted run after the last year fully written to the output')
+    
+    parser.add_argument('--metrics-dir', type=str, default=DEFAULT_METRICS_DIR,
+                       help=f'Directory for the request metrics written at the end of the run (default: {DEFAULT_METRICS_DIR})')
+    
     parser.add_argument('--test', action='store_true',
                        help='Test mode: only scrape 2020-2022 with 1 page per year')
     
     args = parser.parse_args()
     
-    scraper = IMDbMovieScraper()
+    if args.workers < 1 or args.rate <= 0:
+        print("❌ Error: Workers must be at least 1 and rate greater than 0")
+        return
     
-    if args.test:
-        print("🧪 Running in test mode...")
-        movies = scraper.scrape_years_range(2020, 2022, max_pages_per_year=1, output_file="movies_test.csv")
-    else:
-        start_year = args.start_year
-        end_year = args.end_year
-        
+    if args.max_rate is None:
+        args.max_rate = args.rate
+    elif args.max_rate < args.rate:
+        print("❌ Error: Max rate must be at least --rate")
+        return
+    
+    if not args.test:
         # Validate years
-        if start_year > end_year:
+        if args.start_year > args.end_year:
             print("❌ Error: Start year must be less than or equal to end year")
             return
         
-        if start_year < 1927:
+        if args.start_year < 1927:
             print("❌ Error: Start year must be 1927 or later (when movies began)")
             return
-        
-        movies = scraper.scrape_years_range(
-            start_year, 
-            end_year, 
-            max_pages_per_year=args.max_pages,
-            output_file=args.output
-        )
+    
+    scraper = IMDbMovieScraper(workers=args.workers, rate=args.rate, max_rate=args.max_rate)
+    
+    try:
+        if args.test:
+            print("🧪 Running in test mode...")
+            result = scraper.scrape_years_range(2020, 2022, max_pages_per_year=1, output_file="movies_test.csv",
+                                                resume=args.resume)
+        else:
+            result = scraper.scrape_years_range(
+                args.start_year, 
+                args.end_year, 
+                max_pages_per_year=args.max_pages,
+                output_file=args.output,
+                resume=args.resume
+            )
+    finally:
+        # Also after an interrupted run, which is when the numbers matter most
+        prom_path, json_path = scraper.metrics.write(args.metrics_dir)
+        print(f"\n📈 {scraper.metrics.report()}")
+        for host, (rate, throttled) in scraper.budget.rates().items():
+            print(f"   {host}: ended at {rate:.1f} requests/s, throttled {throttled} times")
+        print(f"   Metrics written to {prom_path} and {json_path}")
     
     print(f"\n🎭 Sample movies collected:")
-    for i, movie in enumerate(movies[:5]):
+    for i, movie in enumerate(result.sample):
         print(f"  {i+1}. {movie['title']} ({movie['year']}) - {movie['imdb_id']}")
     
-    if len(movies) > 5:
-        print(f"  ... and {len(movies) - 5} more movies")
+    if result.count > len(result.sample):
+        print(f"  ... and {result.count - len(result.sample)} more movies")
 
 if __name__ == "__main__":
     main()
\ No newline at end of file
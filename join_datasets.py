@@ -0,0 +1,179 @@
+#!/usr/bin/env python3
+"""
+Join the Oscar nominations, box office and IMDb movie list on the IMDb ID.
+
+    assets/data/oscar_nominee.csv   FilmId     one row per nomination
+    all_boxoffice.csv               ImdbID     one row per release and year
+    movies_1927_2024.csv            imdb_id    one row per movie (the largest input)
+
+The two smaller inputs are folded into hash indexes keyed by IMDb ID, then the
+movie list is streamed against them and every film found in any of the three
+is written once to films.csv (a full outer join). Films missing from the movie
+list follow in IMDb ID order.
+
+- Nominations without a FilmId are individual, company or technical awards with
+  no film to attach to; they are counted and skipped.
+- A film with several nominations (or several releases) is aggregated into
+  one row; the box office figures are those of its highest grossing release.
+- Movies listed more than once keep their first row.
+"""
+
+import argparse
+import csv
+import os
+import time
+
+from boxoffice_checkpoint import atomic_write
+from boxoffice_money import format_money, read_records
+
+OSCAR_FILE = os.path.join("assets", "data", "oscar_nominee.csv")
+BOXOFFICE_FILE = "all_boxoffice.csv"
+MOVIES_FILE = "movies_1927_2024.csv"
+OUTPUT_FILE = "films.csv"
+
+FILM_FIELDS = [
+    "imdb_id", "title", "year", "in_movie_list",
+    "boxoffice_releases", "boxoffice_years", "domestic", "international", "worldwide",
+    "oscar_nominations", "oscar_wins", "oscar_first_ceremony", "oscar_categories", "oscar_won_categories",
+]
+
+
+def _ceremony_year(year_text):
+    # "1927/28" -> 1927
+    return int(year_text.split("/")[0])
+
+
+def index_oscars(path):
+    """Aggregate nominations per FilmId; returns (index, nominations without a FilmId)."""
+    index = {}
+    skipped = 0
+    with open(path, "r", newline="", encoding="utf-8") as f:
+        for row in csv.DictReader(f):
+            film_id = row["FilmId"].strip()
+            if not film_id:
+                skipped += 1
+                continue
+            film = index.get(film_id)
+            if film is None:
+                film = index[film_id] = {"title": row["Film"], "year": _ceremony_year(row["Year"]),
+                                         "nominations": 0, "wins": 0, "categories": {}, "won": {}}
+            film["nominations"] += 1
+            film["categories"][row["CanonicalCategory"]] = None  # insertion-ordered set
+            if row["Winner"] == "TRUE":
+                film["wins"] += 1
+                film["won"][row["CanonicalCategory"]] = None
+            film["year"] = min(film["year"], _ceremony_year(row["Year"]))
+    return index, skipped
+
+
+def index_boxoffice(path):
+    """Index releases per IMDb ID, keeping the highest grossing one."""
+    index = {}
+    for record in read_records(path):
+        if not record.imdb_id:
+            continue
+        film = index.get(record.imdb_id)
+        if film is None:
+            index[record.imdb_id] = {"best": record, "releases": {record.url.split("?")[0]},
+                                     "years": {record.year}}
+            continue
+        film["releases"].add(record.url.split("?")[0])
+        film["years"].add(record.year)
+        if record.worldwide > film["best"].worldwide:
+            film["best"] = record
+    return index
+
+
+def film_row(imdb_id, movie, boxoffice, oscars):
+    """One denormalized film; `movie`, `boxoffice` and `oscars` may each be None."""
+    best = boxoffice["best"] if boxoffice else None
+    if movie is not None:
+        title, year = movie["title"], int(movie["year"])
+    elif best is not None:
+        title, year = best.title, min(boxoffice["years"])
+    else:
+        title, year = oscars["title"], oscars["year"]
+
+    row = {"imdb_id": imdb_id, "title": title, "year": year, "in_movie_list": int(movie is not None)}
+    if boxoffice:
+        row.update(boxoffice_releases=len(boxoffice["releases"]),
+                   boxoffice_years="|".join(map(str, sorted(boxoffice["years"]))),
+                   domestic=format_money(best.domestic), international=format_money(best.international),
+                   worldwide=format_money(best.worldwide))
+    else:
+        row.update(boxoffice_releases=0, boxoffice_years="", domestic="", international="", worldwide="")
+    if oscars:
+        row.update(oscar_nominations=oscars["nominations"], oscar_wins=oscars["wins"],
+                   oscar_first_ceremony=oscars["year"], oscar_categories="|".join(oscars["categories"]),
+                   oscar_won_categories="|".join(oscars["won"]))
+    else:
+        row.update(oscar_nominations=0, oscar_wins=0, oscar_first_ceremony="",
+                   oscar_categories="", oscar_won_categories="")
+    return row
+
+
+def join_datasets(oscar_file=OSCAR_FILE, boxoffice_file=BOXOFFICE_FILE, movies_file=MOVIES_FILE,
+                  output_file=OUTPUT_FILE):
+    """Write the film-level join to `output_file` and return counts for the report."""
+    oscars, skipped_nominations = index_oscars(oscar_file)
+    boxoffice = index_boxoffice(boxoffice_file)
+    stats = {"films": 0, "from_movie_list": 0, "with_boxoffice": 0, "with_oscars": 0,
+             "duplicate_movies": 0, "nominations_without_film": skipped_nominations}
+
+    def write(f):
+        writer = csv.DictWriter(f, fieldnames=FILM_FIELDS)
+        writer.writeheader()
+
+        def emit(imdb_id, movie):
+            row = film_row(imdb_id, movie, boxoffice.get(imdb_id), oscars.get(imdb_id))
+            writer.writerow(row)
+            stats["films"] += 1
+            stats["with_boxoffice"] += row["boxoffice_releases"] > 0
+            stats["with_oscars"] += row["oscar_nominations"] > 0
+
+        # Stream the largest input against the two indexes
+        seen = set()
+        with open(movies_file, "r", newline="", encoding="utf-8") as movies:
+            for movie in csv.DictReader(movies):
+                imdb_id = movie["imdb_id"]
+                if imdb_id in seen:
+                    stats["duplicate_movies"] += 1
+                    continue
+                seen.add(imdb_id)
+                emit(imdb_id, movie)
+        stats["from_movie_list"] = stats["films"]
+
+        # Films only known from the box office or the Oscars
+        for imdb_id in sorted((boxoffice.keys() | oscars.keys()) - seen):
+            emit(imdb_id, None)
+
+    atomic_write(output_file, write)
+    return stats
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Join Oscar nominations, box office and the IMDb movie list by IMDb ID")
+    parser.add_argument("--oscar", default=OSCAR_FILE, help=f"Oscar nominations CSV (default: {OSCAR_FILE})")
+    parser.add_argument("--boxoffice", default=BOXOFFICE_FILE, help=f"Merged box office CSV (default: {BOXOFFICE_FILE})")
+    parser.add_argument("--movies", default=MOVIES_FILE, help=f"IMDb movie list CSV (default: {MOVIES_FILE})")
+    parser.add_argument("--output", "-o", default=OUTPUT_FILE, help=f"Output CSV (default: {OUTPUT_FILE})")
+    args = parser.parse_args()
+
+    for path in (args.oscar, args.boxoffice, args.movies):
+        if not os.path.exists(path):
+            print(f"❌ {path} not found")
+            return
+
+    start = time.perf_counter()
+    stats = join_datasets(args.oscar, args.boxoffice, args.movies, args.output)
+    elapsed = time.perf_counter() - start
+
+    print(f"✅ Wrote {stats['films']} films to {args.output} in {elapsed * 1000:.0f} ms")
+    print(f"   {stats['from_movie_list']} from the movie list ({stats['duplicate_movies']} duplicate rows skipped), "
+          f"{stats['films'] - stats['from_movie_list']} only in the box office or Oscar data")
+    print(f"   {stats['with_boxoffice']} with box office figures, {stats['with_oscars']} with Oscar nominations")
+    print(f"   {stats['nominations_without_film']} nominations have no FilmId (people, companies, technical awards)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,257 @@
+#!/usr/bin/env python3
+"""
+Fill missing IMDb IDs by fuzzy-matching titles against an IMDb title list.
+
+Box office rows without an ImdbID and Oscar nominations with a Film but no
+FilmId are matched against movies_1927_2024.csv (or a full IMDb
+title.basics.tsv). Comparing every pair is quadratic, so candidates are
+blocked first:
+
+1. titles are normalized (case, accents, punctuation, "&", leading articles)
+2. each candidate is indexed by (year, character trigram), held as one
+   sorted NumPy array so a block is a binary-searched slice
+3. a query only scores candidates from its year ±1 that share a trigram
+   with it; the score is the Dice coefficient of the two trigram sets,
+   slightly reduced for an off-by-one year
+4. when that finds nothing, an identical normalized title from an earlier
+   year is taken instead (box office years of re-releases such as
+   "Bambi" in 1982 are not the film's year)
+
+Results go to title_matches.csv with the best candidate, its score and the
+runner-up score (a close runner-up means the match is ambiguous).
+
+    python match_titles.py
+    python match_titles.py --evaluate 2000    # hide 2000 known IDs and re-find them
+"""
+
+import argparse
+import csv
+import os
+import random
+import re
+import time
+import unicodedata
+from collections import defaultdict
+
+import numpy as np
+
+from boxoffice_checkpoint import atomic_write
+
+OSCAR_FILE = os.path.join("assets", "data", "oscar_nominee.csv")
+BOXOFFICE_FILE = "all_boxoffice.csv"
+MOVIES_FILE = "movies_1927_2024.csv"
+OUTPUT_FILE = "title_matches.csv"
+
+MATCH_FIELDS = ["source", "row", "year", "title", "imdb_id", "matched_title", "matched_year", "score", "runner_up"]
+
+DEFAULT_MIN_SCORE = 0.6
+YEAR_WINDOW = 1
+OFF_YEAR_PENALTY = 0.95
+RERELEASE_SCORE = 0.9
+
+_ARTICLE_RE = re.compile(r"^(the|a|an) |, (the|a|an)$")
+_NON_ALNUM_RE = re.compile(r"[^a-z0-9]+")
+
+# Normalized titles only hold " ", a-z and 0-9, so a trigram is a base-37 number
+_SYMBOLS = np.zeros(256, dtype=np.uint8)
+_SYMBOLS[np.frombuffer(b"abcdefghijklmnopqrstuvwxyz0123456789", dtype=np.uint8)] = np.arange(1, 37)
+_SYMBOL_COUNT = 37
+_TRIGRAMS = _SYMBOL_COUNT ** 3
+
+
+def normalize_title(title):
+    """'The Lord of the Rings: The Two Towers' -> 'lord of the rings the two towers'"""
+    text = unicodedata.normalize("NFKD", title).encode("ascii", "ignore").decode("ascii").lower()
+    text = text.replace("&", " and ")
+    text = _NON_ALNUM_RE.sub(" ", text).strip()
+    return _ARTICLE_RE.sub("", text).strip() or text
+
+
+def _encode_titles(normalized_titles):
+    """
+    Trigrams of normalized titles as integers; returns (owner, trigram) arrays
+    with one entry per distinct trigram of each title, sorted by owner.
+    """
+    padded = "".join(f"  {title} " for title in normalized_titles).encode("ascii")
+    lengths = np.array([len(title) + 3 for title in normalized_titles], dtype=np.int64)
+    if not len(lengths):
+        return np.empty(0, dtype=np.int64), np.empty(0, dtype=np.int64)
+    chars = _SYMBOLS[np.frombuffer(padded, dtype=np.uint8)].astype(np.int64)
+    grams = (chars[:-2] * _SYMBOL_COUNT + chars[1:-1]) * _SYMBOL_COUNT + chars[2:]
+
+    # Drop the windows that run into the next title
+    owner = np.repeat(np.arange(len(lengths)), lengths)[:-2]
+    offset = np.arange(len(owner)) - np.repeat(np.cumsum(lengths) - lengths, lengths)[:-2]
+    inside = offset <= lengths[owner] - 3
+    pairs = np.sort(owner[inside] * _TRIGRAMS + grams[inside])
+    pairs = pairs[np.concatenate(([True], pairs[1:] != pairs[:-1]))]
+    return pairs // _TRIGRAMS, pairs % _TRIGRAMS
+
+
+class TitleIndex:
+    """Candidate titles blocked by year and character trigram."""
+
+    def __init__(self, candidates):
+        # candidates: iterable of (imdb_id, title, year)
+        self.candidates = []
+        self.by_title = defaultdict(list)
+        normalized_titles = []
+        seen = set()
+        for imdb_id, title, year in candidates:
+            normalized = normalize_title(title)
+            if (imdb_id, normalized) in seen:
+                continue
+            seen.add((imdb_id, normalized))
+            self.by_title[normalized].append(len(self.candidates))
+            self.candidates.append((imdb_id, title, year))
+            normalized_titles.append(normalized)
+
+        # Postings sorted by (year, trigram); one block is a contiguous slice
+        self.years = np.array([candidate[2] for candidate in self.candidates], dtype=np.int64)
+        owner, grams = _encode_titles(normalized_titles)
+        self.gram_counts = np.bincount(owner, minlength=len(self.candidates))
+        keys = self.years[owner] * _TRIGRAMS + grams
+        order = np.argsort(keys, kind="stable")
+        self.keys = keys[order]
+        self.numbers = owner[order]
+
+    def __len__(self):
+        return len(self.candidates)
+
+    def blocks(self):
+        return int(np.count_nonzero(np.diff(self.keys))) + 1 if len(self.keys) else 0
+
+    def match(self, title, year, min_score=DEFAULT_MIN_SCORE):
+        """Return (candidate, score, runner-up score); candidate is None when nothing shares a trigram."""
+        normalized = normalize_title(title)
+        _, grams = _encode_titles([normalized])
+        block_years = np.arange(year - YEAR_WINDOW, year + YEAR_WINDOW + 1, dtype=np.int64)
+        wanted = (block_years[:, None] * _TRIGRAMS + grams).ravel()
+        starts = np.searchsorted(self.keys, wanted, side="left")
+        ends = np.searchsorted(self.keys, wanted, side="right")
+
+        best = second = 0.0
+        best_number = None
+        hits = [self.numbers[start:end] for start, end in zip(starts, ends) if end > start]
+        if hits:
+            # A candidate lives in one year, so its hit count is the number of shared trigrams
+            numbers, shared = np.unique(np.concatenate(hits), return_counts=True)
+            scores = 2 * shared / (len(grams) + self.gram_counts[numbers])
+            scores[self.years[numbers] != year] *= OFF_YEAR_PENALTY
+            top = np.argsort(-scores, kind="stable")[:2]
+            best_number, best = int(numbers[top[0]]), float(scores[top[0]])
+            second = float(scores[top[1]]) if len(top) > 1 else 0.0
+
+        if best < min_score:
+            earlier = [number for number in self.by_title.get(normalized, ()) if self.candidates[number][2] < year]
+            if earlier:
+                # The most recent film of that name before the release year
+                earlier.sort(key=lambda number: self.candidates[number][2])
+                runner_up = RERELEASE_SCORE if len(earlier) > 1 else best
+                return self.candidates[earlier[-1]], RERELEASE_SCORE, runner_up
+        if best_number is None:
+            return None, 0.0, 0.0
+        return self.candidates[best_number], best, second
+
+
+def read_candidates(path):
+    """(imdb_id, title, year) from movies_1927_2024.csv or an IMDb title.basics.tsv."""
+    if path.endswith(".tsv"):
+        with open(path, "r", newline="", encoding="utf-8") as f:
+            for row in csv.DictReader(f, delimiter="\t", quoting=csv.QUOTE_NONE):
+                if row["titleType"] in ("movie", "tvMovie") and row["startYear"].isdigit():
+                    yield row["tconst"], row["primaryTitle"], int(row["startYear"])
+                    if row["originalTitle"] != row["primaryTitle"]:
+                        yield row["tconst"], row["originalTitle"], int(row["startYear"])
+        return
+    with open(path, "r", newline="", encoding="utf-8") as f:
+        for row in csv.DictReader(f):
+            yield row["imdb_id"], row["title"], int(row["year"])
+
+
+def unresolved_rows(boxoffice_file, oscar_file):
+    """(source, row number, title, year) of every row missing its IMDb ID."""
+    with open(boxoffice_file, "r", newline="", encoding="utf-8") as f:
+        for number, row in enumerate(csv.DictReader(f), 1):
+            if not row["ImdbID"].strip():
+                yield "boxoffice", number, row["Title"], int(row["Year"])
+    with open(oscar_file, "r", newline="", encoding="utf-8") as f:
+        for number, row in enumerate(csv.DictReader(f), 1):
+            if row["Film"].strip() and not row["FilmId"].strip():
+                yield "oscars", number, row["Film"], int(row["Year"].split("/")[0])
+
+
+def match_rows(index, rows, min_score=DEFAULT_MIN_SCORE):
+    """Yield a MATCH_FIELDS dict per row; imdb_id stays empty below `min_score`."""
+    for source, number, title, year in rows:
+        candidate, score, runner_up = index.match(title, year, min_score)
+        matched = candidate is not None and score >= min_score
+        yield {
+            "source": source, "row": number, "year": year, "title": title,
+            "imdb_id": candidate[0] if matched else "",
+            "matched_title": candidate[1] if candidate else "",
+            "matched_year": candidate[2] if candidate else "",
+            "score": f"{score:.3f}", "runner_up": f"{runner_up:.3f}",
+        }
+
+
+def evaluate(index, boxoffice_file, sample, min_score):
+    """Hide the IMDb ID of `sample` box office rows whose film is in the index and re-find it."""
+    known = {candidate[0] for candidate in index.candidates}
+    with open(boxoffice_file, "r", newline="", encoding="utf-8") as f:
+        rows = [(number, row) for number, row in enumerate(csv.DictReader(f), 1) if row["ImdbID"] in known]
+    rows = random.Random(0).sample(rows, min(sample, len(rows)))
+
+    start = time.perf_counter()
+    results = list(match_rows(index, (("boxoffice", number, row["Title"], int(row["Year"])) for number, row in rows),
+                              min_score))
+    elapsed = time.perf_counter() - start
+    correct = sum(result["imdb_id"] == row["ImdbID"] for result, (_, row) in zip(results, rows))
+    wrong = sum(bool(result["imdb_id"]) and result["imdb_id"] != row["ImdbID"] for result, (_, row) in zip(results, rows))
+    print(f"🎯 {len(rows)} hidden IDs: {correct} re-found, {wrong} wrong, {len(rows) - correct - wrong} unmatched "
+          f"({correct / max(len(rows), 1):.1%} recall) in {elapsed * 1000:.0f} ms")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Fill missing IMDb IDs by blocked fuzzy title matching")
+    parser.add_argument("--candidates", default=MOVIES_FILE,
+                        help=f"IMDb title list, CSV or title.basics.tsv (default: {MOVIES_FILE})")
+    parser.add_argument("--boxoffice", default=BOXOFFICE_FILE, help=f"Merged box office CSV (default: {BOXOFFICE_FILE})")
+    parser.add_argument("--oscar", default=OSCAR_FILE, help=f"Oscar nominations CSV (default: {OSCAR_FILE})")
+    parser.add_argument("--output", "-o", default=OUTPUT_FILE, help=f"Output CSV (default: {OUTPUT_FILE})")
+    parser.add_argument("--min-score", type=float, default=DEFAULT_MIN_SCORE,
+                        help=f"Lowest score accepted as a match (default: {DEFAULT_MIN_SCORE})")
+    parser.add_argument("--evaluate", type=int, metavar="N",
+                        help="Instead of writing matches, hide N known box office IDs and measure recall")
+    args = parser.parse_args()
+
+    for path in (args.candidates, args.boxoffice, args.oscar):
+        if not os.path.exists(path):
+            print(f"❌ {path} not found")
+            return
+
+    start = time.perf_counter()
+    index = TitleIndex(read_candidates(args.candidates))
+    print(f"📚 Indexed {len(index)} titles ({index.blocks()} year/trigram blocks) "
+          f"in {time.perf_counter() - start:.2f}s")
+
+    if args.evaluate:
+        evaluate(index, args.boxoffice, args.evaluate, args.min_score)
+        return
+
+    start = time.perf_counter()
+    results = list(match_rows(index, unresolved_rows(args.boxoffice, args.oscar), args.min_score))
+
+    def write(f):
+        writer = csv.DictWriter(f, fieldnames=MATCH_FIELDS)
+        writer.writeheader()
+        writer.writerows(results)
+
+    atomic_write(args.output, write)
+    matched = sum(bool(result["imdb_id"]) for result in results)
+    print(f"✅ {matched} of {len(results)} rows without an IMDb ID matched (score >= {args.min_score}) "
+          f"in {(time.perf_counter() - start) * 1000:.0f} ms, written to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,20 +1,176 @@
 #!/usr/bin/env python3
 """
 Merge all individual year box office CSV files into one master file.
+
+Each year file is sorted on its own (by worldwide gross, parsed as one column)
+and spilled to a temporary run file, then the runs are combined with
+heapq.merge. Only one year's rows are ever held in memory, and the top movies
+come from a bounded heap instead of a second full sort.
+
+boxoffice_manifest.json records the size, mtime and content hash of every
+year file that went into all_boxoffice.csv. Later runs only re-read the years
+whose content changed and splice their blocks into the existing output; the
+app's copy in assets/data/ is replaced only when its content differs.
 """
 
+import argparse
 import csv
 import glob
+import heapq
+import json
 import os
-from typing import List, Dict
+import shutil
+import tempfile
+from operator import itemgetter
+from typing import Dict, Iterator, List, Optional, Set, Tuple
 import re
 
+from boxoffice_checkpoint import atomic_write
+from boxoffice_columnar import file_sha256
+from boxoffice_money import parse_money, parse_money_column
+
+OUTPUT_FILE = "all_boxoffice.csv"
+MANIFEST_FILE = "boxoffice_manifest.json"
+ASSET_FILE = os.path.join("assets", "data", OUTPUT_FILE)
+EXPECTED_HEADERS = ['Title', 'Domestic', 'International', 'Worldwide', 'ImdbID', 'URL']
+FIELDNAMES = ['Year'] + EXPECTED_HEADERS
+TOP_N = 5
+
+# (year, worldwide gross, output row in FIELDNAMES order)
+MergeRow = Tuple[int, int, List[str]]
+
 def get_year_from_filename(filename: str) -> int:
     """Extract year from filename like 'boxoffice_2023.csv'"""
     match = re.search(r'boxoffice_(\d{4})\.csv', filename)
     return int(match.group(1)) if match else 0
 
-def merge_boxoffice_files():
+def read_year_file(csv_file: str, year: int) -> Optional[List[MergeRow]]:
+    """Read one year file, sorted by worldwide box office (descending); None if unusable"""
+    try:
+        with open(csv_file, 'r', encoding='utf-8') as f:
+            reader = csv.DictReader(f)
+            
+            # Check if we have the expected headers
+            if reader.fieldnames is None:
+                print(f"  ⚠️ No headers found in {csv_file}, skipping")
+                return None
+            
+            if not all(header in reader.fieldnames for header in EXPECTED_HEADERS):
+                print(f"  ⚠️ Missing expected headers in {csv_file}: {reader.fieldnames}")
+                return None
+            
+            records = [row for row in reader if row['Title'].strip()]  # Skip empty rows
+    except Exception as e:
+        print(f"  ❌ Error reading {csv_file}: {e}")
+        return None
+    
+    # The sort key for the whole year in one column parse
+    worldwide = parse_money_column([row['Worldwide'] for row in records])
+    rows = [
+        (year, int(gross), [str(year)] + [row[header] for header in EXPECTED_HEADERS])
+        for gross, row in zip(worldwide, records)
+    ]
+    
+    # Stable, so movies with equal grosses keep their ranking order
+    rows.sort(key=lambda row: -row[1])
+    return rows
+
+def spill_run(rows: List[MergeRow], directory: str, year: int) -> str:
+    """Write a sorted year block to a run file, keeping the parsed gross alongside each row"""
+    path = os.path.join(directory, f"{year}.run.csv")
+    with open(path, 'w', newline='', encoding='utf-8') as f:
+        writer = csv.writer(f)
+        for _, worldwide, row in rows:
+            writer.writerow([worldwide] + row)
+    return path
+
+def read_run(path: str, year: int) -> Iterator[MergeRow]:
+    with open(path, 'r', newline='', encoding='utf-8') as f:
+        for record in csv.reader(f):
+            yield year, int(record[0]), record[1:]
+
+def read_output_blocks(output_file: str, years: Set[int]) -> Iterator[MergeRow]:
+    """Rows of an existing merged file whose year is in `years`, in file order"""
+    with open(output_file, 'r', newline='', encoding='utf-8') as f:
+        reader = csv.reader(f)
+        next(reader, None)
+        for row in reader:
+            year = int(row[0])
+            if year in years:
+                yield year, parse_money(row[4]), row
+
+def write_merged(runs: List[Iterator[MergeRow]], output_file: str):
+    """
+    Merge year-sorted runs into `output_file`, replacing it atomically.
+    Returns (movies written, first year, last year, top movies by worldwide gross).
+    """
+    top = []  # min-heap of (worldwide, -position, row), at most TOP_N entries
+    count = 0
+    first_year = last_year = None
+    
+    def write(f):
+        nonlocal count, first_year, last_year
+        writer = csv.writer(f)
+        writer.writerow(FIELDNAMES)
+        
+        # Each run holds a single year, so merging on the year keeps every
+        # year's block in its own worldwide order
+        for year, worldwide, row in heapq.merge(*runs, key=itemgetter(0)):
+            writer.writerow(row)
+            
+            entry = (worldwide, -count, row)
+            if len(top) < TOP_N:
+                heapq.heappush(top, entry)
+            elif entry > top[0]:
+                heapq.heapreplace(top, entry)
+            
+            count += 1
+            first_year = year if first_year is None else first_year
+            last_year = year
+    
+    atomic_write(output_file, write)
+    return count, first_year, last_year, [row for _, _, row in sorted(top, reverse=True)]
+
+def file_fingerprint(path: str, previous: Optional[Dict] = None) -> Dict:
+    """Size, mtime and sha256 of `path`; the hash of `previous` is reused when size and mtime match"""
+    stat = os.stat(path)
+    fingerprint = {"size": stat.st_size, "mtime_ns": stat.st_mtime_ns}
+    if previous and all(previous.get(key) == value for key, value in fingerprint.items()):
+        fingerprint["sha256"] = previous["sha256"]
+    else:
+        fingerprint["sha256"] = file_sha256(path)
+    return fingerprint
+
+def load_manifest() -> Dict:
+    try:
+        with open(MANIFEST_FILE, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+def save_manifest(manifest: Dict):
+    atomic_write(MANIFEST_FILE, lambda f: json.dump(manifest, f, indent=1))
+
+def output_matches_manifest(manifest: Dict) -> bool:
+    """Whether all_boxoffice.csv is still exactly what the manifest says was written"""
+    recorded = manifest.get("output")
+    if not recorded or not os.path.exists(OUTPUT_FILE):
+        return False
+    return file_fingerprint(OUTPUT_FILE, recorded)["sha256"] == recorded["sha256"]
+
+def refresh_asset_copy(output_sha256: str):
+    """Copy all_boxoffice.csv into the app's assets when the content differs"""
+    if not os.path.isdir(os.path.dirname(ASSET_FILE)):
+        return
+    if os.path.exists(ASSET_FILE) and file_sha256(ASSET_FILE) == output_sha256:
+        print(f"📱 {ASSET_FILE} is up to date")
+        return
+    tmp_path = f"{ASSET_FILE}.tmp"
+    shutil.copyfile(OUTPUT_FILE, tmp_path)
+    os.replace(tmp_path, ASSET_FILE)
+    print(f"📱 Refreshed {ASSET_FILE}")
+
+def merge_boxoffice_files(full: bool = False, refresh_assets: bool = True):
     """Merge all boxoffice_YYYY.csv files into all_boxoffice.csv"""
     
     # Find all boxoffice CSV files
@@ -29,82 +185,87 @@ def merge_boxoffice_files():
     
     print(f"Found {len(csv_files)} boxoffice files to merge")
     
-    all_rows = []
-    header_written = False
+    manifest = load_manifest()
+    previous_inputs = manifest.get("inputs", {})
+    if full or not output_matches_manifest(manifest):
+        # Nothing in the current output can be trusted
+        previous_inputs = {}
     
+    inputs = {}
+    unchanged_years = set()
+    changed = []
     for csv_file in csv_files:
-        year = get_year_from_filename(csv_file)
-        print(f"Processing {csv_file} (year {year})...")
-        
-        try:
-            with open(csv_file, 'r', encoding='utf-8') as f:
-                reader = csv.DictReader(f)
-                
-                # Check if we have the expected headers
-                if reader.fieldnames is None:
-                    print(f"  ⚠️ No headers found in {csv_file}, skipping")
-                    continue
-                
-                expected_headers = ['Title', 'Domestic', 'International', 'Worldwide', 'ImdbID', 'URL']
-                if not all(header in reader.fieldnames for header in expected_headers):
-                    print(f"  ⚠️ Missing expected headers in {csv_file}: {reader.fieldnames}")
-                    continue
-                
-                # Add year column to each row
-                rows_added = 0
-                for row in reader:
-                    if row['Title'].strip():  # Skip empty rows
-                        row['Year'] = year
-                        all_rows.append(row)
-                        rows_added += 1
-                
-                print(f"  ✅ Added {rows_added} movies from {year}")
-                
-        except Exception as e:
-            print(f"  ❌ Error reading {csv_file}: {e}")
-            continue
+        previous = previous_inputs.get(csv_file)
+        fingerprint = file_fingerprint(csv_file, previous)
+        if previous and previous["sha256"] == fingerprint["sha256"]:
+            inputs[csv_file] = {**previous, **fingerprint}
+            unchanged_years.add(previous["year"])
+        else:
+            changed.append(csv_file)
+            inputs[csv_file] = fingerprint
+    removed = set(previous_inputs) - set(csv_files)
+    
+    if not changed and not removed:
+        print(f"✅ {OUTPUT_FILE} is up to date ({len(unchanged_years)} years unchanged)")
+        if inputs != previous_inputs:
+            # Only mtimes moved; remember them so the files are not hashed again
+            manifest["inputs"] = inputs
+            save_manifest(manifest)
+        if refresh_assets:
+            refresh_asset_copy(manifest["output"]["sha256"])
+        return
     
-    # Write merged data
-    if all_rows:
-        output_file = "all_boxoffice.csv"
-        fieldnames = ['Year', 'Title', 'Domestic', 'International', 'Worldwide', 'ImdbID', 'URL']
+    with tempfile.TemporaryDirectory(prefix="boxoffice_merge_") as run_dir:
+        runs = []
+        if unchanged_years:
+            print(f"♻️  Reusing {len(unchanged_years)} unchanged years from {OUTPUT_FILE}")
+            runs.append(read_output_blocks(OUTPUT_FILE, unchanged_years))
         
-        with open(output_file, 'w', newline='', encoding='utf-8') as f:
-            writer = csv.DictWriter(f, fieldnames=fieldnames)
-            writer.writeheader()
+        for csv_file in changed:
+            year = get_year_from_filename(csv_file)
+            print(f"Processing {csv_file} (year {year})...")
             
-            # Sort by year, then by worldwide box office (descending)
-            all_rows.sort(key=lambda x: (
-                x['Year'], 
-                -int(x['Worldwide'].replace('$', '').replace(',', '')) if x['Worldwide'] != '$0' else 0
-            ))
+            rows = read_year_file(csv_file, year)
+            if rows is None:
+                # Left out of the manifest, so it is looked at again next time
+                del inputs[csv_file]
+                continue
             
-            for row in all_rows:
-                writer.writerow({
-                    'Year': row['Year'],
-                    'Title': row['Title'],
-                    'Domestic': row['Domestic'], 
-                    'International': row['International'],
-                    'Worldwide': row['Worldwide'],
-                    'ImdbID': row['ImdbID'],
-                    'URL': row['URL']
-                })
+            inputs[csv_file].update(year=year, rows=len(rows))
+            runs.append(read_run(spill_run(rows, run_dir, year), year))
+            print(f"  ✅ Added {len(rows)} movies from {year}")
         
-        print(f"\n🎉 Successfully merged {len(all_rows)} movies into {output_file}")
+        count, first_year, last_year, top_movies = write_merged(runs, OUTPUT_FILE)
+    
+    manifest = {"inputs": inputs, "output": file_fingerprint(OUTPUT_FILE)}
+    save_manifest(manifest)
+    
+    if count:
+        print(f"\n🎉 Successfully merged {count} movies into {OUTPUT_FILE}")
         
         # Show some statistics
-        years_covered = sorted(set(row['Year'] for row in all_rows))
-        print(f"📊 Years covered: {min(years_covered)} - {max(years_covered)}")
-        print(f"📈 Total movies: {len(all_rows)}")
+        print(f"📊 Years covered: {first_year} - {last_year}")
+        print(f"📈 Total movies: {count}")
         
         # Show top 5 movies by worldwide box office
-        top_movies = sorted(all_rows, key=lambda x: -int(x['Worldwide'].replace('$', '').replace(',', '')) if x['Worldwide'] != '$0' else 0)[:5]
-        print(f"\n🏆 Top 5 movies by worldwide box office:")
+        print(f"\n🏆 Top {TOP_N} movies by worldwide box office:")
         for i, movie in enumerate(top_movies, 1):
-            print(f"  {i}. {movie['Title']} ({movie['Year']}) - {movie['Worldwide']}")
+            print(f"  {i}. {movie[1]} ({movie[0]}) - {movie[4]}")
             
     else:
         print("❌ No data found to merge!")
+    
+    if refresh_assets:
+        refresh_asset_copy(manifest["output"]["sha256"])
+
+def main():
+    parser = argparse.ArgumentParser(description="Merge boxoffice_YYYY.csv files into all_boxoffice.csv")
+    parser.add_argument("--full", action="store_true",
+                        help="Ignore the manifest and rebuild from every year file")
+    parser.add_argument("--no-assets", action="store_true",
+                        help=f"Do not refresh {ASSET_FILE}")
+    args = parser.parse_args()
+    merge_boxoffice_files(full=args.full, refresh_assets=not args.no_assets)
 
 if __name__ == "__main__":
-    merge_boxoffice_files()
\ No newline at end of file
+    main()
@@ -0,0 +1,275 @@
+#!/usr/bin/env python3
+"""
+Inverted index from nominee ID to Oscar nominations.
+
+oscar_nominee.csv packs several people into the pipe-separated Nominees and
+NomineeIds fields, so finding one person's nominations means splitting every
+row. `build` does that once and writes memory-mappable arrays:
+
+    nominee_index/
+      meta.json                   source file, its sha256 and counts
+      keys.npy                    sorted nominee IDs (fixed-width bytes)
+      names.npy                   nominee name of every key (string code)
+      postings.offsets.npy        start of every key's postings
+      postings.npy                nomination row numbers, grouped by key
+      rows/<column>.npy           one array per nomination column
+      strings.dict.bin            interned strings shared by all string columns
+      strings.dict.offsets.npy
+
+`lookup` binary-searches the keys and decodes only the rows it prints; the
+arrays are opened on first use and the CSV is never read:
+
+    python nominee_index.py build
+    python nominee_index.py lookup nm0001932
+"""
+
+import argparse
+import csv
+import json
+import os
+import shutil
+import time
+
+import numpy as np
+
+from boxoffice_columnar import StringDictionary, file_sha256, format_imdb_id, write_dictionary
+
+OSCAR_FILE = os.path.join("assets", "data", "oscar_nominee.csv")
+DEFAULT_INDEX_DIR = "nominee_index"
+INDEX_VERSION = 1
+
+# column -> (CSV header, dtype); string columns hold codes into the shared dictionary
+ROW_COLUMNS = {
+    "ceremony": ("Ceremony", np.int16),
+    "year": ("Year", "string"),
+    "class": ("Class", "string"),
+    "canonical_category": ("CanonicalCategory", "string"),
+    "category": ("Category", "string"),
+    "film": ("Film", "string"),
+    "film_id": ("FilmId", np.int32),
+    "nominees": ("Nominees", "string"),
+    "nominee_ids": ("NomineeIds", "string"),
+    "winner": ("Winner", np.int8),
+    "note": ("Note", "string"),
+}
+
+# Placeholder the nominee data uses for people it could not identify
+UNKNOWN_NOMINEE_ID = "?"
+
+
+def _encode_value(header, value, strings):
+    if header == "FilmId":
+        return int(value[2:]) if value.startswith("tt") else 0
+    if header == "Winner":
+        return int(value == "TRUE")
+    if header == "Ceremony":
+        return int(value)
+    return strings.setdefault(value, len(strings))
+
+
+def build_index(index_dir=DEFAULT_INDEX_DIR, oscar_file=OSCAR_FILE):
+    """Rebuild the index from the CSV; the old index is only replaced once the new one is complete."""
+    strings = {}
+    columns = {column: [] for column in ROW_COLUMNS}
+    postings = {}
+    names = {}
+    with open(oscar_file, "r", newline="", encoding="utf-8") as f:
+        for row_number, row in enumerate(csv.DictReader(f)):
+            for column, (header, _) in ROW_COLUMNS.items():
+                columns[column].append(_encode_value(header, row[header], strings))
+            ids = row["NomineeIds"].split("|") if row["NomineeIds"] else []
+            people = row["Nominees"].split("|")
+            for position, nominee_id in enumerate(ids):
+                nominee_id = nominee_id.strip()
+                if nominee_id == UNKNOWN_NOMINEE_ID:
+                    continue
+                rows = postings.setdefault(nominee_id, [])
+                if not rows or rows[-1] != row_number:
+                    rows.append(row_number)
+                # The two fields line up whenever they have the same length
+                if nominee_id not in names and len(people) == len(ids):
+                    names[nominee_id] = people[position]
+
+    tmp_dir = f"{index_dir}.tmp"
+    if os.path.exists(tmp_dir):
+        shutil.rmtree(tmp_dir)
+    os.makedirs(os.path.join(tmp_dir, "rows"))
+
+    keys = sorted(postings)
+    offsets = np.zeros(len(keys) + 1, dtype=np.int64)
+    np.cumsum([len(postings[key]) for key in keys], out=offsets[1:])
+    np.save(os.path.join(tmp_dir, "keys.npy"), np.array([key.encode("ascii") for key in keys], dtype=np.bytes_))
+    np.save(os.path.join(tmp_dir, "names.npy"), np.array(
+        [_encode_value("Name", names.get(key, ""), strings) for key in keys], dtype=np.int32))
+    np.save(os.path.join(tmp_dir, "postings.offsets.npy"), offsets)
+    np.save(os.path.join(tmp_dir, "postings.npy"),
+            np.fromiter((row for key in keys for row in postings[key]), dtype=np.int32, count=int(offsets[-1])))
+    for column, (_, dtype) in ROW_COLUMNS.items():
+        np.save(os.path.join(tmp_dir, "rows", f"{column}.npy"),
+                np.array(columns[column], dtype=np.int32 if dtype == "string" else dtype))
+    write_dictionary(tmp_dir, "strings", strings)
+
+    meta = {
+        "version": INDEX_VERSION,
+        "source": oscar_file,
+        "source_sha256": file_sha256(oscar_file),
+        "rows": len(columns["ceremony"]),
+        "nominees": len(keys),
+        "postings": int(offsets[-1]),
+        "strings": len(strings),
+    }
+    with open(os.path.join(tmp_dir, "meta.json"), "w", encoding="utf-8") as f:
+        json.dump(meta, f, indent=1)
+
+    if os.path.exists(index_dir):
+        shutil.rmtree(index_dir)
+    os.replace(tmp_dir, index_dir)
+    return meta
+
+
+class NomineeIndex:
+    """Read access to a built index; every array is memory-mapped on first use."""
+
+    def __init__(self, index_dir=DEFAULT_INDEX_DIR):
+        self.index_dir = index_dir
+        with open(os.path.join(index_dir, "meta.json"), "r", encoding="utf-8") as f:
+            self.meta = json.load(f)
+        if self.meta.get("version") != INDEX_VERSION:
+            raise ValueError(f"Unsupported index version in {index_dir}: {self.meta.get('version')}")
+        self._arrays = {}
+        self._strings = None
+
+    def _array(self, name):
+        if name not in self._arrays:
+            self._arrays[name] = np.load(os.path.join(self.index_dir, f"{name}.npy"), mmap_mode="r")
+        return self._arrays[name]
+
+    @property
+    def strings(self):
+        if self._strings is None:
+            self._strings = StringDictionary(self.index_dir, "strings")
+        return self._strings
+
+    def _position(self, nominee_id):
+        keys = self._array("keys")
+        key = nominee_id.encode("ascii", "replace")
+        position = int(np.searchsorted(keys, key))
+        return position if position < len(keys) and keys[position] == key else None
+
+    def name(self, nominee_id):
+        position = self._position(nominee_id)
+        return None if position is None else self.strings[int(self._array("names")[position])]
+
+    def rows(self, nominee_id):
+        """Row numbers (0-based, in CSV order) of every nomination of `nominee_id`."""
+        position = self._position(nominee_id)
+        if position is None:
+            return []
+        offsets = self._array("postings.offsets")
+        return self._array("postings")[offsets[position]:offsets[position + 1]].tolist()
+
+    def row(self, row_number):
+        """One nomination as a dict keyed like ROW_COLUMNS."""
+        nomination = {}
+        for column, (_, dtype) in ROW_COLUMNS.items():
+            value = int(self._array(f"rows/{column}")[row_number])
+            if dtype == "string":
+                value = self.strings[value]
+            elif column == "film_id":
+                value = format_imdb_id(value)
+            elif column == "winner":
+                value = bool(value)
+            nomination[column] = value
+        return nomination
+
+    def nominations(self, nominee_id):
+        return [self.row(row_number) for row_number in self.rows(nominee_id)]
+
+
+def nomination_stats(nominations):
+    """
+    Nominations, wins and special awards the way the app counts them: unique
+    (category, year) pairs, with the Special class counted separately.
+    """
+    regular, wins, special = set(), set(), set()
+    for nomination in nominations:
+        key = (nomination["category"].strip().lower(), nomination["year"])
+        if nomination["class"].lower() == "special":
+            special.add(key)
+            continue
+        regular.add(key)
+        if nomination["winner"]:
+            wins.add(key)
+    return len(regular), len(wins), len(special)
+
+
+def run_lookup(args):
+    start = time.perf_counter()
+    index = NomineeIndex(args.index_dir)
+    results = [(nominee_id, index.name(nominee_id), index.nominations(nominee_id)) for nominee_id in args.nominee_ids]
+    elapsed_ms = (time.perf_counter() - start) * 1000
+
+    for nominee_id, name, nominations in results:
+        if name is None:
+            print(f"No nominee found with ID: {nominee_id}\n")
+            continue
+        print(f"=== NOMINATIONS FOR {name} (ID: {nominee_id}) ===")
+        print(f"Total nominations found: {len(nominations)}\n")
+        for i, nomination in enumerate(nominations, 1):
+            print(f"{i}. {nomination['film']} ({nomination['year']})")
+            print(f"   Category: {nomination['category']}")
+            print(f"   Winner: {'YES' if nomination['winner'] else 'NO'}")
+            print(f"   Film ID: {nomination['film_id']}")
+            print(f"   Nominees: {nomination['nominees']}")
+            print(f"   Nominee IDs: {nomination['nominee_ids']}")
+            if nomination["note"]:
+                print(f"   Note: {nomination['note']}")
+            print()
+        regular, wins, special = nomination_stats(nominations)
+        print("STATISTICS:")
+        print(f"Regular nominations: {regular}")
+        print(f"Wins: {wins}")
+        print(f"Special awards: {special}")
+        print("========================================\n")
+    print(f"⏱️  Looked up {len(results)} nominee(s) in {elapsed_ms:.2f} ms")
+
+
+def run_info(args):
+    index = NomineeIndex(args.index_dir)
+    meta = index.meta
+    stale = not os.path.exists(meta["source"]) or file_sha256(meta["source"]) != meta["source_sha256"]
+    print(f"{meta['nominees']} nominees, {meta['postings']} postings over {meta['rows']} nominations "
+          f"from {meta['source']}" + (" (stale, rebuild)" if stale else ""))
+    print(f"{meta['strings']} interned strings")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Inverted index from nominee ID to Oscar nominations")
+    parser.add_argument("--index-dir", default=DEFAULT_INDEX_DIR, help=f"Index directory (default: {DEFAULT_INDEX_DIR})")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    build = subparsers.add_parser("build", help="Build the index from the Oscar nominations CSV")
+    build.add_argument("--oscar", default=OSCAR_FILE, help=f"Oscar nominations CSV (default: {OSCAR_FILE})")
+
+    lookup = subparsers.add_parser("lookup", help="Print every nomination of one or more nominee IDs")
+    lookup.add_argument("nominee_ids", nargs="+", help="Nominee IDs, e.g. nm0001932")
+
+    subparsers.add_parser("info", help="Describe the index and whether it is stale")
+
+    args = parser.parse_args()
+    if args.command == "build":
+        if not os.path.exists(args.oscar):
+            print(f"❌ {args.oscar} not found")
+            return
+        start = time.perf_counter()
+        meta = build_index(args.index_dir, args.oscar)
+        print(f"✅ Indexed {meta['nominees']} nominees ({meta['postings']} postings, {meta['strings']} strings) "
+              f"in {time.perf_counter() - start:.2f}s")
+    elif args.command == "lookup":
+        run_lookup(args)
+    else:
+        run_info(args)
+
+
+if __name__ == "__main__":
+    main()
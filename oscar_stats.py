@@ -0,0 +1,232 @@
+#!/usr/bin/env python3
+"""
+Single-pass statistics over oscar_nominee.csv.
+
+Every grouping (decade, ceremony, class, canonical category, winner flag,
+film and their combinations) is aggregated in the same pass over the file,
+so adding a statistic costs one dict update per row rather than another
+read. The file is memory-mapped and cut into chunks on record boundaries;
+with --workers the chunks are aggregated in separate processes and the
+partial results merged.
+
+    python oscar_stats.py
+    python oscar_stats.py --workers 4 --json assets/data/oscar_stats.json
+    python oscar_stats.py --group-by decade,class --group-by film
+"""
+
+import argparse
+import csv
+import io
+import json
+import mmap
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+from boxoffice_checkpoint import atomic_write
+
+OSCAR_FILE = os.path.join("assets", "data", "oscar_nominee.csv")
+CHUNK_SIZE = 1 << 20
+
+DIMENSIONS = ("decade", "year", "ceremony", "class", "canonical_category", "winner", "film")
+
+DEFAULT_GROUPINGS = (
+    ("decade",),
+    ("ceremony",),
+    ("class",),
+    ("canonical_category",),
+    ("winner",),
+    ("film",),
+    ("decade", "class"),
+    ("decade", "canonical_category"),
+)
+
+
+def _dimension_getters(header):
+    column = {name: position for position, name in enumerate(header)}
+    year, ceremony, klass, category = column["Year"], column["Ceremony"], column["Class"], column["CanonicalCategory"]
+    winner, film, film_id = column["Winner"], column["Film"], column["FilmId"]
+
+    def year_of(row):
+        # "1927/28" -> 1927
+        return int(row[year].split("/")[0])
+
+    return {
+        "decade": lambda row: year_of(row) // 10 * 10,
+        "year": year_of,
+        "ceremony": lambda row: int(row[ceremony]),
+        "class": lambda row: row[klass],
+        "canonical_category": lambda row: row[category],
+        "winner": lambda row: row[winner] == "TRUE",
+        # Nominations without a film (people, companies, technical awards) group under ""
+        "film": lambda row: row[film_id] or row[film],
+    }
+
+
+class Aggregates:
+    """[nominations, wins] per key of every grouping; partial results merge with `update`."""
+
+    def __init__(self, groupings):
+        self.groupings = [tuple(grouping) for grouping in groupings]
+        self.counts = {grouping: {} for grouping in self.groupings}
+        self.rows = 0
+
+    def add_rows(self, header, rows):
+        getters = _dimension_getters(header)
+        is_winner = getters["winner"]
+        plan = [(self.counts[grouping], [getters[dimension] for dimension in grouping])
+                for grouping in self.groupings]
+        for row in rows:
+            if not row:
+                continue
+            self.rows += 1
+            won = is_winner(row)
+            values = {}  # each dimension is computed once per row, however many groupings use it
+            for counts, dimension_getters in plan:
+                key = tuple(values[getter] if getter in values else values.setdefault(getter, getter(row))
+                            for getter in dimension_getters)
+                entry = counts.get(key)
+                if entry is None:
+                    counts[key] = [1, int(won)]
+                else:
+                    entry[0] += 1
+                    entry[1] += won
+
+    def update(self, other):
+        self.rows += other.rows
+        for grouping, counts in other.counts.items():
+            mine = self.counts[grouping]
+            for key, (nominations, wins) in counts.items():
+                entry = mine.get(key)
+                if entry is None:
+                    mine[key] = [nominations, wins]
+                else:
+                    entry[0] += nominations
+                    entry[1] += wins
+
+    def as_json(self):
+        """{"decade": [{"decade": 1920, "nominations": 50, "wins": 12}, ...], "decade,class": [...]}"""
+        result = {}
+        for grouping, counts in self.counts.items():
+            entries = []
+            for key in sorted(counts, key=lambda key: tuple((isinstance(value, str), value) for value in key)):
+                entry = dict(zip(grouping, key))
+                entry["nominations"], entry["wins"] = counts[key]
+                entries.append(entry)
+            result[",".join(grouping)] = entries
+        return result
+
+
+def read_header(path):
+    with open(path, "r", newline="", encoding="utf-8") as f:
+        header_line = f.readline()
+    return next(csv.reader([header_line])), len(header_line.encode("utf-8"))
+
+
+def chunk_bounds(path, start, chunk_size=CHUNK_SIZE):
+    """
+    Byte ranges of about `chunk_size` that each end on a record boundary: a
+    newline preceded by an even number of quotes, so a quoted field spanning
+    several lines is never cut.
+    """
+    size = os.path.getsize(path)
+    if size <= start:
+        return []
+    bounds = []
+    with open(path, "rb") as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as data:
+        quotes = 0
+        scanned = begin = start
+        while begin < size:
+            end = min(begin + chunk_size, size)
+            while end < size:
+                newline = data.find(b"\n", end)
+                if newline < 0:
+                    end = size
+                    break
+                quotes += data[scanned:newline].count(b'"')
+                scanned = newline
+                end = newline + 1
+                if quotes % 2 == 0:
+                    break
+            bounds.append((begin, end))
+            begin = end
+    return bounds
+
+
+def aggregate_chunk(path, header, groupings, begin, end):
+    """Aggregate the records in bytes [begin, end) of `path`; runs in worker processes too."""
+    with open(path, "rb") as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as data:
+        text = data[begin:end].decode("utf-8")
+    aggregates = Aggregates(groupings)
+    aggregates.add_rows(header, csv.reader(io.StringIO(text, newline="")))
+    return aggregates
+
+
+def compute_stats(path=OSCAR_FILE, groupings=DEFAULT_GROUPINGS, workers=0, chunk_size=CHUNK_SIZE):
+    header, header_bytes = read_header(path)
+    bounds = chunk_bounds(path, header_bytes, chunk_size)
+    total = Aggregates(groupings)
+    if workers and len(bounds) > 1:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            futures = [pool.submit(aggregate_chunk, path, header, total.groupings, begin, end) for begin, end in bounds]
+            for future in futures:
+                total.update(future.result())
+    else:
+        for begin, end in bounds:
+            total.update(aggregate_chunk(path, header, total.groupings, begin, end))
+    return total
+
+
+def _parse_grouping(value):
+    grouping = tuple(dimension.strip() for dimension in value.split(","))
+    unknown = [dimension for dimension in grouping if dimension not in DIMENSIONS]
+    if unknown:
+        raise argparse.ArgumentTypeError(f"unknown dimension(s) {', '.join(unknown)}; choose from {', '.join(DIMENSIONS)}")
+    return grouping
+
+
+def print_summary(aggregates, top):
+    for grouping, counts in aggregates.counts.items():
+        name = ",".join(grouping)
+        if grouping in (("decade",), ("class",), ("winner",)):
+            rows = sorted(counts.items())
+        else:
+            rows = sorted(counts.items(), key=lambda item: -item[1][0])[:top]
+            name += f" (top {len(rows)} of {len(counts)} by nominations)"
+        print(f"\n📊 {name}")
+        for key, (nominations, wins) in rows:
+            label = " / ".join(str(value) for value in key)
+            print(f"   {label[:60]:<60} {nominations:>6} nominations {wins:>5} wins")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Single-pass group-by statistics over the Oscar nominations CSV")
+    parser.add_argument("--oscar", default=OSCAR_FILE, help=f"Oscar nominations CSV (default: {OSCAR_FILE})")
+    parser.add_argument("--group-by", action="append", type=_parse_grouping, metavar="DIMS",
+                        help=f"Comma-separated dimensions, repeatable (from: {', '.join(DIMENSIONS)}; "
+                             "default: a standard set)")
+    parser.add_argument("--workers", "-w", type=int, default=0,
+                        help="Aggregate chunks in this many processes (default: 0, in this process)")
+    parser.add_argument("--chunk-size", type=int, default=CHUNK_SIZE, help=f"Bytes per chunk (default: {CHUNK_SIZE})")
+    parser.add_argument("--json", metavar="PATH", help="Also write the statistics as JSON for the app")
+    parser.add_argument("--top", type=int, default=10, help="Rows printed for large groupings (default: 10)")
+    args = parser.parse_args()
+
+    if not os.path.exists(args.oscar):
+        print(f"❌ {args.oscar} not found")
+        return
+
+    start = time.perf_counter()
+    aggregates = compute_stats(args.oscar, args.group_by or DEFAULT_GROUPINGS, args.workers, args.chunk_size)
+    elapsed = time.perf_counter() - start
+    print(f"✅ {aggregates.rows} nominations, {len(aggregates.groupings)} groupings in {elapsed * 1000:.0f} ms")
+    print_summary(aggregates, args.top)
+
+    if args.json:
+        document = {"source": args.oscar, "rows": aggregates.rows, "groupings": aggregates.as_json()}
+        atomic_write(args.json, lambda f: json.dump(document, f, indent=1))
+        print(f"\n💾 Statistics written to {args.json}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,77 @@
+import operator
+import os
+import random
+import sys
+import threading
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from boxoffice_async import HostBudget  # noqa: E402
+from boxoffice_http import FetchError  # noqa: E402
+from boxoffice_pipeline import FetchParsePipeline  # noqa: E402
+
+# parse(html, url) runs in the worker processes, so it has to be picklable
+PARSE = operator.add
+
+
+def _pipeline(fetch, fetch_workers=4, parse_workers=2):
+    return FetchParsePipeline(fetch, PARSE, fetch_workers, parse_workers, HostBudget(rate=0))
+
+
+def test_results_arrive_in_rank_order():
+    delays = random.Random(7)
+    pauses = {f"/{rank}": delays.uniform(0, 0.05) for rank in range(1, 21)}
+
+    def fetch(url):
+        time.sleep(pauses[url])
+        return f"<{url}>"
+
+    delivered = []
+    with _pipeline(fetch) as pipeline:
+        pipeline.run(list(pauses), lambda rank, result: delivered.append((rank, result)))
+
+    assert delivered == [(rank, f"</{rank}>/{rank}") for rank in range(1, 21)]
+
+
+def test_parsed_pages_are_checkpointed_ahead_of_their_turn():
+    later_parsed = threading.Event()
+    events = []
+
+    def fetch(url):
+        if url == "/1":
+            # Rank 1 is still on the network while the others are parsed
+            assert later_parsed.wait(10)
+        return url
+
+    def on_parsed(rank, result):
+        events.append(("parsed", rank))
+        if rank > 1:
+            later_parsed.set()
+
+    with _pipeline(fetch) as pipeline:
+        pipeline.run(["/1", "/2", "/3", "/4"], lambda rank, result: events.append(("result", rank)), on_parsed)
+
+    assert sorted(rank for event, rank in events if event == "parsed") == [1, 2, 3, 4]
+    assert [rank for event, rank in events if event == "result"] == [1, 2, 3, 4]
+    first_result = events.index(("result", 1))
+    assert any(event == "parsed" and rank > 1 for event, rank in events[:first_result])
+
+
+def test_unavailable_and_failed_pages_are_passed_on():
+    error = FetchError("/2", "HTTP 503")
+
+    def fetch(url):
+        if url == "/2":
+            raise error
+        if url == "/3":
+            return None
+        return url
+
+    delivered, parsed = [], []
+    with _pipeline(fetch) as pipeline:
+        pipeline.run(["/1", "/2", "/3", "/4"], lambda rank, result: delivered.append(result),
+                     lambda rank, result: parsed.append(rank))
+
+    assert delivered == ["/1/1", error, None, "/4/4"]
+    assert sorted(parsed) == [1, 4]
@@ -0,0 +1,62 @@
+import argparse
+import csv
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from boxoffice_checkpoint import YearJournal  # noqa: E402
+from boxoffice_runner import _plan_year  # noqa: E402
+from boxoffice_scheduler import RunProgress  # noqa: E402
+
+KEY = {"scraper": "boxoffice_scraper_v2.py", "limit": 3, "fast": True}
+
+LISTING = [
+    {"Rank": str(rank), "Release": f"Listed {rank}", "Gross": f"${gross:,}", "Total Gross": f"${gross:,}",
+     "link": f"/release/rl{rank}/"}
+    for rank, gross in ((1, 30_000_000), (2, 20_000_000), (3, 10_000_000))
+]
+
+
+class _Listings:
+    def __init__(self, rows):
+        self.rows = rows
+
+    def get(self, year):
+        if self.rows is None:
+            raise AssertionError("a resumed year must not need its listing again")
+        return self.rows, None
+
+
+def _page_result(rank):
+    # What a release page gives: its own title and a stale domestic figure
+    return [f"Page {rank}", "$1,000,000", "$5,000,000", "$6,000,000", f"tt000000{rank}"]
+
+
+def _deliver(run, rank):
+    progress = RunProgress(1)
+    progress.plan(len(run.pending_ranks))
+    run.deliver(rank, _page_result(rank), progress)
+
+
+def test_resumed_fast_run_keeps_listing_fields(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    args = argparse.Namespace(refresh=False, fast=True, limit=3)
+
+    journal = YearJournal.open("checkpoints", 2001, KEY)
+    run = _plan_year(2001, args, journal, _Listings(LISTING))
+    _deliver(run, 1)
+    # Interrupted here: ranks 2 and 3 were never fetched
+
+    journal = YearJournal.open("checkpoints", 2001, KEY, resume=True)
+    run = _plan_year(2001, args, journal, _Listings(None))
+    assert run.pending_ranks == [2, 3]
+    _deliver(run, 2)
+    _deliver(run, 3)
+    run.finish()
+
+    with open("boxoffice_2001.csv", newline="", encoding="utf-8") as f:
+        rows = list(csv.DictReader(f))
+    assert [row["Title"] for row in rows] == ["Listed 1", "Listed 2", "Listed 3"]
+    assert [row["Domestic"] for row in rows] == ["$30,000,000", "$20,000,000", "$10,000,000"]
+    assert [row["Worldwide"] for row in rows] == ["$35,000,000", "$25,000,000", "$15,000,000"]
@@ -0,0 +1,77 @@
+import csv
+import os
+import sys
+import threading
+import time
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from boxoffice_runner import build_arg_parser, run_scrape  # noqa: E402
+from boxoffice_scheduler import ListingPrefetcher  # noqa: E402
+
+
+def test_prefetcher_stays_within_lookahead():
+    loaded = []
+
+    def load(year):
+        loaded.append(year)
+        return year * 10
+
+    prefetcher = ListingPrefetcher([2001, 2002, 2003, 2004, 2005], load, lookahead=1, workers=1)
+    assert prefetcher.get(2001) == 20010
+    time.sleep(0.05)
+    assert sorted(loaded) == [2001, 2002]
+
+    assert prefetcher.get(2002) == 20020
+    prefetcher.close()
+    assert sorted(loaded) == [2001, 2002, 2003]
+
+
+def test_prefetcher_reraises_listing_errors():
+    def load(year):
+        if year == 2002:
+            raise LookupError(f"no listing for {year}")
+        return year
+
+    prefetcher = ListingPrefetcher([2001, 2002, 2003], load)
+    assert prefetcher.get(2001) == 2001
+    with pytest.raises(LookupError):
+        prefetcher.get(2002)
+    assert prefetcher.get(2003) == 2003
+    prefetcher.close()
+
+
+def test_next_year_is_fetched_while_a_release_is_outstanding(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    next_year_started = threading.Event()
+    saw_finished_year = []
+
+    def get_movie_links(year):
+        return [f"/release/rl{year}{rank}/" for rank in (1, 2, 3)]
+
+    def get_box_office(url):
+        year, rank = int(url[-6:-2]), int(url[-2])
+        if year == 2002:
+            next_year_started.set()
+        if (year, rank) == (2001, 1):
+            # A slow release must not hold the queue at the year boundary
+            assert next_year_started.wait(10)
+        if (year, rank) == (2002, 3):
+            # ... and its year is written out as soon as its last release is in
+            deadline = time.monotonic() + 10
+            while not os.path.exists("boxoffice_2001.csv") and time.monotonic() < deadline:
+                time.sleep(0.01)
+            saw_finished_year.append(os.path.exists("boxoffice_2001.csv"))
+        return [f"Movie {year} {rank}", "$2", "$1", "$3", f"tt{year}00{rank}"]
+
+    args = build_arg_parser().parse_args(["--years", "2001-2002", "--limit", "3", "--concurrency", "2",
+                                          "--rate", "1000", "--no-cache"])
+    run_scrape(args, get_movie_links, get_box_office)
+
+    assert saw_finished_year == [True]
+    for year in (2001, 2002):
+        with open(f"boxoffice_{year}.csv", newline="", encoding="utf-8") as f:
+            titles = [row["Title"] for row in csv.DictReader(f)]
+        assert titles == [f"Movie {year} {rank}" for rank in (1, 2, 3)]
@@ -0,0 +1,33 @@
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import boxoffice_parsers  # noqa: E402
+from boxoffice_parsers import SUMMARY_TABLE_CLASS, available_backends  # noqa: E402
+from boxoffice_scraper_v2 import match_summary_figures, parse_box_office  # noqa: E402
+
+# Laid out like a live release page: every parser backend joins this table's
+# text without separators, so each label directly follows the previous figure
+RELEASE_PAGE = f"""<html><head><title>Example - Box Office Mojo</title></head><body>
+<h1 class="a-size-extra-large">Example</h1>
+<a href="https://pro.imdb.com/title/tt0120338/?ref_=mojo_rl_summary">IMDbPro</a>
+<div class="{SUMMARY_TABLE_CLASS}"><div class="a-section a-spacing-none"><span>Domestic (40%)</span><span><span class="money">$30,000,000</span></span></div><div class="a-section a-spacing-none"><span>International (60%)</span><span><span class="money">$45,000,000</span></span></div><div class="a-section a-spacing-none"><span>Worldwide</span><span><span class="money">$75,000,000</span></span></div></div></body></html>"""
+
+
+@pytest.mark.parametrize("backend", available_backends())
+def test_separator_less_summary_table(backend, monkeypatch):
+    monkeypatch.setattr(boxoffice_parsers, "_backend", backend)
+
+    title, domestic, international, worldwide, imdb_id = parse_box_office(RELEASE_PAGE, "https://example/")
+
+    assert (domestic, international, worldwide) == ("$30,000,000", "$45,000,000", "$75,000,000")
+    assert (title, imdb_id) == ("Example", "tt0120338")
+
+
+def test_single_label_falls_back_to_the_sum():
+    text = "Domestic (40%)$30,000,000Intl.$45,000,000All$75,000,000"
+
+    assert match_summary_figures(text) == ("$30,000,000", "$45,000,000", "$75,000,000")
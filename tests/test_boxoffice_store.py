@@ -0,0 +1,52 @@
+import argparse
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import boxoffice_store  # noqa: E402
+from boxoffice_store import Store, export_store, run_query  # noqa: E402
+
+BOXOFFICE_CSV = """Year,Title,Domestic,International,Worldwide,ImdbID,URL
+1994,The Lion King,"$312,855,561","$455,000,000","$767,855,561",tt0110357,https://www.boxofficemojo.com/release/rl3354367489/
+2001,Shrek,"$268,200,241","$216,744,207","$484,944,448",tt0126029,https://www.boxofficemojo.com/release/rl7439873/
+"""
+
+MOVIES_CSV = """year,title,imdb_id
+1994,The Lion King,tt0110357
+2001,Shrek,tt0126029
+"""
+
+
+def _write_sources(directory, tables):
+    for name, text in (("boxoffice", BOXOFFICE_CSV), ("movies", MOVIES_CSV)):
+        if name in tables:
+            with open(directory / boxoffice_store.TABLES[name]["source"], "w", encoding="utf-8") as f:
+                f.write(text)
+
+
+def _query(store_dir):
+    return run_query(argparse.Namespace(store_dir=store_dir, years=None, top=5))
+
+
+def test_partial_export_keeps_other_tables(tmp_path, monkeypatch, capsys):
+    monkeypatch.chdir(tmp_path)
+    _write_sources(tmp_path, ("boxoffice", "movies"))
+    export_store("store")
+
+    export_store("store", ["movies"])
+
+    store = Store("store")
+    assert set(store.meta["tables"]) == {"boxoffice", "movies"}
+    assert list(store.load("boxoffice", ["year"])["year"]) == [1994, 2001]
+    _query("store")
+    assert "Shrek" in capsys.readouterr().out
+
+
+def test_query_without_boxoffice_table_reports_error(tmp_path, monkeypatch, capsys):
+    monkeypatch.chdir(tmp_path)
+    _write_sources(tmp_path, ("movies",))
+    export_store("store", ["movies"])
+
+    _query("store")
+    assert "Table 'boxoffice' is not in store" in capsys.readouterr().out
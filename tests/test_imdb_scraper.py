@@ -0,0 +1,80 @@
+import csv
+import datetime
+import os
+import re
+import sys
+
+import requests
+from requests.adapters import BaseAdapter
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import imdb_scraper  # noqa: E402
+from imdb_scraper import PAGE_SIZE, PAGE_STEP, IMDbMovieScraper  # noqa: E402
+
+FULL_PAGES = 2  # per year, followed by a short page of three movies
+
+
+class _FakeIMDb(BaseAdapter):
+    """Search pages for any year; `failures` maps (year, page) to statuses returned before the page itself."""
+
+    def __init__(self, failures=None):
+        super().__init__()
+        self.failures = failures or {}
+
+    def send(self, request, **kwargs):
+        year, start = map(int, re.search(r"release_date=(\d+),\d+.*&start=(\d+)", request.url).groups())
+        page = (start - 1) // PAGE_STEP + 1
+        response = requests.Response()
+        response.url = request.url
+        response.request = request
+        response.elapsed = datetime.timedelta(milliseconds=5)
+        statuses = self.failures.get((year, page))
+        if statuses:
+            response.status_code = statuses.pop(0)
+            response._content = b""
+            return response
+        count = PAGE_SIZE if page <= FULL_PAGES else 3
+        response.status_code = 200
+        response._content = "".join(
+            f'<li class="ipc-metadata-list-summary-item"><a class="ipc-title-link-wrapper" '
+            f'href="/title/tt{year}{page:02d}{i:02d}/">{i + 1}. Movie {i}</a></li>'
+            for i in range(count)).encode()
+        return response
+
+    def close(self):
+        pass
+
+
+def _scraper(adapter):
+    scraper = IMDbMovieScraper(workers=3, rate=0)
+    scraper.session.mount("https://", adapter)
+    return scraper
+
+
+def test_failed_page_leaves_year_pending_until_resume(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setattr(imdb_scraper, "BACKOFF", 0.01)
+    output = str(tmp_path / "movies.csv")
+
+    # Page 2 of 2002 keeps failing; 2001 and 2003 are fine
+    sink = _scraper(_FakeIMDb({(2002, 2): [500] * 10})).scrape_years_range(2001, 2003, output_file=output)
+    assert sink.pending_years == [2002]
+    assert sink.completed_year == 2001
+    assert os.path.exists(f"{output}.progress")
+
+    sink = _scraper(_FakeIMDb()).scrape_years_range(2001, 2003, output_file=output, resume=True)
+    assert sink.pending_years == []
+    assert not os.path.exists(f"{output}.progress")
+    with open(output, newline="", encoding="utf-8") as f:
+        years = [row["year"] for row in csv.DictReader(f)]
+    per_year = FULL_PAGES * PAGE_SIZE + 3
+    assert years == ["2001"] * per_year + ["2002"] * per_year + ["2003"] * per_year
+
+
+def test_throttled_page_is_retried(tmp_path, monkeypatch):
+    monkeypatch.setattr(imdb_scraper, "BACKOFF", 0.01)
+
+    movies = _scraper(_FakeIMDb({(2001, 2): [429, 503]})).get_all_movies_for_year(2001)
+
+    assert len(movies) == FULL_PAGES * PAGE_SIZE + 3
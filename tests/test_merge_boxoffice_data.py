@@ -0,0 +1,107 @@
+import csv
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import merge_boxoffice_data  # noqa: E402
+from merge_boxoffice_data import OUTPUT_FILE, merge_boxoffice_files, read_year_file, write_merged  # noqa: E402
+
+HEADER = "Title,Domestic,International,Worldwide,ImdbID,URL\n"
+
+
+def _write_year(year, movies):
+    """`movies` is a list of (title, worldwide) in ranking order."""
+    with open(f"boxoffice_{year}.csv", "w", encoding="utf-8") as f:
+        f.write(HEADER)
+        for rank, (title, worldwide) in enumerate(movies, 1):
+            f.write(f'{title},$1,$1,"{worldwide}",tt{year}{rank:03d},/release/{title}/\n')
+
+
+def _merged():
+    with open(OUTPUT_FILE, newline="", encoding="utf-8") as f:
+        return [(row["Year"], row["Title"]) for row in csv.DictReader(f)]
+
+
+def test_years_are_merged_in_order_with_each_block_by_gross(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    _write_year(2002, [("B1", "$50"), ("B2", "$1,500"), ("B3", "-"), ("B4", "$50")])
+    _write_year(2001, [("A1", "$10"), ("A2", "$2,000,000"), ("A3", "$300")])
+
+    merge_boxoffice_files(refresh_assets=False)
+
+    # Blocks in year order; equal grosses keep their ranking order; unparseable counts as 0
+    assert _merged() == [("2001", "A2"), ("2001", "A3"), ("2001", "A1"),
+                         ("2002", "B2"), ("2002", "B1"), ("2002", "B4"), ("2002", "B3")]
+
+
+def test_top_movies_come_from_every_year(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    _write_year(2001, [("A1", "$900"), ("A2", "$100"), ("A3", "$700")])
+    _write_year(2002, [("B1", "$800"), ("B2", "$200"), ("B3", "$900")])
+    runs = [iter(read_year_file(f"boxoffice_{year}.csv", year)) for year in (2001, 2002)]
+
+    count, first_year, last_year, top = write_merged(runs, OUTPUT_FILE)
+
+    assert (count, first_year, last_year) == (6, 2001, 2002)
+    # The earlier of two equal grosses ranks first
+    assert [row[1] for row in top] == ["A1", "B3", "B1", "A3", "B2"]
+
+
+def _track_reads(monkeypatch):
+    reads = []
+    read = merge_boxoffice_data.read_year_file
+
+    def tracked(csv_file, year):
+        reads.append(csv_file)
+        return read(csv_file, year)
+
+    monkeypatch.setattr(merge_boxoffice_data, "read_year_file", tracked)
+    return reads
+
+
+def _full_rebuild():
+    with open(OUTPUT_FILE, "rb") as f:
+        incremental = f.read()
+    merge_boxoffice_files(full=True, refresh_assets=False)
+    with open(OUTPUT_FILE, "rb") as f:
+        return incremental, f.read()
+
+
+def test_changed_and_removed_years_are_spliced(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    _write_year(2001, [("A1", "$100"), ("A2", "$300")])
+    _write_year(2002, [("B1", "$200"), ("B2", "$400")])
+    _write_year(2003, [("C1", "$500")])
+    merge_boxoffice_files(refresh_assets=False)
+    reads = _track_reads(monkeypatch)
+
+    merge_boxoffice_files(refresh_assets=False)
+    assert reads == []
+
+    _write_year(2002, [("B1", "$200"), ("B2", "$400"), ("B3", "$1,000")])
+    os.remove("boxoffice_2003.csv")
+    merge_boxoffice_files(refresh_assets=False)
+
+    assert reads == ["boxoffice_2002.csv"]
+    assert _merged() == [("2001", "A2"), ("2001", "A1"), ("2002", "B3"), ("2002", "B2"), ("2002", "B1")]
+    incremental, rebuilt = _full_rebuild()
+    assert incremental == rebuilt
+
+
+def test_output_edited_outside_the_manifest_is_rebuilt(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    _write_year(2001, [("A1", "$100"), ("A2", "$300")])
+    _write_year(2002, [("B1", "$200")])
+    merge_boxoffice_files(refresh_assets=False)
+    with open(OUTPUT_FILE, "rb") as f:
+        original = f.read()
+    with open(OUTPUT_FILE, "w", encoding="utf-8") as f:
+        f.write(original.decode("utf-8").replace("A2", "Edited by hand"))
+    reads = _track_reads(monkeypatch)
+
+    merge_boxoffice_files(refresh_assets=False)
+
+    assert sorted(reads) == ["boxoffice_2001.csv", "boxoffice_2002.csv"]
+    with open(OUTPUT_FILE, "rb") as f:
+        assert f.read() == original